@@ -0,0 +1,449 @@
+"""Reproducible benchmarks for the panel probes.
+
+Every get_*/check_* probe of LinuxSystemPanel runs against a generated fake
+/proc, /sys and /etc tree, with stub binaries standing in for systemctl,
+iptables, nvidia-smi and friends. Each benchmark reports median wall time,
+peak allocations and subprocess forks, and is compared against a stored
+baseline.
+
+    python3 benchmark.py                      # run and compare to baseline
+    python3 benchmark.py --update-baseline    # store a new baseline
+    python3 benchmark.py --processes 5000 --interfaces 64 --mounts 200
+    python3 benchmark.py --tabs               # also time tab builds (needs a display)
+"""
+import argparse
+import inspect
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import securoniscontrolpanel
+from securoniscontrolpanel import LinuxSystemPanel
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# probes that need the real internet; get_security_info calls get_public_ip
+# and is otherwise covered by the individual check_* benchmarks
+EXCLUDED_PROBES = {"get_public_ip", "get_security_info"}
+
+BOOT_TIME = 1700000000
+CLOCK_TICKS = 100
+
+
+def write(root, path, content):
+    full = os.path.join(root, path.lstrip("/"))
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    with open(full, "w") as f:
+        f.write(content)
+    return full
+
+
+def build_proc(root, rng, processes, interfaces, mounts):
+    cpus = 4
+    cpu_line = lambda name: f"{name} {rng.randint(10**5, 10**6)} 0 {rng.randint(10**4, 10**5)} {rng.randint(10**6, 10**7)} 500 0 20 0 0 0\n"
+    write(root, "/proc/stat", cpu_line("cpu") + "".join(cpu_line(f"cpu{i}") for i in range(cpus)) +
+          f"intr 0\nctxt 123456\nbtime {BOOT_TIME}\nprocesses {processes}\nprocs_running 1\nprocs_blocked 0\n")
+    write(root, "/proc/uptime", "86400.00 300000.00\n")
+    write(root, "/proc/loadavg", f"0.52 0.61 0.70 1/{processes} {processes + 1}\n")
+    pressure = lambda: "".join(
+        f"{kind} avg10={rng.uniform(0, 5):.2f} avg60={rng.uniform(0, 5):.2f} avg300={rng.uniform(0, 5):.2f} "
+        f"total={rng.randint(10**6, 10**9)}\n" for kind in ("some", "full"))
+    write(root, "/sys/fs/cgroup/cgroup.controllers", "cpu io memory pids\n")
+    for resource in ("cpu", "memory", "io"):
+        write(root, f"/proc/pressure/{resource}", pressure())
+        for group in ("init.scope", "system.slice", "user.slice"):
+            write(root, f"/sys/fs/cgroup/{group}/{resource}.pressure", pressure())
+    write(root, "/proc/cpuinfo", "".join(
+        f"processor\t: {i}\nvendor_id\t: GenuineIntel\nmodel name\t: Fake CPU @ 3.00GHz\n"
+        f"cpu MHz\t\t: 3000.000\ncache size\t: 8192 KB\ncore id\t\t: {i}\ncpu cores\t: {cpus}\n\n"
+        for i in range(cpus)))
+    write(root, "/proc/meminfo", "".join(f"{key}: {value} kB\n" for key, value in [
+        ("MemTotal", 16318428), ("MemFree", 8123456), ("MemAvailable", 11234567), ("Buffers", 123456),
+        ("Cached", 2345678), ("SwapCached", 0), ("Active", 3456789), ("Inactive", 2345678),
+        ("Active(anon)", 2000000), ("Inactive(anon)", 100000), ("Active(file)", 1456789),
+        ("Inactive(file)", 2245678), ("Unevictable", 0), ("Mlocked", 0), ("SwapTotal", 2097148),
+        ("SwapFree", 2097148), ("Dirty", 120), ("Writeback", 0), ("AnonPages", 2100000),
+        ("Mapped", 400000), ("Shmem", 150000), ("KReclaimable", 200000), ("Slab", 350000),
+        ("SReclaimable", 200000), ("SUnreclaim", 150000), ("KernelStack", 12000),
+        ("PageTables", 30000), ("CommitLimit", 10256360), ("Committed_AS", 6000000),
+        ("HugePages_Total", 0), ("HugePages_Free", 0), ("Hugepagesize", 2048)]))
+    write(root, "/proc/vmstat", "pswpin 0\npswpout 0\npgfault 123456\npgmajfault 12\n")
+    write(root, "/proc/filesystems", "\text4\n\txfs\n\tvfat\nnodev\tproc\nnodev\ttmpfs\n")
+
+    # mounts point at real directories inside the fake root so statvfs works
+    mount_lines = []
+    for i in range(mounts):
+        mountpoint = os.path.join(root, "mnt", f"vol{i}")
+        os.makedirs(mountpoint, exist_ok=True)
+        mount_lines.append(f"/dev/sd{chr(97 + i % 26)}{i // 26 + 1} {mountpoint} ext4 rw,relatime 0 0\n")
+    mount_lines.append("/dev/mapper/vg-root / ext4 rw,relatime 0 0\n")
+    mount_lines.append("proc /proc proc rw 0 0\n")
+    write(root, "/proc/self/mounts", "".join(mount_lines))
+    write(root, "/proc/mounts", "".join(mount_lines))
+
+    net_dev = ("Inter-|   Receive                                                |  Transmit\n"
+               " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n")
+    route = "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+    for i in range(interfaces):
+        name = "lo" if i == 0 else f"eth{i - 1}"
+        rx, tx = rng.randint(10**6, 10**10), rng.randint(10**6, 10**10)
+        net_dev += f"{name:>6}: {rx} {rx // 1400} 0 0 0 0 0 0 {tx} {tx // 1400} 0 0 0 0 0 0\n"
+        write(root, f"/sys/class/net/{name}/speed", "1000\n")
+        write(root, f"/sys/class/net/{name}/mtu", "1500\n" if i else "65536\n")
+        write(root, f"/sys/class/net/{name}/operstate", "up\n")
+        if i == 1:
+            route += f"{name}\t00000000\t0102A8C0\t0003\t0\t0\t100\t00000000\t0\t0\t0\n"
+        if i:
+            route += f"{name}\t00{i:02X}A8C0\t00000000\t0001\t0\t0\t100\t00FFFFFF\t0\t0\t0\n"
+    write(root, "/proc/net/dev", net_dev)
+    write(root, "/proc/net/route", route)
+
+    tcp = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+    for i in range(processes):
+        tcp += (f"{i:4}: 0100007F:{1024 + i:04X} {rng.randint(1, 2**32 - 1):08X}:01BB 01 00000000:00000000 "
+                f"00:00000000 00000000  1000        0 {100000 + i} 1 0000000000000000 20 4 30 10 -1\n")
+    write(root, "/proc/net/tcp", tcp)
+
+    for key, value in [("kernel/randomize_va_space", "2"), ("fs/protected_hardlinks", "1"),
+                       ("fs/protected_symlinks", "1"), ("kernel/kptr_restrict", "1"),
+                       ("kernel/dmesg_restrict", "1"), ("kernel/unprivileged_bpf_disabled", "1"),
+                       ("kernel/yama/ptrace_scope", "1"), ("net/ipv4/ip_forward", "0")]:
+        write(root, f"/proc/sys/{key}", value + "\n")
+    # per interface sysctls, the bulk of a real /proc/sys
+    for name in ["all", "default", "lo"] + [f"eth{i}" for i in range(interfaces - 1)]:
+        for key in ("rp_filter", "accept_redirects", "send_redirects", "accept_source_route",
+                    "log_martians", "forwarding", "arp_filter", "proxy_arp"):
+            write(root, f"/proc/sys/net/ipv4/conf/{name}/{key}", "1\n" if key == "rp_filter" else "0\n")
+        for key in ("accept_redirects", "accept_ra", "forwarding", "disable_ipv6"):
+            write(root, f"/proc/sys/net/ipv6/conf/{name}/{key}", "0\n")
+
+    names = ["systemd", "sshd", "bash", "python3", "java", "nginx", "postgres", "chrome", "Xorg", "kworker/0:1"]
+    for pid in range(1, processes + 1):
+        name = names[pid % len(names)]
+        utime, stime = rng.randint(0, 10**5), rng.randint(0, 10**4)
+        starttime = rng.randint(0, 86400 * CLOCK_TICKS)
+        rss = rng.randint(100, 100000)
+        fields = ["S", "1", str(pid), str(pid), "0", "-1", "4194560", "100", "0", "0", "0",
+                  str(utime), str(stime), "0", "0", "20", "0", "1", "0", str(starttime),
+                  str(rss * 4096 * 3), str(rss)] + ["0"] * 30
+        write(root, f"/proc/{pid}/stat", f"{pid} ({name}) " + " ".join(fields) + "\n")
+        write(root, f"/proc/{pid}/statm", f"{rss * 3} {rss} {rss // 4} 10 0 {rss} 0\n")
+        write(root, f"/proc/{pid}/status", f"Name:\t{name}\nState:\tS (sleeping)\nPid:\t{pid}\nPPid:\t1\n"
+                                           f"Uid:\t1000\t1000\t1000\t1000\nGid:\t1000\t1000\t1000\t1000\n"
+                                           f"VmRSS:\t{rss * 4} kB\nThreads:\t1\n"
+                                           f"voluntary_ctxt_switches:\t10\nnonvoluntary_ctxt_switches:\t1\n")
+        write(root, f"/proc/{pid}/cmdline", f"/usr/bin/{name}\0--flag={pid}\0")
+        write(root, f"/proc/{pid}/comm", name + "\n")
+        write(root, f"/proc/{pid}/smaps_rollup",
+              f"00400000-7fff00000000 ---p 00000000 00:00 0                          [rollup]\n"
+              f"Rss: {rss * 4} kB\nPss: {rss * 3} kB\nPss_Anon: {rss * 2} kB\nPss_File: {rss} kB\n"
+              f"Pss_Shmem: 0 kB\nShared_Clean: {rss} kB\nShared_Dirty: 0 kB\nPrivate_Clean: {rss} kB\n"
+              f"Private_Dirty: {rss * 2} kB\nSwap: {pid % 7 * 100} kB\nSwapPss: {pid % 7 * 100} kB\n")
+        write(root, f"/proc/{pid}/cgroup", f"0::/system.slice/{name}.service\n")
+
+
+def build_sys_etc(root):
+    for index, size in enumerate(["32K", "256K", "8192K"]):
+        write(root, f"/sys/devices/system/cpu/cpu0/cache/index{index}/size", size + "\n")
+    write(root, "/sys/class/thermal/thermal_zone0/temp", "45000\n")
+    write(root, "/sys/class/power_supply/BAT0/power_now", "12500000\n")
+    write(root, "/etc/os-release", 'NAME="Securonis Linux"\nVERSION="1.0 (Fake)"\nID=securonis\nID_LIKE=debian\n')
+    write(root, "/etc/resolv.conf", "# generated\nnameserver 9.9.9.9\nnameserver 1.1.1.1\nsearch example.org\n")
+    write(root, "/etc/systemd/resolved.conf", "[Resolve]\nDNS=9.9.9.9\nDNSOverTLS=yes\n")
+    write(root, "/var/lib/dpkg/status", "".join(f"Package: pkg{i}\nStatus: install ok installed\nVersion: 1.{i}.0\n\n"
+                                                for i in range(200)))
+    write(root, "/var/lib/apt/lists/deb.example.org_dists_stable_main_binary-amd64_Packages", "")
+    for name in ("syslog", "kern.log"):
+        write(root, f"/var/log/{name}", "".join(f"Jan  1 00:00:{i % 60:02d} host fake[{i}]: line {i}\n"
+                                                for i in range(2000)))
+    auth = (
+        "sshd[{i}]: Failed password for invalid user user{u} from 203.0.113.{u} port 22 ssh2",
+        "sshd[{i}]: Accepted publickey for admin from 192.0.2.{u} port 22 ssh2: ED25519 SHA256:fake",
+        "sudo:    admin : TTY=pts/0 ; PWD=/home/admin ; USER=root ; COMMAND=/usr/bin/apt update",
+        "CRON[{i}]: pam_unix(cron:session): session opened for user root(uid=0) by (uid=0)",
+    )
+    write(root, "/var/log/auth.log", "".join(
+        f"Jan  1 00:{i // 60 % 60:02d}:{i % 60:02d} host " + auth[i % 4].format(i=i, u=i % 50) + "\n"
+        for i in range(20000)))
+
+
+def build_devices(root, mounts):
+    """sysfs block, usb and pci trees; / is LVM on LUKS on an nvme partition"""
+    def block(name, parent="", files=None, slaves=(), holders=()):
+        real = os.path.join(root, "sys/devices/virtual/block", parent, name)
+        for key, value in (files or {}).items():
+            write(root, os.path.join(real[len(root):], key), value + "\n")
+        for kind, names in (("slaves", slaves), ("holders", holders)):
+            os.makedirs(os.path.join(real, kind), exist_ok=True)
+            for other in names:
+                open(os.path.join(real, kind, other), "w").close()
+        link = os.path.join(root, "sys/class/block", name)
+        os.makedirs(os.path.dirname(link), exist_ok=True)
+        os.symlink(os.path.relpath(real, os.path.dirname(link)), link)
+
+    block("nvme0n1", files={"size": "1000215216", "dev": "259:0", "removable": "0"})
+    block("nvme0n1p1", "nvme0n1", {"size": "1048576", "dev": "259:1", "partition": "1"})
+    block("nvme0n1p2", "nvme0n1", {"size": "999164560", "dev": "259:2", "partition": "2"}, holders=["dm-0"])
+    block("dm-0", files={"size": "999131792", "dev": "253:0", "dm/name": "cryptroot",
+                         "dm/uuid": "CRYPT-LUKS2-0123456789abcdef0123456789abcdef-cryptroot"},
+          slaves=["nvme0n1p2"], holders=["dm-1"])
+    block("dm-1", files={"size": "999000000", "dev": "253:1", "dm/name": "vg-root",
+                         "dm/uuid": "LVM-abcdefabcdefabcdefabcdefabcdefab"}, slaves=["dm-0"])
+    write(root, "/run/udev/data/b259:1", "E:ID_FS_TYPE=vfat\n")
+    write(root, "/run/udev/data/b259:2", "E:ID_FS_TYPE=crypto_LUKS\n")
+    write(root, "/run/udev/data/b253:1", "E:ID_FS_TYPE=ext4\n")
+    # the plain partitions behind the generated mounts
+    for i in range(mounts):
+        disk = f"sd{chr(97 + i % 26)}"
+        if i < 26:
+            block(disk, files={"size": "1953525168", "dev": f"8:{i * 16}", "removable": "0"})
+        block(f"{disk}{i // 26 + 1}", disk, {"size": "97656250", "dev": f"8:{(i % 26) * 16 + i // 26 + 1}",
+                                              "partition": str(i // 26 + 1)})
+
+    for bus in (1, 2):
+        write(root, f"/sys/bus/usb/devices/usb{bus}/authorized_default", "1\n")
+        write(root, f"/sys/bus/usb/devices/usb{bus}/product", "xHCI Host Controller\n")
+        for port in range(1, 5):
+            base = f"/sys/bus/usb/devices/{bus}-{port}"
+            for key, value in (("idVendor", "046d"), ("idProduct", f"c0{port}a"), ("manufacturer", "Logitech"),
+                               ("product", f"Fake Device {port}"), ("authorized", "1")):
+                write(root, f"{base}/{key}", value + "\n")
+            write(root, f"/sys/bus/usb/devices/{bus}-{port}:1.0/bInterfaceClass", "03\n")
+    for slot in range(16):
+        base = f"/sys/bus/pci/devices/0000:00:{slot:02x}.0"
+        for key, value in (("vendor", "0x8086"), ("device", f"0x{0x1900 + slot:04x}"), ("class", "0x060000")):
+            write(root, f"{base}/{key}", value + "\n")
+    # an amdgpu card for the sysfs GPU telemetry fallback
+    gpu = "/sys/devices/pci0000:00/0000:00:02.0"
+    for key, value in (("vendor", "0x1002"), ("gpu_busy_percent", "42"), ("mem_info_vram_total", str(4 << 30)),
+                       ("mem_info_vram_used", str(1 << 30)), ("pp_dpm_sclk", "0: 500Mhz\n1: 1800Mhz *"),
+                       ("hwmon/hwmon0/temp1_input", "61000")):
+        write(root, f"{gpu}/device/{key}", value + "\n")
+    os.makedirs(os.path.join(root, "sys/class/drm"), exist_ok=True)
+    os.symlink(os.path.join(root, gpu.lstrip("/")), os.path.join(root, "sys/class/drm/card0"))
+
+
+def build_stubs(root, rng, services, rules, processes):
+    """shell stubs for every external tool the probes fork"""
+    bin_dir = os.path.join(root, "stub-bin")
+    out_dir = os.path.join(root, "stub-out")
+    os.makedirs(bin_dir, exist_ok=True)
+    os.makedirs(out_dir, exist_ok=True)
+    cat = shutil.which("cat") or "/bin/cat"
+    sleep = shutil.which("sleep") or "/bin/sleep"
+    date = shutil.which("date") or "/bin/date"
+    # iptables-save stamps every dump; nanoseconds so two calls never match
+    save = (f'echo "# Generated by iptables-save v1.8.9 on $({date} +%s.%N)"\n{cat} {out_dir}/iptables-save\n'
+            f'echo "# Completed on $({date} +%s.%N)"\n')
+
+    outputs = {
+        "systemctl": "".join(f"  svc{i}.service loaded active running Fake service {i}\n" for i in range(services)),
+        "iptables-L": "Chain INPUT (policy DROP)\nnum  target     prot opt source               destination\n" +
+                      "".join(f"{i + 1}    ACCEPT     tcp  --  10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}  0.0.0.0/0  tcp dpt:{1024 + i % 60000}\n"
+                              for i in range(rules)),
+        "iptables-save": "*filter\n:INPUT DROP [100:2000]\n:FORWARD DROP [0:0]\n:OUTPUT ACCEPT [500:80000]\n" +
+                         "".join(f"[{rng.randint(0, 10**6)}:{rng.randint(0, 10**9)}] -A INPUT -s 10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}/32 "
+                                 f"-p tcp -m tcp --dport {1024 + i % 60000} -j ACCEPT\n" for i in range(rules)) +
+                         "COMMIT\n",
+        "nvidia-smi": "0, NVIDIA Fake GPU, 37, 8192, 1024, 1500, 55\n",
+        "apt": "Listing...\n" + "".join(f"pkg{i}/stable-security 1.{i}.1 amd64 [upgradable from: 1.{i}.0]\n"
+                                        for i in range(25)),
+        "netstat": "Active Internet connections (only servers)\nProto Recv-Q Send-Q Local Address Foreign Address State\n" +
+                   "".join(f"tcp        0      0 0.0.0.0:{1024 + i}            0.0.0.0:*               LISTEN\n"
+                           for i in range(min(processes, 200))),
+    }
+    for name, text in outputs.items():
+        with open(os.path.join(out_dir, name), "w") as f:
+            f.write(text)
+
+    scripts = {
+        "systemctl": f'case "$1" in\n  is-active) echo active ;;\n  *) exec {cat} {out_dir}/systemctl ;;\nesac\n',
+        "iptables": f'case "$*" in\n  *-L*) exec {cat} {out_dir}/iptables-L ;;\n  *) {save} ;;\nesac\n',
+        "iptables-save": save,
+        # streams a sample per second like `nvidia-smi -lms 1000`
+        "nvidia-smi": f"while {cat} {out_dir}/nvidia-smi; do {sleep} 1; done\n",
+        "apt": f"exec {cat} {out_dir}/apt\n",
+        "netstat": f"exec {cat} {out_dir}/netstat\n",
+        "ufw": "echo 'Status: inactive'\n",
+        "openssl": "echo 'OpenSSL 3.0.11 19 Sep 2023'\n",
+        "timedatectl": "echo 'Timezone=UTC'\n",
+        "mokutil": "echo 'SecureBoot disabled'\n",
+        "getenforce": "echo Disabled\n",
+        "aa-status": "echo 'apparmor module is loaded.'\n",
+    }
+    for name, body in scripts.items():
+        path = os.path.join(bin_dir, name)
+        with open(path, "w") as f:
+            f.write("#!/bin/sh\n" + body)
+        os.chmod(path, 0o755)
+    return bin_dir
+
+
+def build_sysroot(root, processes, interfaces, mounts, services, rules, seed=1234):
+    rng = random.Random(seed)
+    build_proc(root, rng, processes, interfaces, mounts)
+    build_sys_etc(root)
+    build_devices(root, mounts)
+    return build_stubs(root, rng, services, rules, processes)
+
+
+def discover_probes():
+    probes = []
+    for name, fn in inspect.getmembers(LinuxSystemPanel, inspect.isfunction):
+        if not name.startswith(("get_", "check_")) or name in EXCLUDED_PROBES:
+            continue
+        params = list(inspect.signature(fn).parameters.values())[1:]
+        if all(p.default is not inspect.Parameter.empty for p in params):
+            probes.append(name)
+    return probes
+
+
+def measure(panel, fn, repeat):
+    fn()  # warm caches (imports, psutil internals)
+    forks_before = panel.instrumentation.forks
+    walls = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        walls.append((time.perf_counter() - start) * 1000)
+    forks = (panel.instrumentation.forks - forks_before) / repeat
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "wall_ms": round(statistics.median(walls), 3),
+        "alloc_peak_kib": round(peak / 1024, 1),
+        "forks": forks
+    }
+
+
+def bench_tabs(sysroot, repeat):
+    """time every tab build; needs a display"""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Skipping tab benchmarks: {e}")
+        return {}
+    panel = LinuxSystemPanel(root, sysroot=sysroot)
+    root.update()
+    results = {}
+    for text, index in panel.menu_items:
+        widgets_before = panel.instrumentation.widgets
+
+        def build():
+            panel.switch_tab(index)
+            root.update()
+
+        results[f"tab:{text}"] = measure(panel, build, repeat)
+        results[f"tab:{text}"]["widgets"] = (panel.instrumentation.widgets - widgets_before) // (repeat + 2)
+    panel.cleanup()
+    root.destroy()
+    return results
+
+
+def compare(results, baseline, tolerance, noise_ms):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["wall_ms"] > base["wall_ms"] * (1 + tolerance) + noise_ms:
+            regressions.append(f"{name}: wall {base['wall_ms']}ms -> {result['wall_ms']}ms")
+        if result["forks"] > base["forks"]:
+            regressions.append(f"{name}: forks {base['forks']} -> {result['forks']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark panel probes against a fake sysroot")
+    parser.add_argument("--processes", type=int, default=300)
+    parser.add_argument("--interfaces", type=int, default=8)
+    parser.add_argument("--mounts", type=int, default=20)
+    parser.add_argument("--services", type=int, default=60)
+    parser.add_argument("--rules", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sysroot", help="use an existing (captured) tree instead of generating one")
+    parser.add_argument("--only", help="comma separated probe names")
+    parser.add_argument("--tabs", action="store_true", help="also benchmark tab builds")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--noise-ms", type=float, default=1.0, help="absolute slack for tiny probes")
+    args = parser.parse_args()
+
+    scale = {key: getattr(args, key) for key in ("processes", "interfaces", "mounts", "services", "rules")}
+    workdir = None
+    if args.sysroot:
+        sysroot = os.path.abspath(args.sysroot)
+        stub_bin = os.path.join(sysroot, "stub-bin")
+        scale = {"sysroot": sysroot}
+    else:
+        workdir = tempfile.mkdtemp(prefix="securonis-bench-")
+        sysroot = workdir
+        stub_bin = build_sysroot(sysroot, **scale)
+
+    # only the stubs are reachable, so missing tools behave the same everywhere
+    os.environ["PATH"] = stub_bin
+    os.environ["LANG"] = "C.UTF-8"
+    os.environ.pop("http_proxy", None)
+    os.environ.pop("https_proxy", None)
+
+    cache_dir = tempfile.mkdtemp(prefix="securonis-bench-cache-")
+    try:
+        panel = LinuxSystemPanel(sysroot=sysroot)
+        # prime a private update cache so check_updates measures the cached path
+        panel.updates.cache_path = os.path.join(cache_dir, "updates.json")
+        panel.updates.refresh()
+        panel.auth.state_path = os.path.join(cache_dir, "authlog.json")
+        probes = args.only.split(",") if args.only else discover_probes()
+        results = {}
+        for name in probes:
+            results[f"probe:{name}"] = measure(panel, getattr(panel, name), args.repeat)
+        if args.tabs:
+            results.update(bench_tabs(sysroot, args.repeat))
+        panel.cleanup()
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    width = max(len(name) for name in results)
+    print(f"{'benchmark':<{width}}  {'wall ms':>10}  {'alloc KiB':>10}  {'forks':>6}")
+    for name, result in results.items():
+        print(f"{name:<{width}}  {result['wall_ms']:>10.3f}  {result['alloc_peak_kib']:>10.1f}  {result['forks']:>6g}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"scale": scale, "python": sys.version.split()[0],
+                       "psutil": securoniscontrolpanel.psutil.__version__, "results": results},
+                      f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline stored, run with --update-baseline first")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("scale") != scale:
+        print(f"Baseline was recorded at scale {baseline.get('scale')}, not comparing")
+        return 0
+    regressions = compare(results, baseline["results"], args.tolerance, args.noise_ms)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    print("OK" if not regressions else f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,3 @@
-import tkinter as tk
-from tkinter import font, ttk, messagebox
 import psutil
 import platform
 import datetime
@@ -9,26 +7,4261 @@ import re
 import time
 import os
 import json
+import gzip
+import argparse
+import csv
+import asyncio
+import ctypes
+import ctypes.util
+import random
+import math
+import bisect
+import fnmatch
+import hashlib
+import hmac
+import heapq
+import mmap
+import multiprocessing
+import sqlite3
+import stat
+from array import array
 import requests
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from collections import Counter, deque
+from itertools import islice
+from contextlib import contextmanager
+from operator import itemgetter
 from typing import Dict, List, Optional
 import queue
+import select
+import pwd
 import signal
+import struct
 import sys
-from PIL import Image, ImageTk
+
+# the terminal frontend (--tui) is meant for ssh sessions without a display,
+# it never loads Tk or PIL
+TUI = __name__ == "__main__" and "--tui" in sys.argv[1:]
+if not TUI:
+    import tkinter as tk
+    from tkinter import font, ttk, messagebox, filedialog
+    from PIL import Image, ImageTk
+    Frame = tk.Frame
+else:
+    import curses
+    tk = None
+    # base of the widget classes below, which the terminal UI never builds
+    Frame = object
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+
+
+class ScheduledTask:
+    """one periodic job known to the scheduler"""
+
+    def __init__(self, name, callback, interval, budget_ms, priority, group):
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.budget = budget_ms / 1000
+        self.priority = priority
+        self.group = group
+        self.next_due = 0.0
+        self.cost = 0.0
+        self.runs = 0
+        self.overruns = 0
+        self.shed = 0
+
+    def effective_interval(self, backoff: float) -> float:
+        """interval stretched by window backoff and by measured cost"""
+        stretch = 1.0
+        if self.budget > 0 and self.cost > self.budget:
+            stretch = min(self.cost / self.budget, 4.0)
+        return self.interval * stretch * backoff
+
+
+class RefreshScheduler:
+    """single after() loop driving every periodic refresh"""
+
+    def __init__(self, root, tick_budget_ms: int = 40, slack_ms: int = 50,
+                 unfocused_backoff: float = 2.0, iconified_backoff: float = 10.0):
+        self.root = root
+        self.tick_budget = tick_budget_ms / 1000
+        self.slack = slack_ms / 1000
+        self.unfocused_backoff = unfocused_backoff
+        self.iconified_backoff = iconified_backoff
+        self.tasks: Dict[str, ScheduledTask] = {}
+        self.after_id = None
+        self.wakeup_at = None
+        self.ticks = 0
+        self.overrun_ticks = 0
+        self.running = True
+
+    def add(self, name: str, callback, interval: float, budget_ms: float = 10,
+            priority: int = PRIORITY_NORMAL, group: Optional[str] = None, delay: float = 0.0):
+        """register (or replace) a task; callback returning False unschedules it"""
+        task = ScheduledTask(name, callback, interval, budget_ms, priority, group)
+        task.next_due = time.monotonic() + delay
+        self.tasks[name] = task
+        self._arm()
+        return task
+
+    def remove(self, name: str):
+        self.tasks.pop(name, None)
+
+    def remove_group(self, group: str):
+        for name in [n for n, t in self.tasks.items() if t.group == group]:
+            del self.tasks[name]
+
+    def stop(self):
+        self.running = False
+        self.tasks.clear()
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+
+    def backoff(self) -> float:
+        """slow everything down while nobody is looking at the window"""
+        try:
+            if self.root.state() in ("iconic", "withdrawn"):
+                return self.iconified_backoff
+            if self.root.focus_displayof() is None:
+                return self.unfocused_backoff
+        except Exception:
+            pass
+        return 1.0
+
+    def _arm(self):
+        if not self.running or not self.tasks:
+            return
+        due = min(task.next_due for task in self.tasks.values())
+        if self.after_id is not None:
+            if self.wakeup_at is not None and self.wakeup_at <= due:
+                return
+            self.root.after_cancel(self.after_id)
+        delay = max(0, int((due - time.monotonic()) * 1000))
+        self.wakeup_at = due
+        self.after_id = self.root.after(delay, self._tick)
+
+    def _tick(self):
+        """run everything that is due in one wake-up, highest priority first"""
+        self.after_id = None
+        self.wakeup_at = None
+        if not self.running:
+            return
+        self.ticks += 1
+        backoff = self.backoff()
+        start = time.monotonic()
+        due = [t for t in self.tasks.values() if t.next_due <= start + self.slack]
+        due.sort(key=lambda t: t.priority, reverse=True)
+        overrun = False
+        for task in due:
+            if task.name not in self.tasks:
+                continue
+            now = time.monotonic()
+            if now - start > self.tick_budget and task.priority < PRIORITY_HIGH:
+                # tick is over budget: drop this run of lower priority work
+                overrun = True
+                task.shed += 1
+                task.next_due = now + task.effective_interval(backoff)
+                continue
+            keep = True
+            try:
+                keep = task.callback() is not False
+            except Exception as e:
+                print(f"Error in scheduled task {task.name}: {e}")
+            cost = time.monotonic() - now
+            task.cost = cost if task.runs == 0 else task.cost * 0.8 + cost * 0.2
+            task.runs += 1
+            if cost > task.budget:
+                task.overruns += 1
+            if not keep:
+                self.tasks.pop(task.name, None)
+                continue
+            task.next_due = now + task.effective_interval(backoff)
+        if overrun:
+            self.overrun_ticks += 1
+        self._arm()
+
+    def stats(self) -> List[Dict]:
+        return [{
+            "name": t.name,
+            "interval": t.interval,
+            "budget_ms": t.budget * 1000,
+            "priority": t.priority,
+            "avg_cost_ms": round(t.cost * 1000, 2),
+            "runs": t.runs,
+            "overruns": t.overruns,
+            "shed": t.shed
+        } for t in self.tasks.values()]
+
+
+class UIDispatcher:
+    """hands results from worker threads to the Tk main loop
+
+    workers post() a callback under a key; the main loop drains the queue
+    from after(), keeps only the newest post per key and stops once a drain
+    has used its time budget, leaving the rest for the next one
+    """
+
+    def __init__(self, root, updates: queue.Queue, budget_ms: float = 8, interval_ms: int = 20):
+        self.root = root
+        self.queue = updates
+        self.budget = budget_ms / 1000
+        self.interval_ms = interval_ms
+        self.pending: Dict = {}
+        self.posted = 0
+        self.coalesced = 0
+        self.applied = 0
+        self.deferred = 0
+        self.running = True
+        self.after_id = self.root.after(interval_ms, self._drain)
+
+    def post(self, key, callback, *args):
+        """run callback(*args) on the main loop; a later post with the same key replaces it"""
+        self.queue.put((object() if key is None else key, callback, args))
+
+    def stop(self):
+        self.running = False
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+
+    def _drain(self):
+        self.after_id = None
+        if not self.running:
+            return
+        start = time.monotonic()
+        while True:
+            try:
+                key, callback, args = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.posted += 1
+            if key in self.pending:
+                # keeps its place in line, only the newest result is applied
+                self.coalesced += 1
+            self.pending[key] = (callback, args)
+        while self.pending:
+            if time.monotonic() - start > self.budget:
+                self.deferred += 1
+                break
+            key = next(iter(self.pending))
+            callback, args = self.pending.pop(key)
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in UI update {key}: {e}")
+            self.applied += 1
+        try:
+            # come straight back (after Tk had a chance to paint) if work was left over
+            self.after_id = self.root.after(1 if self.pending else self.interval_ms, self._drain)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict:
+        return {"posted": self.posted, "coalesced": self.coalesced, "applied": self.applied,
+                "deferred": self.deferred, "pending": len(self.pending) + self.queue.qsize()}
+
+
+class Cancelled(Exception):
+    """the tab a job belonged to went away"""
+
+
+class CancelToken:
+    """cancellation for the background work of one tab generation
+
+    cancel() drops futures still waiting in the pool and kills the
+    subprocesses of jobs already running; run_command() refuses to start
+    new ones afterwards
+    """
+
+    def __init__(self, generation: int = 0):
+        self.generation = generation
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.processes = set()
+        self.futures = set()
+        self.killed = 0
+        self.skipped = 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self.event.is_set()
+
+    def check(self):
+        if self.event.is_set():
+            raise Cancelled()
+
+    def cancel(self):
+        with self.lock:
+            self.event.set()
+            processes, futures = list(self.processes), list(self.futures)
+        for future in futures:
+            if future.cancel():
+                self.skipped += 1
+        for process in processes:
+            try:
+                process.kill()
+                self.killed += 1
+            except OSError:
+                pass
+
+    def attach(self, process) -> bool:
+        with self.lock:
+            if not self.event.is_set():
+                self.processes.add(process)
+                return True
+        process.kill()
+        return False
+
+    def detach(self, process):
+        with self.lock:
+            self.processes.discard(process)
+
+    def track(self, future):
+        with self.lock:
+            self.futures.add(future)
+        future.add_done_callback(self._untrack)
+
+    def _untrack(self, future):
+        with self.lock:
+            self.futures.discard(future)
+
+
+# token of the job running on the current worker thread
+_job_context = threading.local()
+
+
+def run_command(args, timeout: Optional[float] = None, stderr=None) -> bytes:
+    """subprocess.check_output that dies with the job it runs for"""
+    token = getattr(_job_context, "token", None)
+    if token is not None:
+        token.check()
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=stderr)
+    if token is not None and not token.attach(process):
+        process.communicate()
+        raise Cancelled()
+    try:
+        output, errors = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        raise
+    finally:
+        if token is not None:
+            token.detach(process)
+    if token is not None:
+        token.check()
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, args, output=output, stderr=errors)
+    return output
+
+
+class RefreshContext:
+    """values fetched during one refresh, each at most once"""
+
+    def __init__(self):
+        self.values = {}
+        self.hits = 0
+
+    def get(self, key, fetch):
+        try:
+            value = self.values[key]
+        except KeyError:
+            value = self.values[key] = fetch()
+            return value
+        self.hits += 1
+        return value
+
+
+# refresh the current thread is in, if any
+_refresh_context = threading.local()
+refresh_stats = Counter()
+
+
+@contextmanager
+def refresh_scope():
+    """join the refresh running on this thread, or start one that ends with the block"""
+    context = getattr(_refresh_context, "context", None)
+    if context is not None:
+        yield context
+        return
+    context = _refresh_context.context = RefreshContext()
+    try:
+        yield context
+    finally:
+        _refresh_context.context = None
+        refresh_stats["refreshes"] += 1
+        refresh_stats["fetches"] += len(context.values)
+        refresh_stats["hits"] += context.hits
+
+
+def shared_psutil(name: str, *args):
+    """psutil.<name>(*args), shared by everything in the current refresh"""
+    fetch = getattr(psutil, name)
+    context = getattr(_refresh_context, "context", None)
+    if context is None:
+        return fetch(*args)
+    return context.get((name,) + args, lambda: fetch(*args))
+
+
+def shared_probe(name: str, fn):
+    """fn returning the same result for the rest of the refresh it is first called in"""
+    def wrapper(*args, **kwargs):
+        with refresh_scope() as context:
+            key = (name, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return fn(*args, **kwargs)
+            return context.get(key, lambda: fn(*args, **kwargs))
+    wrapper.__wrapped__ = fn
+    wrapper.__name__ = getattr(fn, "__name__", name)
+    return wrapper
+
+
+class LatencyHistogram:
+    """log-bucketed latency histogram, values in milliseconds"""
+
+    # 0.05 ms .. ~2 min in 25% steps
+    BOUNDS = [0.05 * 1.25 ** i for i in range(66)]
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float):
+        lo, hi = 0, len(self.BOUNDS)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.BOUNDS[mid] < ms:
+                lo = mid + 1
+            else:
+                hi = mid
+        self.buckets[lo] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                bound = self.BOUNDS[i] if i < len(self.BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max, 3)
+        }
+
+
+class PanelInstrumentation:
+    """probe timings, main loop lag and fork/widget counters"""
+
+    def __init__(self, heartbeat_ms: int = 100):
+        self.lock = threading.Lock()
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.loop_lag = LatencyHistogram()
+        self.heartbeat_ms = heartbeat_ms
+        self.forks = 0
+        self.forks_by_command = Counter()
+        self.widgets = 0
+        self.rates = deque(maxlen=60)
+        self.started = time.time()
+        self.hooks_installed = False
+
+    def record(self, name: str, seconds: float):
+        with self.lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = LatencyHistogram()
+            hist.add(seconds * 1000)
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name: str, fn):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        wrapper.__wrapped__ = fn
+        wrapper.__name__ = getattr(fn, "__name__", name)
+        return wrapper
+
+    def instrument_probes(self, obj):
+        """time every get_*/check_* method of obj"""
+        for name in dir(type(obj)):
+            if name.startswith(("get_", "check_")) and callable(getattr(obj, name)):
+                setattr(obj, name, self.timed(f"probe:{name}", getattr(obj, name)))
+
+    def install_hooks(self):
+        """count subprocess forks and Tk widget creation process-wide"""
+        if self.hooks_installed:
+            return
+        self.hooks_installed = True
+        instrumentation = self
+
+        class CountingPopen(subprocess.Popen):
+            def __init__(self, args, *rest, **kwargs):
+                command = args if isinstance(args, str) else (args[0] if args else "?")
+                with instrumentation.lock:
+                    instrumentation.forks += 1
+                    instrumentation.forks_by_command[os.path.basename(str(command).split()[0])] += 1
+                super().__init__(args, *rest, **kwargs)
+
+        subprocess.Popen = CountingPopen
+        if tk is None:
+            return
+
+        widget_init = tk.BaseWidget.__init__
+
+        def counting_init(widget, *args, **kwargs):
+            instrumentation.widgets += 1
+            widget_init(widget, *args, **kwargs)
+
+        tk.BaseWidget.__init__ = counting_init
+
+    def start_heartbeat(self, root):
+        """measure how late the Tk main loop services a fixed-period timer"""
+        state = {"expected": time.monotonic() + self.heartbeat_ms / 1000,
+                 "last_rate": time.monotonic(), "forks": self.forks, "widgets": self.widgets}
+
+        def beat():
+            if not root.winfo_exists():
+                return
+            now = time.monotonic()
+            with self.lock:
+                self.loop_lag.add(max(0.0, now - state["expected"]) * 1000)
+            if now - state["last_rate"] >= 1.0:
+                elapsed = now - state["last_rate"]
+                self.rates.append({
+                    "time": time.time(),
+                    "forks_per_s": round((self.forks - state["forks"]) / elapsed, 2),
+                    "widgets_per_s": round((self.widgets - state["widgets"]) / elapsed, 2)
+                })
+                state.update(last_rate=now, forks=self.forks, widgets=self.widgets)
+            state["expected"] = now + self.heartbeat_ms / 1000
+            try:
+                root.after(self.heartbeat_ms, beat)
+            except Exception:
+                pass
+
+        root.after(self.heartbeat_ms, beat)
+
+    def export(self, scheduler: Optional[RefreshScheduler] = None) -> Dict:
+        with self.lock:
+            data = {
+                "uptime_s": round(time.time() - self.started, 1),
+                "probes": {name: hist.summary() for name, hist in sorted(self.histograms.items())},
+                "loop_lag": self.loop_lag.summary(),
+                "forks_total": self.forks,
+                "forks_by_command": dict(self.forks_by_command.most_common()),
+                "widgets_total": self.widgets,
+                "rates": list(self.rates)
+            }
+        if scheduler is not None:
+            data["scheduler"] = scheduler.stats()
+        return data
+
+
+SNAPSHOT_FORMAT = 1
+
+# row tables and the columns identifying a row
+SNAPSHOT_TABLE_KEYS = {
+    "get_process_table": ("pid", "create_time"),
+    "get_socket_table": ("proto", "local", "remote", "pid"),
+    "get_firewall_ruleset": ("table", "chain", "target", "protocol", "source", "destination", "match"),
+    "get_update_details": ("name", "arch"),
+    "get_process_memory": ("pid", "name")
+}
+
+# lists of dicts and the field identifying an entry
+SNAPSHOT_LIST_KEYS = {
+    "get_disk_info": "Mount",
+    "get_system_services": "name"
+}
+
+
+def save_snapshot(snapshot: Dict, path: str):
+    with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+
+
+def load_snapshot(path: str) -> Dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    if snapshot.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format: {snapshot.get('format')}")
+    return snapshot
+
+
+def _diff_mapping(probe: str, key: str, old: Dict, new: Dict, changes: List[Dict]):
+    for field in old.keys() | new.keys():
+        a, b = old.get(field), new.get(field)
+        if a == b:
+            continue
+        if isinstance(a, dict) and isinstance(b, dict):
+            _diff_mapping(probe, f"{key}.{field}" if key else field, a, b, changes)
+        elif field not in new:
+            changes.append({"change": "removed", "probe": probe, "key": key, "field": field, "old": a, "new": None})
+        elif field not in old:
+            changes.append({"change": "added", "probe": probe, "key": key, "field": field, "old": None, "new": b})
+        else:
+            changes.append({"change": "changed", "probe": probe, "key": key, "field": field, "old": a, "new": b})
+
+
+def _hashable(value):
+    """list cells as tuples, so any column can be part of a row key"""
+    if isinstance(value, list):
+        return tuple(map(_hashable, value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    return value
+
+
+def _diff_table(probe: str, old: Dict, new: Dict, key_columns, changes: List[Dict]):
+    """hash join on the key columns, whole-row equality before field compare"""
+    old_columns, new_columns = old["columns"], new["columns"]
+    if old_columns != new_columns:
+        # different snapshot versions: compare shared columns only
+        shared = [c for c in new_columns if c in old_columns]
+        if not shared:
+            changes.append({"change": "changed", "probe": probe, "key": "*", "field": "columns",
+                            "old": old_columns, "new": new_columns})
+            return
+        old = {"rows": [[row[old_columns.index(c)] for c in shared] for row in old["rows"]]}
+        new = {"rows": [[row[new_columns.index(c)] for c in shared] for row in new["rows"]]}
+        new_columns = shared
+    key_index = [new_columns.index(c) for c in key_columns if c in new_columns]
+    if not key_index:
+        # the key columns were renamed or dropped, every shared column becomes the key
+        key_index = list(range(len(new_columns)))
+
+    def index(rows):
+        # identical keys (two equal rules in a chain) are told apart by occurrence
+        seen = Counter()
+        result = {}
+        for row in rows:
+            key = tuple(_hashable(row[i]) for i in key_index)
+            result[key, seen[key]] = row
+            seen[key] += 1
+        return result
+
+    old_rows = index(old["rows"])
+    new_rows = index(new["rows"])
+
+    def label(key):
+        values, occurrence = key
+        text = " ".join(f"{new_columns[i]}={value}" for i, value in zip(key_index, values))
+        return f"{text} #{occurrence + 1}" if occurrence else text
+
+    for key in old_rows.keys() - new_rows.keys():
+        changes.append({"change": "removed", "probe": probe, "key": label(key), "field": "*",
+                        "old": dict(zip(new_columns, old_rows[key])), "new": None})
+    for key in new_rows.keys() - old_rows.keys():
+        changes.append({"change": "added", "probe": probe, "key": label(key), "field": "*",
+                        "old": None, "new": dict(zip(new_columns, new_rows[key]))})
+    for key in old_rows.keys() & new_rows.keys():
+        a, b = old_rows[key], new_rows[key]
+        if a == b:
+            continue
+        for column, x, y in zip(new_columns, a, b):
+            if x != y:
+                changes.append({"change": "changed", "probe": probe, "key": label(key), "field": column,
+                                "old": x, "new": y})
+
+
+def diff_snapshots(old: Dict, new: Dict) -> List[Dict]:
+    """field by field differences between two snapshots"""
+    changes = []
+    old_probes, new_probes = old.get("probes", {}), new.get("probes", {})
+    for probe in sorted(old_probes.keys() | new_probes.keys()):
+        a, b = old_probes.get(probe), new_probes.get(probe)
+        if a == b:
+            continue
+        if a is None or b is None:
+            changes.append({"change": "removed" if b is None else "added", "probe": probe, "key": "",
+                            "field": "*", "old": a, "new": b})
+        elif probe in SNAPSHOT_TABLE_KEYS:
+            _diff_table(probe, a, b, SNAPSHOT_TABLE_KEYS[probe], changes)
+        elif probe in SNAPSHOT_LIST_KEYS:
+            field = SNAPSHOT_LIST_KEYS[probe]
+            _diff_mapping(probe, "", {str(item.get(field)): item for item in a},
+                          {str(item.get(field)): item for item in b}, changes)
+        elif isinstance(a, dict) and isinstance(b, dict):
+            _diff_mapping(probe, "", a, b, changes)
+        else:
+            changes.append({"change": "changed", "probe": probe, "key": "", "field": "*", "old": a, "new": b})
+    return changes
+
+
+def format_change(change: Dict) -> str:
+    mark = {"added": "+", "removed": "-", "changed": "~"}[change["change"]]
+    where = " ".join(part for part in (change["probe"], change["key"], change["field"]) if part)
+    if change["change"] == "changed":
+        return f"{mark} {where}: {change['old']!r} -> {change['new']!r}"
+    return f"{mark} {where}: {change['new'] if change['change'] == 'added' else change['old']!r}"
+
+
+CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".config", "securonis")
+STATE_DIR = os.path.join(os.path.expanduser("~"), ".local", "state", "securonis")
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "securonis")
+FLEET_PORT = 7781
+
+
+def load_config(name: str, default: Dict) -> Dict:
+    try:
+        with open(os.path.join(CONFIG_DIR, name), "r") as f:
+            return {**default, **json.load(f)}
+    except (OSError, ValueError):
+        return dict(default)
+
+
+def save_config(name: str, data: Dict):
+    os.makedirs(CONFIG_DIR, exist_ok=True)
+    with open(os.path.join(CONFIG_DIR, name), "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def encode_delta(previous: Dict, current: Dict) -> Dict:
+    """keys whose value changed plus keys that disappeared"""
+    changed = {k: v for k, v in current.items() if k not in previous or previous[k] != v}
+    removed = [k for k in previous if k not in current]
+    return {"set": changed, "del": removed}
+
+
+class FleetAgent:
+    """streams compact metric and security snapshots to fleet panels over TCP"""
+
+    def __init__(self, panel, host: str = "127.0.0.1", port: int = FLEET_PORT, interval: float = 1.0,
+                 security_interval: float = 60.0, token: Optional[str] = None):
+        self.panel = panel
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.security_interval = security_interval
+        self.token = token
+        self.state: Dict = {}
+        self.seq = 0
+        self.clients = {}
+        self.last_net = None
+        self.security: Dict = {}
+
+    def collect_metrics(self) -> Dict:
+        mem = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        net = psutil.net_io_counters()
+        now = time.monotonic()
+        rx = tx = 0
+        if self.last_net is not None:
+            elapsed = max(now - self.last_net[0], 1e-6)
+            rx = int((net.bytes_recv - self.last_net[1]) / elapsed)
+            tx = int((net.bytes_sent - self.last_net[2]) / elapsed)
+        self.last_net = (now, net.bytes_recv, net.bytes_sent)
+        load = os.getloadavg()
+        return {
+            "cpu": round(psutil.cpu_percent(interval=None), 1),
+            "mem": round(mem.percent, 1),
+            "swap": round(swap.percent, 1),
+            "disk": round(psutil.disk_usage(self.panel.host_path('/')).percent, 1),
+            "load1": round(load[0], 2),
+            "load5": round(load[1], 2),
+            "load15": round(load[2], 2),
+            "rx": rx,
+            "tx": tx,
+            "procs": len(psutil.pids()),
+            "uptime": int(time.time() - psutil.boot_time())
+        }
+
+    def collect_security(self) -> Dict:
+        return {
+            "firewall": self.panel.check_firewall(),
+            "vpn": self.panel.check_vpn(),
+            "ssh": self.panel.check_ssh_status(),
+            "updates": self.panel.check_updates(),
+            "apparmor": self.panel.check_apparmor(),
+            "selinux": self.panel.check_selinux()
+        }
+
+    async def _sample_loop(self):
+        loop = asyncio.get_running_loop()
+        static = {"hostname": socket.gethostname(), "os": self.panel.get_os_info(), "kernel": platform.release()}
+        next_security = 0.0
+        while True:
+            started = loop.time()
+            metrics = await loop.run_in_executor(self.panel.executor, self.collect_metrics)
+            if started >= next_security:
+                self.security = await loop.run_in_executor(self.panel.executor, self.collect_security)
+                next_security = started + self.security_interval
+            current = {**static, **metrics, **self.security}
+            delta = encode_delta(self.state, current)
+            self.state = current
+            self.seq += 1
+            if delta["set"] or delta["del"]:
+                line = (json.dumps({"type": "delta", "seq": self.seq, **delta}, separators=(",", ":")) + "\n").encode()
+                for writer, needs_full in list(self.clients.items()):
+                    if needs_full:
+                        continue
+                    # slow reader: stop queueing deltas and resync with a full message
+                    if writer.transport.get_write_buffer_size() > 256 * 1024:
+                        self.clients[writer] = True
+                        continue
+                    writer.write(line)
+            self._send_full()
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+    def _send_full(self):
+        if not self.state:
+            return
+        line = None
+        for writer, needs_full in list(self.clients.items()):
+            if not needs_full or writer.transport.get_write_buffer_size() > 256 * 1024:
+                continue
+            if line is None:
+                line = (json.dumps({"type": "full", "seq": self.seq, "data": self.state},
+                                   separators=(",", ":")) + "\n").encode()
+            writer.write(line)
+            self.clients[writer] = False
+
+    async def _handle(self, reader, writer):
+        try:
+            if self.token:
+                hello = json.loads(await asyncio.wait_for(reader.readline(), 5.0) or b"{}")
+                token = hello.get("token") if isinstance(hello, dict) else None
+                if not isinstance(token, str) or not hmac.compare_digest(token.encode(), self.token.encode()):
+                    return
+            self.clients[writer] = True
+            self._send_full()
+            # the client never sends anything else; wait for it to go away
+            while await reader.read(1024):
+                pass
+        except (asyncio.TimeoutError, ValueError, ConnectionError):
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+
+    async def serve(self):
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        print(f"Fleet agent listening on {self.host}:{self.port}")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self._sample_loop())
+
+    def run(self):
+        asyncio.run(self.serve())
+
+
+class FleetMonitor:
+    """follows many agents concurrently from one asyncio loop thread"""
+
+    def __init__(self, token: Optional[str] = None, timeout: float = 10.0, max_backoff: float = 30.0):
+        self.token = token
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.lock = threading.Lock()
+        self.hosts: Dict[str, Dict] = {}
+        self.dirty = set()
+        self.tasks = {}
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def add_target(self, target: str):
+        self.loop.call_soon_threadsafe(self._start_follow, target)
+
+    def remove_target(self, target: str):
+        self.loop.call_soon_threadsafe(self._stop_follow, target)
+
+    def stop(self):
+        for target in list(self.tasks):
+            self.remove_target(target)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def _start_follow(self, target: str):
+        if target not in self.tasks:
+            self.tasks[target] = self.loop.create_task(self._follow(target))
+
+    def _stop_follow(self, target: str):
+        task = self.tasks.pop(target, None)
+        if task is not None:
+            task.cancel()
+        with self.lock:
+            self.hosts.pop(target, None)
+            self.dirty.add(target)
+
+    def _publish(self, target: str, status: str, metrics: Optional[Dict] = None):
+        with self.lock:
+            if target not in self.tasks:
+                return
+            record = self.hosts.setdefault(target, {"metrics": {}, "status": status, "last_seen": None})
+            record["status"] = status
+            if metrics is not None:
+                record["metrics"] = dict(metrics)
+                record["last_seen"] = time.time()
+            self.dirty.add(target)
+
+    def take_dirty(self) -> Dict[str, Optional[Dict]]:
+        """hosts changed since the last call; None for removed hosts"""
+        with self.lock:
+            changed = {target: dict(self.hosts[target]) if target in self.hosts else None
+                       for target in self.dirty}
+            self.dirty.clear()
+        return changed
+
+    async def _follow(self, target: str):
+        host, _, port = target.rpartition(":")
+        attempt = 0
+        while True:
+            writer = None
+            try:
+                self._publish(target, "connecting")
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(host, int(port)), self.timeout)
+                if self.token:
+                    writer.write((json.dumps({"token": self.token}) + "\n").encode())
+                    await writer.drain()
+                state: Dict = {}
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), self.timeout)
+                    if not line:
+                        raise ConnectionError("closed by agent")
+                    message = json.loads(line)
+                    if message["type"] == "full":
+                        state = message["data"]
+                    else:
+                        state.update(message["set"])
+                        for key in message["del"]:
+                            state.pop(key, None)
+                    attempt = 0
+                    self._publish(target, "up", state)
+            except asyncio.CancelledError:
+                if writer is not None:
+                    writer.close()
+                raise
+            except Exception as e:
+                if writer is not None:
+                    writer.close()
+                # exponential backoff with jitter so a fleet restart doesn't stampede
+                delay = min(self.max_backoff, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.0)
+                attempt += 1
+                self._publish(target, f"down ({type(e).__name__}), retry in {delay:.0f}s")
+                await asyncio.sleep(delay)
+
+
+class SeriesBuffer:
+    """ring buffer of (time, value) that grows up to its capacity"""
+
+    __slots__ = ("times", "values", "head", "capacity")
+
+    def __init__(self, capacity: int):
+        self.times = array('d')
+        self.values = array('d')
+        self.head = 0
+        self.capacity = capacity
+
+    def append(self, ts: float, value: float):
+        if len(self.times) < self.capacity:
+            self.times.append(ts)
+            self.values.append(value)
+        else:
+            self.times[self.head] = ts
+            self.values[self.head] = value
+            self.head = (self.head + 1) % self.capacity
+
+    def __len__(self):
+        return len(self.times)
+
+    def segments(self):
+        """(times, values) memoryview pairs in chronological order"""
+        times, values = memoryview(self.times), memoryview(self.values)
+        if self.head == 0:
+            return [(times, values)]
+        return [(times[self.head:], values[self.head:]), (times[:self.head], values[:self.head])]
+
+    def between(self, start: float, end: float, limit: int, after: bool = False) -> List[tuple]:
+        """up to limit (time, value) pairs from start (exclusive if after) to end"""
+        find = bisect.bisect_right if after else bisect.bisect_left
+        pairs = []
+        for times, values in self.segments():
+            lo, hi = find(times, start), bisect.bisect_right(times, end)
+            hi = min(hi, lo + limit - len(pairs))
+            if lo < hi:
+                pairs.extend(zip(times[lo:hi].tolist(), values[lo:hi].tolist()))
+            times.release()
+            values.release()
+            if len(pairs) >= limit:
+                break
+        return pairs
+
+    def count(self, start: float, end: float) -> int:
+        total = 0
+        for times, values in self.segments():
+            total += bisect.bisect_right(times, end) - bisect.bisect_left(times, start)
+            times.release()
+            values.release()
+        return total
+
+
+class MetricHistory:
+    """per-series sample history, one day at 1 Hz by default"""
+
+    def __init__(self, capacity: int = 86400):
+        self.capacity = capacity
+        self.series: Dict[str, SeriesBuffer] = {}
+        self.lock = threading.Lock()
+
+    def append(self, name: str, ts: float, value: float):
+        with self.lock:
+            buffer = self.series.get(name)
+            if buffer is None:
+                buffer = self.series[name] = SeriesBuffer(self.capacity)
+            buffer.append(ts, value)
+
+    def names(self) -> List[str]:
+        with self.lock:
+            return sorted(self.series)
+
+    def latest(self, name: str) -> Optional[float]:
+        with self.lock:
+            buffer = self.series.get(name)
+            if not buffer:
+                return None
+            return buffer.values[(buffer.head - 1) % len(buffer)]
+
+    def count(self, names: List[str], start: float, end: float) -> int:
+        with self.lock:
+            return sum(self.series[name].count(start, end) for name in names if name in self.series)
+
+    def iter_series(self, name: str, start: float, end: float, chunk: int = 4096):
+        """(time, name, value) of one series, copied out chunk by chunk"""
+        after = False
+        while True:
+            # the ring may wrap between chunks, so resume by time rather than index
+            with self.lock:
+                buffer = self.series.get(name)
+                pairs = buffer.between(start, end, chunk, after) if buffer is not None else []
+            for ts, value in pairs:
+                yield ts, name, value
+            if len(pairs) < chunk:
+                return
+            start, after = pairs[-1][0], True
+
+    def iter_range(self, names: List[str], start: float, end: float, chunk: int = 4096):
+        """samples of several series merged in time order"""
+        return heapq.merge(*(self.iter_series(name, start, end, chunk) for name in names),
+                           key=itemgetter(0))
+
+
+EXPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".json": "jsonl"}
+METRIC_EXPORT_COLUMNS = ["time", "series", "value"]
+PROBE_EXPORT_COLUMNS = ["time", "probe", "key", "value"]
+
+
+def export_format(path: str) -> str:
+    return EXPORT_FORMATS.get(os.path.splitext(path)[1].lower(), "jsonl")
+
+
+def probe_rows(snapshot: Dict):
+    """flatten snapshot probe results into (time, probe, key, value) rows"""
+    captured = snapshot["captured_at"]
+    for probe, result in sorted(snapshot["probes"].items()):
+        if isinstance(result, dict) and "columns" in result and "rows" in result:
+            columns = result["columns"]
+            keys = [columns.index(c) for c in SNAPSHOT_TABLE_KEYS.get(probe, columns[:1]) if c in columns]
+            for row in result["rows"]:
+                yield [captured, probe, "/".join(str(row[i]) for i in keys), json.dumps(dict(zip(columns, row)))]
+        elif isinstance(result, dict):
+            for key, value in result.items():
+                if not isinstance(value, (str, int, float)) and value is not None:
+                    value = json.dumps(value)
+                yield [captured, probe, key, value]
+        elif isinstance(result, list):
+            field = SNAPSHOT_LIST_KEYS.get(probe)
+            for index, entry in enumerate(result):
+                key = entry.get(field, index) if isinstance(entry, dict) and field else index
+                yield [captured, probe, key, json.dumps(entry)]
+        else:
+            yield [captured, probe, "", result]
+
+
+class ExportJob:
+    """streams rows to CSV or JSON Lines in chunks, with progress and cancel"""
+
+    def __init__(self, path: str, columns: List[str], rows, total: Optional[int] = None,
+                 fmt: Optional[str] = None, chunk: int = 4096):
+        self.path = path
+        self.columns = columns
+        self.rows = rows
+        self.total = total
+        self.fmt = fmt or export_format(path)
+        self.chunk = chunk
+        self.written = 0
+        self.cancelled = False
+
+    @property
+    def progress(self) -> tuple:
+        return self.written, self.total
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self) -> Dict:
+        started = time.time()
+        partial = self.path + ".part"
+        rows = iter(self.rows)
+        try:
+            with open(partial, "w", newline="") as f:
+                writer = csv.writer(f)
+                if self.fmt == "csv":
+                    writer.writerow(self.columns)
+                while not self.cancelled:
+                    block = list(islice(rows, self.chunk))
+                    if not block:
+                        break
+                    if self.fmt == "csv":
+                        writer.writerows(block)
+                    else:
+                        f.write("".join(json.dumps(dict(zip(self.columns, row))) + "\n" for row in block))
+                    self.written += len(block)
+            if self.cancelled:
+                os.unlink(partial)
+            else:
+                os.replace(partial, self.path)
+        except Exception:
+            if os.path.exists(partial):
+                os.unlink(partial)
+            raise
+        return {"path": self.path, "rows": self.written, "cancelled": self.cancelled,
+                "bytes": 0 if self.cancelled else os.path.getsize(self.path),
+                "duration_s": round(time.time() - started, 2)}
+
+
+class MetricSampler:
+    """samples the series feeding metric history and alert rules"""
+
+    def __init__(self, host_path=lambda path: path, pressure=None):
+        self.host_path = host_path
+        self.pressure = pressure
+        self.last_time = None
+        self.last_cpu = None
+        self.last_net = {}
+        self.last_disk_io = None
+        self.cpu_count = psutil.cpu_count() or 1
+
+    def sample(self) -> Dict[str, float]:
+        now = time.monotonic()
+        elapsed = now - self.last_time if self.last_time is not None else None
+        self.last_time = now
+        samples = {}
+        
+        # cpu from our own counters so we don't disturb psutil.cpu_percent() callers
+        cpu = psutil.cpu_times()
+        busy = sum(cpu) - cpu.idle - getattr(cpu, "iowait", 0.0)
+        if self.last_cpu is not None:
+            total = sum(cpu) - sum(self.last_cpu[0])
+            if total > 0:
+                samples["cpu.percent"] = round(100.0 * (busy - self.last_cpu[1]) / total, 2)
+        self.last_cpu = (cpu, busy)
+        
+        mem = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        samples["mem.percent"] = mem.percent
+        samples["mem.available_bytes"] = float(mem.available)
+        samples["swap.percent"] = swap.percent
+        
+        load1, load5, load15 = os.getloadavg()
+        samples["load.1"] = load1
+        samples["load.per_cpu"] = round(load1 / self.cpu_count, 3)
+        
+        for part in psutil.disk_partitions():
+            try:
+                usage = psutil.disk_usage(part.mountpoint)
+            except OSError:
+                continue
+            samples[f"disk.{part.mountpoint}.used_percent"] = usage.percent
+            samples[f"disk.{part.mountpoint}.free_bytes"] = float(usage.free)
+        
+        disk_io = psutil.disk_io_counters()
+        if disk_io is not None:
+            if self.last_disk_io is not None and elapsed:
+                samples["disk.read_bps"] = (disk_io.read_bytes - self.last_disk_io.read_bytes) / elapsed
+                samples["disk.write_bps"] = (disk_io.write_bytes - self.last_disk_io.write_bytes) / elapsed
+            self.last_disk_io = disk_io
+        
+        for name, counters in psutil.net_io_counters(pernic=True).items():
+            last = self.last_net.get(name)
+            if last is not None and elapsed:
+                samples[f"net.{name}.rx_bps"] = max(0.0, (counters.bytes_recv - last.bytes_recv) / elapsed)
+                samples[f"net.{name}.tx_bps"] = max(0.0, (counters.bytes_sent - last.bytes_sent) / elapsed)
+            self.last_net[name] = counters
+        
+        if self.pressure is not None:
+            samples.update(self.pressure.sample())
+        return samples
+
+
+class WindowAggregate:
+    """time-windowed mean/min/max/rate with amortised O(1) updates"""
+
+    def __init__(self, window: float):
+        self.window = window
+        self.samples = deque()
+        self.total = 0.0
+        self.mins = deque()
+        self.maxs = deque()
+
+    def update(self, ts: float, value: float):
+        self.samples.append((ts, value))
+        self.total += value
+        while self.mins and self.mins[-1][1] >= value:
+            self.mins.pop()
+        self.mins.append((ts, value))
+        while self.maxs and self.maxs[-1][1] <= value:
+            self.maxs.pop()
+        self.maxs.append((ts, value))
+        cutoff = ts - self.window
+        while self.samples[0][0] < cutoff:
+            self.total -= self.samples.popleft()[1]
+        while self.mins[0][0] < cutoff:
+            self.mins.popleft()
+        while self.maxs[0][0] < cutoff:
+            self.maxs.popleft()
+
+    def span(self) -> float:
+        return self.samples[-1][0] - self.samples[0][0] if self.samples else 0.0
+
+    def avg(self) -> float:
+        return self.total / len(self.samples)
+
+    def min(self) -> float:
+        return self.mins[0][1]
+
+    def max(self) -> float:
+        return self.maxs[0][1]
+
+    def rate(self) -> Optional[float]:
+        """change per second across the window"""
+        span = self.span()
+        if span < self.window / 2:
+            return None
+        return (self.samples[-1][1] - self.samples[0][1]) / span
+
+
+class EwmaAggregate:
+    """time-aware exponentially weighted moving average"""
+
+    def __init__(self, halflife: float):
+        self.halflife = halflife
+        self.value = None
+        self.last_ts = None
+
+    def update(self, ts: float, value: float):
+        if self.value is None:
+            self.value = value
+        else:
+            alpha = 1.0 - math.exp(-math.log(2) * max(ts - self.last_ts, 0.0) / self.halflife)
+            self.value += alpha * (value - self.value)
+        self.last_ts = ts
+
+
+DEFAULT_ALERT_RULES = [
+    {"name": "cpu-high", "series": "cpu.percent", "op": "value", "above": 90, "clear": 80, "for": 300,
+     "severity": "warning"},
+    {"name": "memory-high", "series": "mem.percent", "op": "ewma", "halflife": 30, "above": 90, "clear": 85,
+     "for": 120, "severity": "warning"},
+    {"name": "swap-high", "series": "swap.percent", "op": "avg", "window": 300, "above": 50, "clear": 40,
+     "severity": "warning"},
+    {"name": "load-high", "series": "load.per_cpu", "op": "avg", "window": 300, "above": 2.0, "clear": 1.5,
+     "severity": "warning"},
+    {"name": "disk-full", "series": "disk.*.used_percent", "op": "value", "above": 90, "clear": 88,
+     "severity": "critical"},
+    # free space dropping faster than 5 MB/s sustained over ten minutes
+    {"name": "disk-filling", "series": "disk.*.free_bytes", "op": "rate", "window": 600,
+     "below": -5 * 1024 * 1024, "clear": -1024 * 1024, "severity": "warning"}
+]
+
+
+def log_alert(log_path: Optional[str], ts: float, state: str, detail: str):
+    """print an alert event and append it to the alert log"""
+    line = f"{datetime.datetime.fromtimestamp(ts).isoformat(timespec='seconds')} {state} {detail}"
+    print(f"Alert: {line}")
+    if log_path:
+        try:
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            with open(log_path, "a") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            print(f"Could not write alert log: {e}")
+
+
+class AlertRule:
+    """one rule bound to one concrete series"""
+
+    __slots__ = ("spec", "name", "series", "read", "above", "threshold", "clear", "hold",
+                 "active", "pending_since", "since", "value")
+
+    def __init__(self, spec: Dict, series: str, read):
+        self.spec = spec
+        self.name = spec["name"]
+        self.series = series
+        self.read = read
+        self.above = "above" in spec
+        self.threshold = float(spec["above"] if self.above else spec["below"])
+        self.clear = float(spec.get("clear", self.threshold))
+        self.hold = float(spec.get("for", 0))
+        self.active = False
+        self.pending_since = None
+        self.since = None
+        self.value = None
+
+
+class AlertEngine:
+    """declarative threshold rules evaluated incrementally on every sample"""
+
+    OPS = ("value", "avg", "min", "max", "rate", "ewma")
+
+    def __init__(self, rules: List[Dict], log_path: Optional[str] = None):
+        self.specs = []
+        for spec in rules:
+            if spec.get("op", "value") not in self.OPS or ("above" in spec) == ("below" in spec):
+                print(f"Ignoring invalid alert rule: {spec}")
+                continue
+            self.specs.append(spec)
+        self.log_path = log_path
+        self.rules_by_series: Dict[str, List[AlertRule]] = {}
+        self.aggregates_by_series: Dict[str, Dict] = {}
+        self.active: Dict[tuple, AlertRule] = {}
+        self.events = deque(maxlen=500)
+        self.event_count = 0
+
+    def _bind(self, series: str) -> List[AlertRule]:
+        """instantiate matching rules the first time a series is seen"""
+        aggregates = self.aggregates_by_series.setdefault(series, {})
+        rules = []
+        for spec in self.specs:
+            if not fnmatch.fnmatchcase(series, spec["series"]):
+                continue
+            op = spec.get("op", "value")
+            if op == "value":
+                read = None
+            elif op == "ewma":
+                key = ("ewma", float(spec.get("halflife", 60)))
+                if key not in aggregates:
+                    aggregates[key] = EwmaAggregate(key[1])
+                read = lambda agg=aggregates[key]: agg.value
+            else:
+                # rules over the same series and window share one aggregate
+                key = ("window", float(spec.get("window", 60)))
+                if key not in aggregates:
+                    aggregates[key] = WindowAggregate(key[1])
+                read = getattr(aggregates[key], op)
+            rules.append(AlertRule(spec, series, read))
+        self.rules_by_series[series] = rules
+        return rules
+
+    def observe(self, series: str, ts: float, value: float):
+        rules = self.rules_by_series.get(series)
+        if rules is None:
+            rules = self._bind(series)
+        if not rules:
+            return
+        for aggregate in self.aggregates_by_series[series].values():
+            aggregate.update(ts, value)
+        for rule in rules:
+            current = value if rule.read is None else rule.read()
+            if current is None:
+                continue
+            rule.value = current
+            breached = current > rule.threshold if rule.above else current < rule.threshold
+            if not rule.active:
+                if not breached:
+                    rule.pending_since = None
+                    continue
+                if rule.pending_since is None:
+                    rule.pending_since = ts
+                if ts - rule.pending_since >= rule.hold:
+                    rule.active = True
+                    rule.since = ts
+                    self.active[(rule.name, series)] = rule
+                    self._emit("FIRING", rule, ts)
+            else:
+                # hysteresis: only resolve once past the clear threshold
+                recovered = current <= rule.clear if rule.above else current >= rule.clear
+                if recovered:
+                    rule.active = False
+                    rule.pending_since = None
+                    self.active.pop((rule.name, series), None)
+                    self._emit("RESOLVED", rule, ts)
+
+    def _emit(self, state: str, rule: AlertRule, ts: float):
+        self.notify(rule.name, rule.series, rule.value, rule.spec.get("severity", "warning"), state, ts)
+
+    def notify(self, name: str, series: str, value: float, severity: str = "warning",
+               state: str = "FIRING", ts: Optional[float] = None):
+        """record an event raised outside the rules (e.g. a kernel PSI trigger)"""
+        ts = time.time() if ts is None else ts
+        event = {
+            "time": ts,
+            "state": state,
+            "rule": name,
+            "series": series,
+            "severity": severity,
+            "value": round(value, 3)
+        }
+        self.events.append(event)
+        self.event_count += 1
+        log_alert(self.log_path, ts, state, f"[{severity}] {name} {series} = {event['value']}")
+
+
+DEFAULT_ANOMALY_CONFIG = {
+    "series": ["cpu.*", "mem.*", "net.*", "disk.*"],
+    "window": 300,
+    "mad_window": 900,
+    "period": 3600,
+    "period_bin": 60,
+    "zscore": 6.0,
+    "mad": 8.0,
+    "seasonal": 5.0
+}
+
+
+class AnomalyDetector:
+    """rolling z-score, median/MAD and seasonal baseline scoring over metric history
+
+    every model runs as whole-array numpy operations over a (series, samples)
+    matrix. the first pass scores the full history; later passes only score
+    the new samples plus the context their windows need, and the seasonal
+    per-phase baseline is rebuilt once per completed period
+    """
+
+    MODELS = ("zscore", "mad", "seasonal")
+
+    def __init__(self, config: Dict, log_path: Optional[str] = None):
+        self.patterns = config.get("series", DEFAULT_ANOMALY_CONFIG["series"])
+        self.window = int(config.get("window", 300))
+        self.mad_window = int(config.get("mad_window", 900))
+        self.period = int(config.get("period", 3600))
+        self.period_bin = int(config.get("period_bin", 60))
+        self.thresholds = {model: float(config.get(model, DEFAULT_ANOMALY_CONFIG[model])) for model in self.MODELS}
+        self.log_path = log_path
+        self.last_scored = None
+        self.baseline = None
+        self.current: Dict[str, Dict] = {}
+        self.events = deque(maxlen=500)
+        self.event_count = 0
+        self.last_duration = None
+
+    def matrix(self, history: MetricHistory, since: Optional[float] = None, context: int = 0):
+        """right-aligned (names, times, values) matrices padded with NaN
+
+        with `since`, each row only holds the samples newer than it plus
+        `context` older ones
+        """
+        names = [name for name in history.names()
+                 if any(fnmatch.fnmatchcase(name, pattern) for pattern in self.patterns)]
+        with history.lock:
+            rows = []
+            for name in names:
+                buffer = history.series.get(name)
+                if not buffer:
+                    continue
+                size, head = len(buffer), buffer.head
+                take = size
+                if since is not None:
+                    times = np.frombuffer(buffer.times)
+                    fresh = (size - head - np.searchsorted(times[head:], since, side="right")
+                             + head - np.searchsorted(times[:head], since, side="right"))
+                    take = min(size, int(fresh) + context)
+                    times = None
+                if take:
+                    rows.append((name, buffer, take))
+            width = max((take for name, buffer, take in rows), default=0)
+            times = np.full((len(rows), width), np.nan)
+            values = np.full((len(rows), width), np.nan)
+            for row, (name, buffer, take) in enumerate(rows):
+                # the newest `take` samples of the ring, oldest first
+                head, size = buffer.head, len(buffer)
+                for source, target in ((buffer.times, times), (buffer.values, values)):
+                    view = np.frombuffer(source)
+                    if take <= head:
+                        target[row, width - take:] = view[head - take:head]
+                    else:
+                        wrapped = take - head
+                        target[row, width - take:width - head] = view[size - wrapped:]
+                        target[row, width - head:] = view[:head]
+                    # drop the export before the lock is released so the ring can still grow
+                    view = None
+        return [name for name, buffer, take in rows], times, values
+
+    def _floor(self, level):
+        # a perfectly flat series would otherwise turn any wobble into an anomaly
+        return np.maximum(np.abs(level) * 0.01, 1e-6)
+
+    def zscore(self, values):
+        """score of every sample against the mean/std of the preceding window"""
+        count, width = values.shape
+        scores = np.full(values.shape, np.nan)
+        w = self.window
+        if width <= w:
+            return scores
+        valid = np.isfinite(values)
+        # centre each row first so the running sums of squares keep their precision
+        with np.errstate(invalid="ignore", divide="ignore"):
+            offset = np.nan_to_num(np.nanmean(values, axis=1, keepdims=True))
+        centred = np.where(valid, values - offset, 0.0)
+        zeros = np.zeros((count, 1))
+        sums = np.concatenate((zeros, np.cumsum(centred, axis=1)), axis=1)
+        squares = np.concatenate((zeros, np.cumsum(centred * centred, axis=1)), axis=1)
+        counts = np.concatenate((zeros, np.cumsum(valid, axis=1)), axis=1)
+        
+        n = counts[:, w:-1] - counts[:, :-w - 1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (sums[:, w:-1] - sums[:, :-w - 1]) / n
+            variance = (squares[:, w:-1] - squares[:, :-w - 1]) / n - mean * mean
+            std = np.maximum(np.sqrt(np.maximum(variance, 0.0)), self._floor(mean + offset))
+            score = (centred[:, w:] - mean) / std
+        scores[:, w:] = np.where((n >= w // 2) & valid[:, w:], score, np.nan)
+        return scores
+
+    def mad(self, values):
+        """robust score of every sample against the median/MAD of the previous block"""
+        count, width = values.shape
+        scores = np.full(values.shape, np.nan)
+        w = self.mad_window
+        blocks = width // w
+        if blocks < 2:
+            return scores
+        # blocks are aligned to the newest sample; partially filled blocks come out NaN
+        tail = values[:, width - blocks * w:].reshape(count, blocks, w)
+        median = np.median(tail, axis=2, keepdims=True)
+        deviation = np.median(np.abs(tail - median), axis=2, keepdims=True)
+        scale = np.maximum(1.4826 * deviation, self._floor(median))
+        with np.errstate(invalid="ignore"):
+            score = (tail[:, 1:] - median[:, :-1]) / scale[:, :-1]
+        scores[:, width - (blocks - 1) * w:] = score.reshape(count, -1)
+        return scores
+
+    def _phases(self, times):
+        valid = np.isfinite(times)
+        seconds = np.where(valid, times, 0.0).astype(np.int64)
+        return valid, seconds // self.period, (seconds % self.period) // self.period_bin
+
+    def seasonal_baseline(self, times, values, current: int):
+        """per (series, phase) count/mean/std over every period before `current`"""
+        count = len(values)
+        bins = -(-self.period // self.period_bin)
+        valid, cycle, phase = self._phases(times)
+        valid &= np.isfinite(values) & (cycle < current)
+        # excluded samples all land in one spare bin instead of being gathered out
+        index = np.where(valid, np.arange(count)[:, None] * bins + phase, count * bins).ravel()
+        weights = np.where(valid, values, 0.0).ravel()
+        n = np.bincount(index, minlength=count * bins + 1)[:-1].reshape(count, bins)
+        sums = np.bincount(index, weights, minlength=count * bins + 1)[:-1].reshape(count, bins)
+        squares = np.bincount(index, weights * weights, minlength=count * bins + 1)[:-1].reshape(count, bins)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = sums / n
+            std = np.sqrt(np.maximum(squares / n - mean * mean, 0.0))
+        earliest = np.where(valid, cycle, current).min(axis=1, initial=current)
+        # needs at least two complete earlier periods to call anything unusual
+        mature = (current - earliest >= 2)[:, None] & (n > 0)
+        return np.where(mature, mean, np.nan), np.maximum(std, self._floor(mean))
+
+    def seasonal(self, times, values, mean, std, current: int):
+        """score samples in the current period against the same phase of earlier periods"""
+        valid, cycle, phase = self._phases(times)
+        rows = np.arange(len(values))[:, None]
+        with np.errstate(invalid="ignore"):
+            score = (values - mean[rows, phase]) / std[rows, phase]
+        return np.where(valid & (cycle == current), score, np.nan)
+
+    def score(self, history: MetricHistory) -> Dict[str, Dict]:
+        """score the new samples and record anomalies among them"""
+        start = time.perf_counter()
+        context = max(self.window, 2 * self.mad_window)
+        names, times, values = self.matrix(history, self.last_scored, context)
+        if not names:
+            return {}
+        latest = float(np.nanmax(times))
+        current = int(latest) // self.period
+        if self.baseline is None or self.baseline[0] != (current, tuple(names)):
+            if self.last_scored is not None:
+                # a new period began or series came and went: rebuild from the full history
+                names, times, values = self.matrix(history)
+            self.baseline = ((current, tuple(names)),) + self.seasonal_baseline(times, values, current)
+        mean, std = self.baseline[1:]
+        
+        scores = {
+            "zscore": self.zscore(values),
+            "mad": self.mad(values),
+            "seasonal": self.seasonal(times, values, mean, std, current)
+        }
+        fresh = np.isfinite(times)
+        if self.last_scored is not None:
+            fresh &= times > self.last_scored
+        findings = {}
+        events = []
+        for model, model_scores in scores.items():
+            magnitude = np.where(fresh & np.isfinite(model_scores), np.abs(model_scores), 0.0)
+            worst = magnitude.argmax(axis=1)
+            peak = magnitude[np.arange(len(names)), worst]
+            for row in np.flatnonzero(peak > self.thresholds[model]):
+                column = worst[row]
+                finding = {
+                    "time": float(times[row, column]),
+                    "series": names[row],
+                    "model": model,
+                    "score": round(float(model_scores[row, column]), 2),
+                    "value": round(float(values[row, column]), 3)
+                }
+                findings.setdefault(names[row], {})[model] = finding
+                events.append(finding)
+        
+        self.last_scored = latest
+        self.current = findings
+        for event in sorted(events, key=itemgetter("time")):
+            self._emit(event)
+        self.last_duration = time.perf_counter() - start
+        return findings
+
+    def _emit(self, event: Dict):
+        self.events.append(event)
+        self.event_count += 1
+        log_alert(self.log_path, event["time"], "ANOMALY",
+                  f"[{event['model']}] {event['series']} = {event['value']} (score {event['score']})")
+
+
+DEFAULT_SYSCTL_BASELINE = [
+    {"key": "kernel.kptr_restrict", "min": 1},
+    {"key": "kernel.dmesg_restrict", "equals": 1},
+    {"key": "kernel.unprivileged_bpf_disabled", "min": 1},
+    {"key": "kernel.yama.ptrace_scope", "min": 1},
+    {"key": "kernel.randomize_va_space", "equals": 2},
+    {"key": "kernel.kexec_load_disabled", "equals": 1},
+    {"key": "kernel.perf_event_paranoid", "min": 2},
+    {"key": "kernel.sysrq", "equals": 0},
+    {"key": "kernel.unprivileged_userns_clone", "equals": 0},
+    {"key": "fs.protected_hardlinks", "equals": 1},
+    {"key": "fs.protected_symlinks", "equals": 1},
+    {"key": "fs.protected_fifos", "min": 1},
+    {"key": "fs.protected_regular", "min": 1},
+    {"key": "fs.suid_dumpable", "equals": 0},
+    {"key": "dev.tty.ldisc_autoload", "equals": 0},
+    {"key": "vm.unprivileged_userfaultfd", "equals": 0},
+    {"key": "net.core.bpf_jit_harden", "equals": 2},
+    {"key": "net.ipv4.tcp_syncookies", "equals": 1},
+    {"key": "net.ipv4.icmp_echo_ignore_broadcasts", "equals": 1},
+    {"key": "net.ipv4.conf.all.rp_filter", "min": 1},
+    {"key": "net.ipv4.conf.all.accept_redirects", "equals": 0},
+    {"key": "net.ipv4.conf.default.accept_redirects", "equals": 0},
+    {"key": "net.ipv4.conf.all.send_redirects", "equals": 0},
+    {"key": "net.ipv4.conf.all.accept_source_route", "equals": 0},
+    {"key": "net.ipv4.conf.all.log_martians", "equals": 1},
+    {"key": "net.ipv6.conf.all.accept_redirects", "equals": 0},
+    {"key": "net.ipv6.conf.default.accept_redirects", "equals": 0}
+]
+
+
+class SysctlAuditor:
+    """audits /proc/sys against a declarative baseline
+
+    the first audit snapshots the whole tree in one parallel walk; later
+    audits only re-read the keys the baseline matched and re-evaluate the
+    ones whose value changed. a rule key may be a glob, in which case the
+    listing of the directory it expands in decides when to walk again
+    """
+
+    def __init__(self, root: str, rules: List[Dict]):
+        self.root = root
+        self.rules = []
+        for rule in rules:
+            if "key" not in rule or not ({"equals", "min", "max", "one_of"} & rule.keys()):
+                print(f"Ignoring invalid sysctl rule: {rule}")
+                continue
+            self.rules.append(rule)
+        self.lock = threading.Lock()
+        self.scanned = 0
+        self.matched: Dict[str, List[Dict]] = {}
+        self.values: Dict[str, str] = {}
+        self.results: Dict[str, Optional[str]] = {}
+        self.listings: Dict[str, tuple] = {}
+
+    def key_path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("."))
+
+    def _read(self, path: str) -> Optional[str]:
+        try:
+            with open(path, 'r') as f:
+                return " ".join(f.read().split())
+        except OSError:
+            # write-only entries (vm.drop_caches, ...) and restricted ones
+            return None
+
+    def _read_dir(self, path: str, prefix: str):
+        values, subdirs = {}, []
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return values, subdirs
+        for entry in entries:
+            key = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append((entry.path, key + "."))
+            else:
+                value = self._read(entry.path)
+                if value is not None:
+                    values[key] = value
+        return values, subdirs
+
+    def snapshot(self) -> Dict[str, str]:
+        """every readable sysctl, one directory per task"""
+        values = {}
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            pending = {pool.submit(self._read_dir, self.root, "")}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    found, subdirs = future.result()
+                    values.update(found)
+                    pending.update(pool.submit(self._read_dir, path, prefix) for path, prefix in subdirs)
+        return values
+
+    def _glob_dirs(self) -> List[str]:
+        """directories whose listing changes what the glob rules expand to"""
+        dirs = set()
+        for rule in self.rules:
+            parts = rule["key"].split(".")
+            for i, part in enumerate(parts):
+                if any(c in part for c in "*?["):
+                    dirs.add(os.path.join(self.root, *parts[:i]))
+                    break
+        return sorted(dirs)
+
+    def _listing(self, path: str) -> tuple:
+        try:
+            return tuple(sorted(os.listdir(path)))
+        except OSError:
+            return ()
+
+    def _rescan(self):
+        values = self.snapshot()
+        self.scanned = len(values)
+        self.listings = {path: self._listing(path) for path in self._glob_dirs()}
+        self.matched = {}
+        for rule in self.rules:
+            if any(c in rule["key"] for c in "*?["):
+                keys = fnmatch.filter(values, rule["key"])
+            else:
+                # checked even while missing, the module may load later
+                keys = [rule["key"]]
+            for key in keys:
+                self.matched.setdefault(key, []).append(rule)
+        return {key: values.get(key) for key in self.matched}
+
+    def evaluate(self, value: str, rule: Dict) -> Optional[str]:
+        """the expectation a value fails, or None"""
+        first = value.split()[0] if value else ""
+        if "equals" in rule and value != str(rule["equals"]):
+            return f"== {rule['equals']}"
+        if "one_of" in rule and value not in [str(v) for v in rule["one_of"]]:
+            return "one of " + ", ".join(str(v) for v in rule["one_of"])
+        try:
+            number = int(first)
+        except ValueError:
+            number = None
+        if "min" in rule and (number is None or number < rule["min"]):
+            return f">= {rule['min']}"
+        if "max" in rule and (number is None or number > rule["max"]):
+            return f"<= {rule['max']}"
+        return None
+
+    def audit(self, full: bool = False) -> Dict:
+        with self.lock:
+            if full or not self.matched or any(self._listing(path) != listing
+                                               for path, listing in self.listings.items()):
+                current = self._rescan()
+                self.values, self.results = {}, {}
+            else:
+                current = {key: self._read(self.key_path(key)) for key in self.matched}
+            
+            deviations, missing = {}, []
+            for key, value in current.items():
+                if value is None:
+                    missing.append(key)
+                    continue
+                # unchanged values keep their previous verdict
+                if self.values.get(key) != value or key not in self.results:
+                    failed = [self.evaluate(value, rule) for rule in self.matched[key]]
+                    self.results[key] = " and ".join(dict.fromkeys(f for f in failed if f)) or None
+                    self.values[key] = value
+                if self.results[key]:
+                    deviations[key] = {"value": value, "expected": self.results[key]}
+            return {
+                "scanned": self.scanned,
+                "checked": len(current) - len(missing),
+                "missing": sorted(missing),
+                "deviations": deviations
+            }
+
+
+DEFAULT_INTEGRITY_CONFIG = {
+    "paths": ["/etc", "/usr/bin", "/usr/sbin", "/boot"],
+    "exclude": ["/etc/mtab", "/etc/ld.so.cache", "/etc/adjtime", "*.swp", "*~"]
+}
+
+
+def hash_files(paths: List[str]) -> List[tuple]:
+    """sha256 of each file through mmap; runs in the integrity pool workers"""
+    results = []
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    digest = hashlib.sha256().hexdigest()
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        digest = hashlib.sha256(mapped).hexdigest()
+        except (OSError, ValueError):
+            digest = None
+        results.append((path, digest))
+    return results
+
+
+class FileIntegrityMonitor:
+    """hashes the configured paths against a persistent sqlite baseline
+
+    rows carry (dev, inode, size, mtime_ns, ctime_ns); a verify only
+    re-hashes files whose metadata no longer matches their row
+    """
+
+    # (dev, inode, size, mtime_ns, ctime_ns) decide whether a file needs hashing
+    STAT_FIELDS = 5
+
+    def __init__(self, paths: List[str], db_path: str, host_path=lambda path: path,
+                 exclude: Optional[List[str]] = None, workers: Optional[int] = None):
+        self.paths = paths
+        self.exclude = exclude or []
+        self.excluded = re.compile("|".join(fnmatch.translate(pattern) for pattern in self.exclude) or "(?!)")
+        self.db_path = db_path
+        self.host_path = host_path
+        self.workers = workers or os.cpu_count() or 1
+        self.lock = threading.Lock()
+        self.running = None
+        self.progress = (0, 0)
+        self.pending = None
+        self._last_report = None
+
+    def connect(self):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        db = sqlite3.connect(self.db_path)
+        db.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, dev INTEGER, inode INTEGER, "
+                   "size INTEGER, mtime_ns INTEGER, ctime_ns INTEGER, mode INTEGER, uid INTEGER, gid INTEGER, "
+                   "digest TEXT)")
+        db.execute("CREATE INDEX IF NOT EXISTS files_stat ON files (dev, inode, size, mtime_ns, ctime_ns)")
+        db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        return db
+
+    @property
+    def last_report(self) -> Optional[Dict]:
+        """report of the most recent baseline or verify, kept across restarts"""
+        if self._last_report is None and os.path.exists(self.db_path):
+            try:
+                db = self.connect()
+                row = db.execute("SELECT value FROM meta WHERE key = 'last_report'").fetchone()
+                db.close()
+                if row:
+                    self._last_report = json.loads(row[0])
+            except sqlite3.Error as e:
+                print(f"Could not read integrity database: {e}")
+        return self._last_report
+
+    def walk(self) -> Dict[str, tuple]:
+        """path -> (dev, inode, size, mtime_ns, ctime_ns, mode, uid, gid) under every root"""
+        files = {}
+        stack = [(self.host_path(path), path.rstrip("/") or "/") for path in self.paths]
+        while stack:
+            real, logical = stack.pop()
+            try:
+                entries = list(os.scandir(real))
+            except OSError:
+                continue
+            for entry in entries:
+                path = os.path.join(logical, entry.name)
+                if self.excluded.match(path):
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISDIR(st.st_mode):
+                    stack.append((entry.path, path))
+                elif stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode):
+                    files[path] = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns,
+                                   st.st_mode, st.st_uid, st.st_gid)
+        return files
+
+    def digests(self, files: Dict[str, tuple]) -> Dict[str, Optional[str]]:
+        """content digests, regular files hashed across a process pool"""
+        digests = {}
+        logical = {}
+        for path, meta in files.items():
+            if stat.S_ISLNK(meta[5]):
+                try:
+                    digests[path] = "link:" + os.readlink(self.host_path(path))
+                except OSError:
+                    digests[path] = None
+            else:
+                logical[self.host_path(path)] = path
+        regular = list(logical)
+        
+        total = len(regular)
+        self.progress = (0, total)
+        chunks = [regular[i:i + 256] for i in range(0, total, 256)]
+        if len(chunks) <= 1:
+            batches = map(hash_files, chunks)
+        else:
+            # forkserver keeps the pool from inheriting the Tk process state
+            pool = ProcessPoolExecutor(max_workers=min(self.workers, len(chunks)),
+                                       mp_context=multiprocessing.get_context("forkserver"))
+            batches = pool.map(hash_files, chunks)
+        done = 0
+        try:
+            for batch in batches:
+                for real, digest in batch:
+                    digests[logical[real]] = digest
+                done += len(batch)
+                self.progress = (done, total)
+        finally:
+            if len(chunks) > 1:
+                pool.shutdown()
+        return digests
+
+    def _finish(self, db, report: Dict) -> Dict:
+        report["finished"] = time.time()
+        report["duration_s"] = round(report["finished"] - report["started"], 3)
+        db.execute("INSERT OR REPLACE INTO meta VALUES ('last_report', ?)", (json.dumps(report),))
+        db.commit()
+        self._last_report = report
+        return report
+
+    def baseline(self) -> Dict:
+        """hash everything and replace the stored baseline"""
+        with self.lock:
+            self.running = "baseline"
+            try:
+                started = time.time()
+                files = self.walk()
+                digests = self.digests(files)
+                db = self.connect()
+                try:
+                    db.execute("DELETE FROM files")
+                    db.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   ((path,) + meta + (digests[path],) for path, meta in files.items()))
+                    self.pending = None
+                    return self._finish(db, {"kind": "baseline", "started": started, "files": len(files),
+                                             "hashed": len(digests), "unreadable": sum(d is None for d in digests.values()),
+                                             "added": [], "removed": [], "modified": [], "metadata": []})
+                finally:
+                    db.close()
+            finally:
+                self.running = None
+
+    def verify(self) -> Dict:
+        """compare against the baseline, hashing only files whose metadata changed"""
+        with self.lock:
+            self.running = "verify"
+            try:
+                started = time.time()
+                db = self.connect()
+                try:
+                    stored = {row[0]: row[1:] for row in db.execute("SELECT * FROM files")}
+                    if not stored:
+                        raise ValueError("No integrity baseline yet")
+                    files = self.walk()
+                    changed = {path: meta for path, meta in files.items()
+                               if stored.get(path, ())[:self.STAT_FIELDS] != meta[:self.STAT_FIELDS]}
+                    digests = self.digests(changed)
+                    
+                    added, modified, metadata, touched = [], [], [], []
+                    for path, meta in changed.items():
+                        row = stored.get(path)
+                        if row is None:
+                            added.append(path)
+                        elif digests[path] is None or row[-1] is None or digests[path] != row[-1]:
+                            # content that could not be read cannot be vouched for, so
+                            # a changed unreadable file is never just touched
+                            modified.append(path)
+                        elif meta[5:] != row[5:8]:
+                            metadata.append(path)
+                        else:
+                            touched.append(path)
+                    removed = sorted(stored.keys() - files.keys())
+                    
+                    # same content and ownership under new metadata (touch, reinstalled
+                    # package): refresh the row so the next verify skips it
+                    db.executemany("UPDATE files SET dev = ?, inode = ?, size = ?, mtime_ns = ?, ctime_ns = ? "
+                                   "WHERE path = ?",
+                                   (changed[path][:self.STAT_FIELDS] + (path,) for path in touched))
+                    self.pending = {"files": {path: changed[path] + (digests[path],)
+                                              for path in added + modified + metadata},
+                                    "removed": removed}
+                    return self._finish(db, {"kind": "verify", "started": started, "files": len(files),
+                                             "hashed": len(digests),
+                                             "unreadable": sum(d is None for d in digests.values()),
+                                             "added": sorted(added), "removed": removed,
+                                             "modified": sorted(modified), "metadata": sorted(metadata)})
+                finally:
+                    db.close()
+            finally:
+                self.running = None
+
+    def accept(self) -> Optional[Dict]:
+        """take the changes found by the last verify into the baseline"""
+        with self.lock:
+            if not self.pending:
+                return None
+            db = self.connect()
+            try:
+                db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               ((path,) + row for path, row in self.pending["files"].items()))
+                db.executemany("DELETE FROM files WHERE path = ?", ((path,) for path in self.pending["removed"]))
+                report = dict(self.last_report, added=[], removed=[], modified=[], metadata=[], accepted=True)
+                self.pending = None
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('last_report', ?)", (json.dumps(report),))
+                db.commit()
+                self._last_report = report
+                return report
+            finally:
+                db.close()
+
+
+def integrity_changes(report: Dict) -> List[tuple]:
+    """(change, path) rows of a baseline or verify report"""
+    return [(change, path) for change in ("modified", "added", "removed", "metadata") for path in report[change]]
+
+
+# counters of `iptables-save -c` chain (":INPUT DROP [p:b]") and rule ("[p:b] -A ...") lines
+IPTABLES_LINE_COUNTERS = re.compile(r"(:\S+ \S+ |)\[(\d+):(\d+)\]")
+# every counter pair in a whole ruleset dump, in text order
+IPTABLES_COUNTERS = re.compile(r"\[(\d+):(\d+)\]")
+NFT_COUNTERS = re.compile(r'"packets": ?(\d+), ?"bytes": ?(\d+)')
+
+FIREWALL_COLUMNS = ["table", "chain", "index", "target", "protocol", "source", "destination", "match",
+                    "packets", "bytes"]
+FIREWALL_CHAIN_COLUMNS = ["table", "chain", "policy", "packets", "bytes"]
+NFT_VERDICTS = ("accept", "drop", "reject", "return", "continue", "queue", "jump", "goto",
+                "masquerade", "snat", "dnat", "redirect")
+
+
+def parse_iptables_save(text: str) -> Dict:
+    """chains and rules of `iptables-save -c` output
+
+    slots lists, in text order, which chain or rule row each counter belongs to
+    """
+    chains, rows, slots = [], [], []
+    table = ""
+    index = Counter()
+    for line in text.splitlines():
+        if not line or line[0] == "#" or line == "COMMIT":
+            continue
+        if line[0] == "*":
+            table = line[1:]
+            continue
+        packets = bytes_ = None
+        match = IPTABLES_LINE_COUNTERS.match(line)
+        if match:
+            packets, bytes_ = int(match.group(2)), int(match.group(3))
+            line = match.group(1) or line[match.end():].lstrip()
+        if line[0] == ":":
+            name, policy = (line[1:].split() + ["-"])[:2]
+            if match:
+                slots.append((0, len(chains)))
+            chains.append([table, name, policy, packets, bytes_])
+            continue
+        
+        tokens = line.split()
+        if len(tokens) < 2 or tokens[0] != "-A":
+            continue
+        chain = tokens[1]
+        target = protocol = source = destination = ""
+        parts = []
+        negate = ""
+        i = 2
+        while i < len(tokens):
+            token = tokens[i]
+            value = tokens[i + 1] if i + 1 < len(tokens) else ""
+            if token == "!":
+                negate = "!"
+                i += 1
+                continue
+            if token in ("-s", "--source"):
+                source = negate + value
+                i += 2
+            elif token in ("-d", "--destination"):
+                destination = negate + value
+                i += 2
+            elif token in ("-p", "--protocol"):
+                protocol = negate + value
+                i += 2
+            elif token in ("-j", "--jump"):
+                target = value
+                i += 2
+            elif token in ("-g", "--goto"):
+                target = f"goto {value}"
+                i += 2
+            else:
+                parts.append(negate + token)
+                i += 1
+            negate = ""
+        index[(table, chain)] += 1
+        if match:
+            slots.append((1, len(rows)))
+        rows.append([table, chain, index[(table, chain)], target, protocol, source, destination,
+                     " ".join(parts), packets, bytes_])
+    return {"chains": chains, "rows": rows, "slots": slots}
+
+
+def _nft_text(value) -> str:
+    """nft JSON expression operand as nft syntax, near enough to read"""
+    if isinstance(value, list):
+        return "{ " + ", ".join(_nft_text(item) for item in value) + " }"
+    if not isinstance(value, dict):
+        return str(value)
+    if len(value) == 1:
+        key, inner = next(iter(value.items()))
+        if key == "payload":
+            return f"{inner.get('protocol', inner.get('base', ''))} {inner.get('field', inner.get('offset', ''))}"
+        if key in ("meta", "ct"):
+            return f"{key} {inner.get('key', '')}"
+        if key == "prefix" and isinstance(inner, dict):
+            return f"{_nft_text(inner['addr'])}/{inner['len']}"
+        if key == "range":
+            return "-".join(_nft_text(item) for item in inner)
+        if key == "set":
+            return _nft_text(inner)
+    return json.dumps(value, separators=(",", ":"))
+
+
+def parse_nft_json(text: str) -> Dict:
+    """chains and rules of `nft -j list ruleset` output, in the same shape as parse_iptables_save"""
+    chains, rows, slots = [], [], []
+    index = Counter()
+    for item in json.loads(text).get("nftables", []):
+        kind, obj = next(iter(item.items()))
+        if kind == "chain":
+            chains.append([f"{obj['family']} {obj['table']}", obj["name"], obj.get("policy", "-"), None, None])
+        elif kind == "counter" and isinstance(obj, dict) and "packets" in obj:
+            # named counter object, takes a counter slot but no row
+            slots.append((2, 0))
+        elif kind == "rule":
+            table = f"{obj['family']} {obj['table']}"
+            target = protocol = source = destination = ""
+            parts = []
+            packets = bytes_ = None
+            for expr in obj.get("expr", []):
+                key, inner = next(iter(expr.items()))
+                if key == "match":
+                    left, right, op = inner["left"], _nft_text(inner["right"]), inner.get("op", "==")
+                    field = left.get("payload", {}).get("field") if isinstance(left, dict) else None
+                    negate = "!" if op == "!=" else ""
+                    if field == "saddr":
+                        source = negate + right
+                    elif field == "daddr":
+                        destination = negate + right
+                    else:
+                        if field in ("sport", "dport"):
+                            protocol = protocol or left["payload"].get("protocol", "")
+                        elif isinstance(left, dict) and left.get("meta", {}).get("key") == "l4proto":
+                            protocol = negate + right
+                            continue
+                        parts.append(f"{_nft_text(left)} {'' if op == '==' else op + ' '}{right}")
+                elif key == "counter":
+                    if isinstance(inner, dict) and "packets" in inner:
+                        packets, bytes_ = inner["packets"], inner["bytes"]
+                        slots.append((1, len(rows)))
+                elif key in NFT_VERDICTS:
+                    target = key if inner is None else f"{key} {inner.get('target', _nft_text(inner)) if isinstance(inner, dict) else inner}"
+                elif isinstance(inner, dict):
+                    parts.append(" ".join([key] + [f"{name} {_nft_text(value)}" for name, value in inner.items()]))
+                else:
+                    parts.append(key if inner is None else f"{key} {_nft_text(inner)}")
+            index[(table, obj["chain"])] += 1
+            rows.append([table, obj["chain"], index[(table, obj["chain"])], target, protocol, source,
+                         destination, " ".join(parts), packets, bytes_])
+    return {"chains": chains, "rows": rows, "slots": slots}
+
+
+class FirewallInspector:
+    """structured firewall ruleset, re-parsed only when the rules change
+
+    the ruleset is hashed with its counters blanked out; while that hash is
+    unchanged, only the counters are patched into the cached rows
+    """
+
+    BACKENDS = (
+        ("iptables", ["iptables-save", "-c"], IPTABLES_COUNTERS, parse_iptables_save),
+        ("nftables", ["nft", "-j", "list", "ruleset"], NFT_COUNTERS, parse_nft_json)
+    )
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.ruleset = None
+        self.slots = None
+        self.loaded_at = 0.0
+        self.parses = 0
+        self.counter_updates = 0
+
+    def read(self):
+        """(backend, counters pattern, parser, output) of the first backend with rules loaded"""
+        denied = False
+        for backend, command, counters, parser in self.BACKENDS:
+            try:
+                output = run_command(command, timeout=5, stderr=subprocess.PIPE).decode(errors="replace")
+            except subprocess.CalledProcessError as e:
+                stderr = (e.stderr or b"").decode(errors="replace").lower()
+                denied = denied or "permission denied" in stderr or "operation not permitted" in stderr
+                continue
+            except (OSError, subprocess.SubprocessError):
+                continue
+            # iptables-nft prints nothing on pure nftables hosts
+            if backend == "iptables" and "\n*" not in "\n" + output:
+                continue
+            return backend, counters, parser, output
+        if denied:
+            raise PermissionError("Reading the firewall ruleset requires root")
+        raise FileNotFoundError("No iptables-save or nft ruleset available")
+
+    def load(self) -> Dict:
+        with self.lock:
+            now = time.monotonic()
+            if self.ruleset is not None and now - self.loaded_at < self.min_interval:
+                return self.ruleset
+            backend, counters, parser, output = self.read()
+            # one regex pass splits the dump into rule text and counter pairs
+            parts = counters.split(output)
+            values = list(zip(parts[1::3], parts[2::3]))
+            parts[1::3] = parts[2::3] = [""] * len(values)
+            # iptables-save stamps "# Generated/Completed on <time>" on every dump
+            digest = hashlib.sha1(re.sub(r"(?m)^#.*\n?", "", "".join(parts)).encode()).hexdigest()
+            ruleset = self.ruleset
+            if ruleset is not None and ruleset["digest"] == digest and ruleset["backend"] == backend:
+                if len(values) == len(self.slots):
+                    tables = (ruleset["chains"]["rows"], ruleset["rows"])
+                    for (kind, row), (packets, bytes_) in zip(self.slots, values):
+                        if kind < 2:
+                            tables[kind][row][-2:] = int(packets), int(bytes_)
+                    self.counter_updates += 1
+                    self.loaded_at = now
+                    return ruleset
+            
+            start = time.perf_counter()
+            parsed = parser(output)
+            self.slots = parsed["slots"]
+            self.parses += 1
+            self.ruleset = {
+                "backend": backend,
+                "digest": digest,
+                "parse_ms": round((time.perf_counter() - start) * 1000, 1),
+                "chains": {"columns": FIREWALL_CHAIN_COLUMNS, "rows": parsed["chains"]},
+                "columns": FIREWALL_COLUMNS,
+                "rows": parsed["rows"]
+            }
+            self.loaded_at = now
+            return self.ruleset
+
+
+class VirtualList(Frame):
+    """Treeview that only holds the visible rows of a large list
+
+    the rows live in a python list; scrolling just rewrites the values of
+    a fixed pool of items, so 50k rows cost the same as 50
+    """
+
+    def __init__(self, parent, columns, widths=None, style="Custom.Treeview", tag=None, **kwargs):
+        super().__init__(parent, bg="#000000", **kwargs)
+        self.columns = columns
+        self.tag = tag
+        self.rows = []
+        self.top = 0
+        self.visible = 0
+        self.sort_column = None
+        self.sort_reverse = False
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", style=style, selectmode="browse")
+        for column, width in zip(columns, widths or [120] * len(columns)):
+            self.tree.heading(column, text=column.title(), command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=width, anchor="w")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<Configure>", lambda event: self.resize(event.height))
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self.on_wheel)
+        self.row_height = int(ttk.Style().lookup(style, "rowheight") or 20)
+
+    def resize(self, height: int):
+        # the header takes about one row
+        visible = max(1, height // self.row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    def set_rows(self, rows: List):
+        self.rows = rows
+        if self.sort_column is not None:
+            self._sort()
+        self.render()
+
+    def sort_by(self, column: str):
+        self.sort_reverse = self.sort_column == column and not self.sort_reverse
+        self.sort_column = column
+        self._sort()
+        self.top = 0
+        self.render()
+
+    def _sort(self):
+        i = self.columns.index(self.sort_column)
+        # numbers before text; missing values are kept out of the sort so they
+        # stay last in both directions
+        present = [row for row in self.rows if row[i] is not None]
+        present.sort(key=lambda row: (not isinstance(row[i], (int, float)),
+                                      row[i] if isinstance(row[i], (int, float)) else str(row[i])),
+                     reverse=self.sort_reverse)
+        self.rows[:] = present + [row for row in self.rows if row[i] is None]
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            step = self.visible if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self.render()
+
+    def on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.top -= 3
+        else:
+            self.top += 3
+        self.render()
+        return "break"
+
+    def render(self):
+        self.top = max(0, min(self.top, len(self.rows) - self.visible))
+        window = self.rows[self.top:self.top + self.visible]
+        items = self.tree.get_children()
+        if len(items) > len(window):
+            self.tree.delete(*items[len(window):])
+            items = items[:len(window)]
+        for i, row in enumerate(window):
+            values = ["" if value is None else value for value in row]
+            tags = (self.tag(row),) if self.tag else ()
+            if i < len(items):
+                self.tree.item(items[i], values=values, tags=tags)
+            else:
+                self.tree.insert("", "end", values=values, tags=tags)
+        if self.rows:
+            self.scrollbar.set(self.top / len(self.rows), (self.top + len(window)) / len(self.rows))
+        else:
+            self.scrollbar.set(0, 1)
+
+
+STATUS_GOOD = ("Active", "Enabled", "Up to Date", "Protected", "Secure")
+STATUS_BAD = ("Inactive", "Disabled", "Not Found", "Unprotected", "Insecure")
+
+
+def status_tag(value) -> str:
+    """traffic light colour of a check result"""
+    if value in STATUS_GOOD:
+        return "good"
+    if value in STATUS_BAD:
+        return "bad"
+    return "warn"
+
+
+def pressure_tag(value) -> str:
+    """colour of an 'avg10 / avg60 / avg300' row by its avg10"""
+    try:
+        avg10 = float(str(value).split("%")[0])
+    except ValueError:
+        return "plain"
+    return "bad" if avg10 >= 20 else "warn" if avg10 >= 5 else "good"
+
+
+class InfoTable(Frame):
+    """sectioned key/value rows in a single Treeview, updated in place
+
+    a tab costs three widgets however many rows it has, and set_row() only
+    touches the cells whose text or colour actually changed
+    """
+
+    def __init__(self, parent, style="Custom.Treeview", status=None, section_font=None,
+                 key_width=220, **kwargs):
+        super().__init__(parent, bg="#000000", **kwargs)
+        self.status = status
+        self.values = {}
+        self.sections = {}
+        self.changes = 0
+        self.tree = ttk.Treeview(self, columns=("value",), show="tree", style=style, selectmode="none")
+        self.tree.column("#0", width=key_width, stretch=False)
+        self.tree.column("value", width=600, anchor="w")
+        self.tree.tag_configure("plain", foreground="#00ff00")
+        self.tree.tag_configure("good", foreground="#00ff00")
+        self.tree.tag_configure("warn", foreground="#ffff00")
+        self.tree.tag_configure("bad", foreground="#ff0000")
+        if section_font is not None:
+            self.tree.tag_configure("section", font=section_font)
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+    def _section(self, title: str) -> str:
+        if not title:
+            return ""
+        iid = self.sections.get(title)
+        if iid is None:
+            iid = self.sections[title] = self.tree.insert("", "end", text=title, open=True,
+                                                          tags=("section", "plain"))
+        return iid
+
+    def set_row(self, key: str, value, section: str = "") -> bool:
+        """set one row, returns whether anything on screen changed"""
+        text = "" if value is None else str(value).replace("\n", "  ")
+        tag = self.status(value) if self.status else "plain"
+        iid = f"{section}\x1f{key}"
+        if self.values.get(iid) == (text, tag):
+            return False
+        if iid in self.values:
+            self.tree.item(iid, values=(text,), tags=(tag,))
+        else:
+            self.tree.insert(self._section(section), "end", iid=iid, text=key, values=(text,), tags=(tag,))
+        self.values[iid] = (text, tag)
+        self.changes += 1
+        return True
+
+    def load(self, sections: Dict[str, Dict]):
+        """sync with {section: {key: value}}, dropping rows that went away"""
+        seen = set()
+        for section, rows in sections.items():
+            for key, value in rows.items():
+                self.set_row(key, value, section)
+                seen.add(f"{section}\x1f{key}")
+        for iid in [iid for iid in self.values if iid not in seen]:
+            self.tree.delete(iid)
+            del self.values[iid]
+        for title in [title for title in self.sections if title not in sections]:
+            self.tree.delete(self.sections.pop(title))
+
+
+APT_UPGRADABLE = re.compile(r"^(\S+?)/(\S+) (\S+) (\S+) \[upgradable from: ([^\]]+)\]", re.M)
+
+
+class UpdateChecker:
+    """pending package updates, persisted and recomputed only when apt/dpkg state changes
+
+    the cached result is keyed by the stat of /var/lib/dpkg/status and the
+    apt lists directory; a changed key refreshes in the background while the
+    previous result keeps being served
+    """
+
+    def __init__(self, cache_path: str, host_path=lambda path: path):
+        self.cache_path = cache_path
+        self.host_path = host_path
+        self.lock = threading.Lock()
+        self.thread = None
+        self._result = None
+
+    def signature(self) -> List:
+        signature = []
+        for path in ("/var/lib/dpkg/status", "/var/lib/apt/lists"):
+            try:
+                st = os.stat(self.host_path(path))
+                signature.append([st.st_mtime_ns, st.st_size])
+            except OSError:
+                signature.append(None)
+        return signature
+
+    @property
+    def result(self) -> Optional[Dict]:
+        if self._result is None:
+            try:
+                with open(self.cache_path, "r") as f:
+                    self._result = json.load(f)
+            except (OSError, ValueError):
+                pass
+        return self._result
+
+    def fresh(self) -> bool:
+        result = self.result
+        return result is not None and result.get("signature") == self.signature()
+
+    def refresh(self) -> Dict:
+        """run apt and persist the result; blocks for as long as apt takes"""
+        signature = self.signature()
+        result = {"signature": signature, "checked_at": time.time(), "error": None, "packages": []}
+        try:
+            output = subprocess.run(["apt", "list", "--upgradable"], capture_output=True, timeout=120,
+                                    env={**os.environ, "LANG": "C"}).stdout.decode(errors="replace")
+            for name, suites, candidate, arch, current in APT_UPGRADABLE.findall(output):
+                result["packages"].append({
+                    "name": name,
+                    "current": current,
+                    "candidate": candidate,
+                    "arch": arch,
+                    "suites": suites,
+                    "security": "security" in suites
+                })
+        except (OSError, subprocess.SubprocessError) as e:
+            result["error"] = str(e)
+        self._result = result
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path + ".tmp", "w") as f:
+                json.dump(result, f)
+            os.replace(self.cache_path + ".tmp", self.cache_path)
+        except OSError as e:
+            print(f"Could not write update cache: {e}")
+        return result
+
+    def refresh_async(self):
+        """refresh in the background unless the cache is current or a refresh is running"""
+        with self.lock:
+            if (self.thread is not None and self.thread.is_alive()) or self.fresh():
+                return
+            self.thread = threading.Thread(target=self.refresh, daemon=True)
+            self.thread.start()
+
+    @property
+    def checking(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+
+AUTH_LOG_FILES = ("/var/log/auth.log", "/var/log/secure")
+AUTH_FAILED = re.compile(r"Failed \S+ for (?:invalid user )?(\S*) from (\S+)")
+AUTH_ACCEPTED = re.compile(r"Accepted (\S+) for (\S+) from (\S+)")
+AUTH_SUDO = re.compile(r"sudo(?:\[\d+\])?:\s+(\S+) : (?:.*; )?USER=(\S+) ; COMMAND=(.*)$")
+AUTH_SUDO_FAILED = re.compile(r"sudo(?:\[\d+\])?:\s+(\S+) : (\d+) incorrect password attempts?")
+AUTH_COUNTERS = ("failed", "accepted", "sudo", "sudo_failed")
+
+
+def syslog_time(line: str, now: float) -> Optional[float]:
+    """timestamp of a syslog line, RFC 3339 or the traditional year-less 'Oct 19 11:47:41'"""
+    try:
+        if line[:4].isdigit():
+            return datetime.datetime.fromisoformat(line.split(" ", 1)[0].replace("Z", "+00:00")).timestamp()
+        year = datetime.datetime.fromtimestamp(now).year
+        ts = datetime.datetime.strptime(f"{year} {line[:15]}", "%Y %b %d %H:%M:%S").timestamp()
+        # december lines read in january
+        return ts if ts <= now + 86400 else ts - 365 * 86400
+    except ValueError:
+        return None
+
+
+class AuthLogAnalyzer:
+    """failed/accepted logins and sudo use, parsed incrementally from auth.log
+
+    a checkpoint (inode and byte offset, or a journal cursor where there is no
+    log file) is persisted with the counters, so every update parses only the
+    lines appended since the previous one; counts are kept per hour bucket
+    and per source ip / user, trimmed to the largest entries
+    """
+
+    def __init__(self, state_path: str, host_path=lambda path: path, journal: bool = True,
+                 bucket: int = 3600, buckets: int = 48, keep: int = 500, chunk: int = 1 << 20):
+        self.state_path = state_path
+        self.host_path = host_path
+        self.journal = journal
+        self.bucket = bucket
+        self.buckets = buckets
+        self.keep = keep
+        self.chunk = chunk
+        self.lock = threading.Lock()
+        self.state = None
+        self.parsed_bytes = 0
+
+    def empty_state(self) -> Dict:
+        return {"source": None, "inode": None, "offset": 0, "cursor": None, "lines": 0,
+                "buckets": {}, "failed_ip": {}, "failed_user": {}, "accepted": {}, "sudo": {}}
+
+    def load(self) -> Dict:
+        if self.state is None:
+            try:
+                with open(self.state_path, "r") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError):
+                self.state = self.empty_state()
+        return self.state
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            with open(self.state_path + ".tmp", "w") as f:
+                json.dump(self.state, f)
+            os.replace(self.state_path + ".tmp", self.state_path)
+        except OSError as e:
+            print(f"Could not write auth log checkpoint: {e}")
+
+    def source(self) -> Optional[str]:
+        for path in AUTH_LOG_FILES:
+            if os.path.exists(self.host_path(path)):
+                return path
+        return "journal" if self.journal else None
+
+    def update(self) -> Dict:
+        """parse whatever was appended since the checkpoint"""
+        with self.lock:
+            state = self.load()
+            source = self.source()
+            if source != state["source"]:
+                state.update(self.empty_state())
+                state["source"] = source
+            if source == "journal":
+                self._read_journal(state)
+            elif source is not None:
+                self._read_file(state, source)
+            self._trim(state)
+            self.save()
+            return state
+
+    def _read_file(self, state: Dict, path: str):
+        path = self.host_path(path)
+        st = os.stat(path)
+        if state["inode"] is not None and (state["inode"] != st.st_ino or st.st_size < state["offset"]):
+            # rotated: finish the old file if it was renamed to .1, then start over
+            rotated = path + ".1"
+            try:
+                if os.stat(rotated).st_ino == state["inode"]:
+                    self._read_from(state, rotated, state["offset"])
+            except OSError:
+                pass
+            state["offset"] = 0
+        state["inode"] = st.st_ino
+        state["offset"] = self._read_from(state, path, state["offset"])
+
+    def _read_from(self, state: Dict, path: str, offset: int) -> int:
+        now = time.time()
+        with open(path, "rb") as f:
+            f.seek(offset)
+            rest = b""
+            while True:
+                data = f.read(self.chunk)
+                if not data:
+                    break
+                data = rest + data
+                # a half-written last line is left for the next update
+                end = data.rfind(b"\n") + 1
+                rest = data[end:]
+                if end:
+                    for line in data[:end].decode(errors="replace").splitlines():
+                        self._parse(state, line, now)
+                    offset += end
+                    self.parsed_bytes += end
+        return offset
+
+    def _read_journal(self, state: Dict):
+        args = ["journalctl", "--no-pager", "-q", "-o", "short-iso", "--show-cursor",
+                "SYSLOG_FACILITY=4", "SYSLOG_FACILITY=10"]
+        if state["cursor"]:
+            args += ["--after-cursor", state["cursor"]]
+        else:
+            args += ["--since", f"-{self.bucket * self.buckets // 3600}h"]
+        try:
+            output = run_command(args, timeout=30, stderr=subprocess.DEVNULL).decode(errors="replace")
+        except FileNotFoundError as e:
+            # no journal here, don't retry on every refresh
+            print(f"Could not read the journal: {e}")
+            self.journal = False
+            return
+        except subprocess.CalledProcessError as e:
+            print(f"Could not read the journal: {e}")
+            if state["cursor"]:
+                # the cursor was vacuumed or rotated away, start over from the window
+                state["cursor"] = None
+                self._read_journal(state)
+            return
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Could not read the journal: {e}")
+            return
+        now = time.time()
+        self.parsed_bytes += len(output)
+        for line in output.splitlines():
+            if line.startswith("-- cursor: "):
+                state["cursor"] = line[len("-- cursor: "):]
+            else:
+                self._parse(state, line, now)
+
+    def _parse(self, state: Dict, line: str, now: float):
+        # cheap substring tests first, most lines are neither
+        if "Failed " in line:
+            match = AUTH_FAILED.search(line)
+            if match is None:
+                return
+            kind = "failed"
+            self._count(state["failed_ip"], match.group(2), line, now)
+            self._count(state["failed_user"], match.group(1) or "(empty)", line, now)
+        elif "Accepted " in line:
+            match = AUTH_ACCEPTED.search(line)
+            if match is None:
+                return
+            kind = "accepted"
+            self._count(state["accepted"], f"{match.group(2)}@{match.group(3)} ({match.group(1)})", line, now)
+        elif "sudo" in line:
+            match = AUTH_SUDO.search(line)
+            if AUTH_SUDO_FAILED.search(line):
+                kind = "sudo_failed"
+            elif match is not None:
+                kind = "sudo"
+                self._count(state["sudo"], f"{match.group(1)} -> {match.group(2)}", line, now)
+            else:
+                return
+        else:
+            return
+        state["lines"] += 1
+        ts = syslog_time(line, now) or now
+        bucket = state["buckets"].setdefault(str(int(ts // self.bucket * self.bucket)), [0] * len(AUTH_COUNTERS))
+        bucket[AUTH_COUNTERS.index(kind)] += 1
+
+    @staticmethod
+    def _count(counter: Dict, key: str, line: str, now: float):
+        entry = counter.setdefault(key, [0, 0])
+        entry[0] += 1
+        entry[1] = syslog_time(line, now) or now
+
+    def _trim(self, state: Dict):
+        oldest = (time.time() // self.bucket - self.buckets + 1) * self.bucket
+        for key in [key for key in state["buckets"] if int(key) < oldest]:
+            del state["buckets"][key]
+        for name in ("failed_ip", "failed_user", "accepted", "sudo"):
+            counter = state[name]
+            if len(counter) > self.keep:
+                state[name] = dict(heapq.nlargest(self.keep, counter.items(), key=lambda item: item[1]))
+
+    def summary(self, hours: int = 24, top: int = 5) -> Dict[str, Dict[str, str]]:
+        """InfoTable sections: totals over the last hours, the busiest sources and users"""
+        state = self.update()
+        with self.lock:
+            since = (time.time() // self.bucket - hours * 3600 // self.bucket + 1) * self.bucket
+            recent = [state["buckets"].get(str(int(since + i * self.bucket)), [0] * len(AUTH_COUNTERS))
+                      for i in range(hours * 3600 // self.bucket)]
+            totals = [sum(bucket[i] for bucket in recent) for i in range(len(AUTH_COUNTERS))]
+            source = state["source"] or "none"
+            checkpoint = (f"cursor {state['cursor'][:24]}..." if source == "journal" and state["cursor"]
+                          else f"offset {state['offset']}")
+            sections = {"Authentication": {
+                "Source": f"{source} ({checkpoint})",
+                f"Failed Logins ({hours}h)": str(totals[0]),
+                f"Successful Logins ({hours}h)": str(totals[1]),
+                f"Sudo Commands ({hours}h)": str(totals[2]),
+                f"Sudo Failures ({hours}h)": str(totals[3]),
+                "Failed Logins / Hour": sparkline([bucket[0] for bucket in recent])
+            }}
+            for title, name in (("Top Failed Sources", "failed_ip"), ("Top Failed Users", "failed_user"),
+                                ("Successful Logins", "accepted"), ("Sudo Use", "sudo")):
+                rows = heapq.nlargest(top, state[name].items(), key=lambda item: item[1][0])
+                sections[title] = {key: f"{count} (last {datetime.datetime.fromtimestamp(last).strftime('%m-%d %H:%M')})"
+                                   for key, (count, last) in rows} or {"": "None"}
+            return sections
+
+
+def sparkline(values: List[float]) -> str:
+    top = max(values, default=0)
+    return "".join("▁▂▃▄▅▆▇█"[min(7, int(value / top * 8)) if top else 0] for value in values)
+
+
+BLOCK_COLUMNS = ["name", "type", "parent", "size_bytes", "fstype", "dm_name", "dm_uuid", "removable", "ro",
+                 "slaves", "holders", "encrypted"]
+MOUNT_COLUMNS = ["mountpoint", "device", "block", "fstype", "encrypted", "chain"]
+USB_COLUMNS = ["bus_id", "vendor", "product", "name", "authorized"]
+PCI_COLUMNS = ["slot", "vendor", "device", "class"]
+
+
+class DeviceInventory:
+    """block, usb and pci devices straight from sysfs
+
+    the device part is cached until a device is added or removed (or a usb
+    bus changes its authorization default); mounts are joined per call
+    """
+
+    def __init__(self, host_path=lambda path: path):
+        self.host_path = host_path
+        self.lock = threading.Lock()
+        self.key = None
+        self.devices = None
+        self.builds = 0
+
+    def _read(self, path: str, default: str = "") -> str:
+        try:
+            with open(path, 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return default
+
+    def _list(self, path: str) -> List[str]:
+        try:
+            return sorted(os.listdir(path))
+        except OSError:
+            return []
+
+    def signature(self) -> tuple:
+        usb = self.host_path("/sys/bus/usb/devices")
+        usb_devices = self._list(usb)
+        return (tuple(self._list(self.host_path("/sys/class/block"))),
+                tuple(usb_devices),
+                tuple(self._list(self.host_path("/sys/bus/pci/devices"))),
+                tuple(self._read(os.path.join(usb, bus, "authorized_default"))
+                      for bus in usb_devices if bus.startswith("usb")))
+
+    def _udev_fstype(self, dev: str) -> str:
+        # lsblk -f reads the same udev database, no root needed
+        for line in self._read(self.host_path(f"/run/udev/data/b{dev}")).splitlines():
+            if line.startswith("E:ID_FS_TYPE="):
+                return line.split("=", 1)[1]
+        return ""
+
+    def _block(self) -> List[List]:
+        base = self.host_path("/sys/class/block")
+        rows = []
+        for name in self._list(base):
+            path = os.path.join(base, name)
+            dm_uuid = self._read(os.path.join(path, "dm", "uuid"))
+            if os.path.isdir(os.path.join(path, "dm")):
+                kind = "dm"
+            elif os.path.exists(os.path.join(path, "partition")):
+                kind = "part"
+            elif name.startswith("loop"):
+                kind = "loop"
+            else:
+                kind = "disk"
+            # partitions live under their disk: .../block/sda/sda1
+            parent = os.path.basename(os.path.dirname(os.path.realpath(path))) if kind == "part" else ""
+            removable = self._read(os.path.join(base, parent or name, "removable"), "0") == "1"
+            rows.append([name, kind, parent, int(self._read(os.path.join(path, "size"), "0") or 0) * 512,
+                         self._udev_fstype(self._read(os.path.join(path, "dev"))),
+                         self._read(os.path.join(path, "dm", "name")), dm_uuid, removable,
+                         self._read(os.path.join(path, "ro"), "0") == "1",
+                         self._list(os.path.join(path, "slaves")), self._list(os.path.join(path, "holders")),
+                         False])
+        
+        # a device is encrypted when it or anything under it is a dm-crypt mapping
+        by_name = {row[0]: row for row in rows}
+        memo = {}
+        
+        def encrypted(name, seen=()):
+            if name not in memo:
+                row = by_name.get(name)
+                if row is None or name in seen:
+                    return False
+                memo[name] = row[6].startswith("CRYPT-") or any(encrypted(slave, seen + (name,)) for slave in row[9])
+            return memo[name]
+        
+        for row in rows:
+            row[11] = encrypted(row[0])
+        return rows
+
+    def _usb(self) -> tuple:
+        base = self.host_path("/sys/bus/usb/devices")
+        rows, buses = [], {}
+        for name in self._list(base):
+            if ":" in name:
+                # interfaces, not devices
+                continue
+            path = os.path.join(base, name)
+            if name.startswith("usb"):
+                buses[name] = self._read(os.path.join(path, "authorized_default"))
+            rows.append([name, self._read(os.path.join(path, "idVendor")), self._read(os.path.join(path, "idProduct")),
+                         " ".join(filter(None, (self._read(os.path.join(path, "manufacturer")),
+                                                self._read(os.path.join(path, "product"))))),
+                         self._read(os.path.join(path, "authorized"), "1") == "1"])
+        return rows, buses
+
+    def _pci(self) -> List[List]:
+        base = self.host_path("/sys/bus/pci/devices")
+        return [[slot] + [self._read(os.path.join(base, slot, field)) for field in ("vendor", "device", "class")]
+                for slot in self._list(base)]
+
+    def mounts(self, block: List[List]) -> List[List]:
+        """mounts backed by block devices, with the device chain underneath"""
+        by_name = {row[0]: row for row in block}
+        by_dm_name = {row[5]: row for row in block if row[5]}
+        rows = []
+        for line in self._read(self.host_path("/proc/self/mounts")).splitlines():
+            fields = line.split()
+            if len(fields) < 3 or not fields[0].startswith("/dev/"):
+                continue
+            device, mountpoint, fstype = fields[:3]
+            name = device[len("/dev/"):]
+            row = by_dm_name.get(name[len("mapper/"):]) if name.startswith("mapper/") else by_name.get(name)
+            if row is None and self.host_path("/") == "/":
+                # /dev/disk/by-uuid/... and friends
+                row = by_name.get(os.path.basename(os.path.realpath(device)))
+            chain = []
+            current = row
+            while current is not None and len(chain) < 16:
+                chain.append(current[5] or current[0])
+                current = by_name.get(current[9][0]) if current[9] else (
+                    by_name.get(current[2]) if current[2] else None)
+            rows.append([mountpoint, device, row[0] if row else "", fstype, bool(row and row[11]),
+                         " <- ".join(chain)])
+        return rows
+
+    def load(self) -> Dict:
+        with self.lock:
+            key = self.signature()
+            if key != self.key:
+                usb, buses = self._usb()
+                self.devices = {
+                    "block": {"columns": BLOCK_COLUMNS, "rows": self._block()},
+                    "usb": {"columns": USB_COLUMNS, "rows": usb},
+                    "usb_authorized_default": buses,
+                    "pci": {"columns": PCI_COLUMNS, "rows": self._pci()}
+                }
+                self.key = key
+                self.builds += 1
+            block = self.devices["block"]["rows"]
+            return {**self.devices, "mounts": {"columns": MOUNT_COLUMNS, "rows": self.mounts(block)}}
+
+
+# inotify(7) flags; IN_MODIFY only for the log files, where an append is the event
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_MASK_ADD = 0x20000000
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+INOTIFY_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT = struct.Struct("iIII")
+
+# rtnetlink multicast groups and the topic each message type bumps
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_IFADDR = 0x100
+RTMGRP_IPV6_ROUTE = 0x400
+NLMSG_HEADER = struct.Struct("=IHHII")
+RTM_TOPICS = {16: "link", 17: "link", 20: "addr", 21: "addr", 24: "route", 25: "route"}
+NETLINK_TOPICS = ("link", "addr", "route")
+
+LOG_FILES = {
+    "System Log": "/var/log/syslog",
+    "Authentication Log": "/var/log/auth.log",
+    "Kernel Log": "/var/log/kern.log",
+    "Boot Log": "/var/log/boot.log",
+    "Application Log": "/var/log/applications.log"
+}
+
+# probes served from cache until one of their topics fires; a topic is
+# either a file (watched through inotify) or a netlink group
+EVENT_PROBES = {
+    "get_dns_servers": ["/etc/resolv.conf"],
+    "check_dns": ["/etc/resolv.conf"],
+    "check_dns_over_tls": ["/etc/systemd/resolved.conf"],
+    "get_domain_name": ["/etc/resolv.conf", "/etc/hosts", "/etc/hostname", "addr"],
+    "get_default_gateway": ["route"],
+    "get_ip_address": ["addr", "route"],
+    "get_mac_address": ["link"],
+    "get_interface_status": ["link"],
+    "get_active_interface": ["link"],
+    "get_interface_speed": ["link"],
+    "get_mtu_size": ["link"],
+    "check_vpn": ["link"],
+    "get_vpn_status": ["link"],
+    "get_log_status": list(LOG_FILES.values())
+}
+# topics invalidated by appends too; a busy log bumps them at most once per debounce
+APPEND_TOPICS = set(LOG_FILES.values())
+APPEND_DEBOUNCE = 1.0
+
+
+class EventWatcher:
+    """inotify and rtnetlink events invalidating cached probes"""
+
+    def __init__(self, host_path, netlink: bool = True):
+        self.host_path = host_path
+        self.lock = threading.Lock()
+        self.generations = Counter()
+        self.events = Counter()
+        self.available = set()
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+        self.watches = {}
+        self.appends = set()
+        self.appended = set()
+        self.appended_at = 0.0
+        self.running = False
+        self.thread = None
+        self.libc = None
+        self.inotify = None
+        self.netlink = None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+            self.libc, self.inotify = libc, fd
+        except Exception as e:
+            print(f"inotify unavailable: {e}")
+        if netlink:
+            try:
+                sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+                sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE |
+                           RTMGRP_IPV6_IFADDR | RTMGRP_IPV6_ROUTE))
+                sock.setblocking(False)
+                self.netlink = sock
+                self.available.update(NETLINK_TOPICS)
+            except Exception as e:
+                print(f"rtnetlink unavailable: {e}")
+
+    def watch(self, topic: str) -> bool:
+        """watch a file through its directory so atomic replaces are seen too"""
+        if topic in self.available:
+            return True
+        if self.inotify is None or not topic.startswith("/"):
+            return False
+        path = self.host_path(topic)
+        targets = {path}
+        if os.path.islink(path):
+            # e.g. resolv.conf -> /run/systemd/resolve/stub-resolv.conf
+            targets.add(os.path.realpath(path))
+        mask = INOTIFY_MASK
+        if topic in APPEND_TOPICS:
+            # added to whatever the directory is already watched for
+            mask |= IN_MODIFY | IN_MASK_ADD
+        with self.lock:
+            for target in targets:
+                directory, name = os.path.split(target)
+                wd = self.libc.inotify_add_watch(self.inotify, os.fsencode(directory), mask)
+                if wd < 0:
+                    return False
+                self.watches.setdefault(wd, {}).setdefault(name, set()).add(topic)
+                if topic in APPEND_TOPICS:
+                    self.appends.add((wd, name))
+            self.available.add(topic)
+        return True
+
+    def start(self):
+        if self.thread is not None or (self.inotify is None and self.netlink is None):
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="event-watcher", daemon=True)
+        self.thread.start()
+
+    def bump(self, topics):
+        with self.lock:
+            for topic in topics:
+                self.generations[topic] += 1
+                self.events[topic] += 1
+
+    def _read_inotify(self):
+        try:
+            data = os.read(self.inotify, 65536)
+        except BlockingIOError:
+            return
+        topics = set()
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            name = data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length].rstrip(b"\0")
+            offset += INOTIFY_EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                topics.update(t for names in self.watches.values() for ts in names.values() for t in ts)
+                continue
+            name = os.fsdecode(name)
+            if mask & IN_MODIFY and not mask & INOTIFY_MASK:
+                # a plain write: only log appends count, and they are coalesced
+                if (wd, name) in self.appends:
+                    if not self.appended:
+                        self.appended_at = time.monotonic()
+                    self.appended.update(t for t in self.watches[wd][name] if t in APPEND_TOPICS)
+                continue
+            topics.update(self.watches.get(wd, {}).get(name, ()))
+        if topics:
+            self.bump(topics)
+
+    def _flush_appends(self) -> Optional[float]:
+        """bump the appended logs once the debounce is over, else seconds left"""
+        if not self.appended:
+            return None
+        left = self.appended_at + APPEND_DEBOUNCE - time.monotonic()
+        if left > 0:
+            return left
+        self.bump(self.appended)
+        self.appended = set()
+        return None
+
+    def _read_netlink(self):
+        try:
+            data = self.netlink.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            # ENOBUFS: the kernel dropped messages, assume everything changed
+            self.bump(NETLINK_TOPICS)
+            return
+        topics = set()
+        offset = 0
+        while offset + NLMSG_HEADER.size <= len(data):
+            length, kind = NLMSG_HEADER.unpack_from(data, offset)[:2]
+            if length < NLMSG_HEADER.size:
+                break
+            if kind in RTM_TOPICS:
+                topics.add(RTM_TOPICS[kind])
+            offset += (length + 3) & ~3
+        if topics:
+            self.bump(topics)
+
+    def _run(self):
+        sources = [s for s in (self.inotify, self.netlink) if s is not None]
+        while self.running:
+            try:
+                ready, _, _ = select.select(sources, [], [], self._flush_appends())
+            except InterruptedError:
+                continue
+            except Exception as e:
+                print(f"Event watcher stopped: {e}")
+                break
+            for source in ready:
+                if source is self.netlink:
+                    self._read_netlink()
+                else:
+                    self._read_inotify()
+            self._flush_appends()
+        self.running = False
+
+    def cached(self, name: str, topics: List[str], fn):
+        """serve fn from cache until an event arrives on one of its topics"""
+        watched = all([self.watch(topic) for topic in topics])
+
+        def wrapper(*args, **kwargs):
+            if args or kwargs or not watched or not self.running:
+                return fn(*args, **kwargs)
+            with self.lock:
+                key = tuple(self.generations[topic] for topic in topics)
+                entry = self.cache.get(name)
+                if entry is not None and entry[0] == key:
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+            # an event during the call changes the key, so the next call re-runs
+            result = fn()
+            with self.lock:
+                self.cache[name] = (key, result)
+            return result
+        wrapper.__wrapped__ = fn
+        wrapper.__name__ = getattr(fn, "__name__", name)
+        return wrapper
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {"running": self.running, "hits": self.hits, "misses": self.misses,
+                    "topics": sorted(self.available), "events": dict(self.events)}
+
+
+DEFAULT_MEMORY_CONFIG = {
+    # smaps_rollup scan: reader threads, share of one CPU it may use, seconds between scans
+    "workers": 4,
+    "cpu_budget": 0.25,
+    "min_interval": 10.0
+}
+
+MEMORY_COLUMNS = ["pid", "name", "pss", "uss", "swap", "rss", "pss_anon", "pss_file", "pss_shmem"]
+SMAPS_FIELDS = ("Rss", "Pss", "Pss_Anon", "Pss_File", "Pss_Shmem", "Private_Clean", "Private_Dirty",
+                "Private_Hugetlb", "Swap", "SwapPss")
+
+
+def parse_kb_fields(text: str) -> Dict[str, int]:
+    """'Key:   123 kB' lines (meminfo, smaps_rollup) as bytes; unitless values kept as is"""
+    values = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(":")
+        fields = rest.split()
+        if fields and fields[0].isdigit():
+            values[key] = int(fields[0]) * (1024 if len(fields) > 1 and fields[1] == "kB" else 1)
+    return values
+
+
+def read_smaps_rollup(proc: str, pids: List[int]) -> tuple:
+    """memory rows of some pids and the thread cpu seconds spent reading them"""
+    started = time.thread_time()
+    rows, denied = [], 0
+    for pid in pids:
+        try:
+            with open(f"{proc}/{pid}/smaps_rollup") as f:
+                fields = parse_kb_fields(f.read())
+            with open(f"{proc}/{pid}/comm") as f:
+                name = f.read().strip()
+        except PermissionError:
+            denied += 1
+            continue
+        except OSError:
+            # gone, or a kernel thread without an mm
+            continue
+        if "Pss" not in fields:
+            continue
+        uss = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0) + fields.get("Private_Hugetlb", 0)
+        rows.append([pid, name, fields["Pss"], uss, fields.get("Swap", 0), fields.get("Rss", 0),
+                     fields.get("Pss_Anon"), fields.get("Pss_File"), fields.get("Pss_Shmem")])
+    return rows, denied, time.thread_time() - started
+
+
+class MemoryScanner:
+    """per-process PSS/USS/swap from smaps_rollup, paced to a CPU budget
+
+    the kernel walks every page table of a process to produce
+    smaps_rollup, so thousands of processes cost real CPU; batches go to a
+    small pool and the scan sleeps between them whenever the cpu it used
+    exceeds cpu_budget of the wall time so far. scans run on the scanner's
+    own thread so the pacing never holds a worker of the panel's pool
+    """
+
+    def __init__(self, host_path, workers: int = 4, cpu_budget: float = 0.25,
+                 min_interval: float = 10.0, batch: int = 32):
+        self.proc = host_path("/proc")
+        self.workers = max(1, workers)
+        self.cpu_budget = max(0.01, cpu_budget)
+        self.min_interval = min_interval
+        self.batch = batch
+        self.lock = threading.Lock()
+        self.table = None
+        self.error = None
+        self.scanned_at = 0.0
+        self.thread = None
+        self.scanned = threading.Event()
+
+    def pids(self) -> List[int]:
+        return [int(name) for name in os.listdir(self.proc) if name.isdigit()]
+
+    def scan(self) -> Dict:
+        started, cpu = time.monotonic(), 0.0
+        pids = self.pids()
+        rows, denied, throttled = [], 0, 0.0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for first in range(0, len(pids), self.batch * self.workers):
+                chunk = pids[first:first + self.batch * self.workers]
+                futures = [pool.submit(read_smaps_rollup, self.proc, chunk[i:i + self.batch])
+                           for i in range(0, len(chunk), self.batch)]
+                for future in futures:
+                    batch_rows, batch_denied, batch_cpu = future.result()
+                    rows.extend(batch_rows)
+                    denied += batch_denied
+                    cpu += batch_cpu
+                # stretch the scan so cpu / wall stays within the budget
+                pause = cpu / self.cpu_budget - (time.monotonic() - started)
+                if pause > 0:
+                    time.sleep(pause)
+                    throttled += pause
+        rows.sort(key=itemgetter(2), reverse=True)
+        return {"columns": MEMORY_COLUMNS, "rows": rows, "scanned": len(pids), "denied": denied,
+                "cpu_s": round(cpu, 3), "wall_s": round(time.monotonic() - started, 3),
+                "throttled_s": round(throttled, 3)}
+
+    def _run(self):
+        try:
+            table, error = self.scan(), None
+        except OSError as e:
+            table, error = None, e
+        with self.lock:
+            if table is not None:
+                self.table, self.scanned_at = table, time.monotonic()
+            self.error = error
+            self.thread = None
+        self.scanned.set()
+
+    def load(self, wait: bool = True) -> Optional[Dict]:
+        """the last scan, rescanned in the background at most every min_interval seconds
+
+        only the very first scan is waited for, and not even that with
+        wait=False, which returns None until it is done
+        """
+        with self.lock:
+            if self.thread is None and (self.table is None or
+                                        time.monotonic() - self.scanned_at >= self.min_interval):
+                self.scanned.clear()
+                self.thread = threading.Thread(target=self._run, name="memory-scan", daemon=True)
+                self.thread.start()
+            if self.table is not None or not wait:
+                return self.table
+        self.scanned.wait()
+        with self.lock:
+            if self.table is None:
+                raise self.error or OSError("Memory scan failed")
+            return self.table
+
+
+GPU_SOURCES = ("nvml", "nvidia-smi", "sysfs")
+GPU_QUERY = "index,name,utilization.gpu,memory.total,memory.used,clocks.gr,temperature.gpu"
+GPU_VENDORS = {"0x10de": "NVIDIA", "0x1002": "AMD", "0x8086": "Intel"}
+
+
+class NvmlUtilization(ctypes.Structure):
+    _fields_ = [("gpu", ctypes.c_uint), ("memory", ctypes.c_uint)]
+
+
+class NvmlMemory(ctypes.Structure):
+    _fields_ = [("total", ctypes.c_ulonglong), ("free", ctypes.c_ulonglong), ("used", ctypes.c_ulonglong)]
+
+
+class GpuTelemetry:
+    """GPU load, memory, clock and temperature from one persistent source
+
+    NVML through ctypes when libnvidia-ml is loadable, else a single
+    `nvidia-smi -lms` child whose lines are read as they arrive, else the
+    amdgpu/i915 sysfs counters; samples are kept for graphs
+    """
+
+    def __init__(self, host_path, interval: float = 1.0, sources=GPU_SOURCES, capacity: int = 3600):
+        self.host_path = host_path
+        self.interval = interval
+        self.sources = sources
+        self.history = MetricHistory(capacity)
+        self.lock = threading.Lock()
+        self.gpus: Dict[str, Dict] = {}
+        self.source = None
+        self.started = False
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+        self.process = None
+        self.nvml = None
+        self.samples = 0
+
+    def start(self):
+        with self.lock:
+            if self.started:
+                return
+            self.started = True
+        self._next_source(0)
+
+    def _next_source(self, first: int):
+        starters = {"nvml": self._start_nvml, "nvidia-smi": self._start_smi, "sysfs": self._start_sysfs}
+        for i in range(first, len(self.sources)):
+            try:
+                if starters[self.sources[i]]():
+                    self.source = self.sources[i]
+                    return
+            except Exception as e:
+                print(f"GPU source {self.sources[i]} unavailable: {e}")
+        self.source = None
+        self.ready.set()
+
+    def stop(self):
+        self.stopped.set()
+        if self.process is not None:
+            try:
+                # wrappers (and the benchmark stub) may have children of their own
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        if self.nvml is not None:
+            try:
+                self.nvml.nvmlShutdown()
+            except Exception:
+                pass
+            self.nvml = None
+
+    def read(self, wait: float = 2.0) -> Dict[str, Dict]:
+        """latest sample per GPU, starting the source on first use"""
+        self.start()
+        self.ready.wait(wait)
+        with self.lock:
+            return {gpu_id: dict(gpu) for gpu_id, gpu in self.gpus.items()}
+
+    def _update(self, gpu_id: str, record: Dict):
+        ts = time.time()
+        with self.lock:
+            self.gpus[gpu_id] = record
+            self.samples += 1
+        for key in ("util_percent", "mem_used_bytes", "freq_mhz", "temp_c"):
+            if record.get(key) is not None:
+                self.history.append(f"gpu.{gpu_id}.{key}", ts, float(record[key]))
+
+    def _sampler(self, sample):
+        def loop():
+            while not self.stopped.is_set():
+                try:
+                    sample()
+                except Exception as e:
+                    print(f"Error sampling GPU: {e}")
+                self.ready.set()
+                self.stopped.wait(self.interval)
+        threading.Thread(target=loop, name="gpu-telemetry", daemon=True).start()
+
+    def _start_nvml(self) -> bool:
+        if self.host_path("/") != "/":
+            return False
+        try:
+            nvml = ctypes.CDLL("libnvidia-ml.so.1")
+        except OSError:
+            return False
+        if nvml.nvmlInit_v2() != 0:
+            return False
+        count = ctypes.c_uint()
+        if nvml.nvmlDeviceGetCount_v2(ctypes.byref(count)) != 0 or not count.value:
+            nvml.nvmlShutdown()
+            return False
+        devices = []
+        for index in range(count.value):
+            handle = ctypes.c_void_p()
+            name = ctypes.create_string_buffer(96)
+            if nvml.nvmlDeviceGetHandleByIndex_v2(index, ctypes.byref(handle)) == 0:
+                nvml.nvmlDeviceGetName(handle, name, 96)
+                devices.append((str(index), handle, name.value.decode(errors="replace")))
+        self.nvml = nvml
+        
+        def sample():
+            for gpu_id, handle, name in devices:
+                util, memory = NvmlUtilization(), NvmlMemory()
+                clock, temp = ctypes.c_uint(), ctypes.c_uint()
+                record = {"name": name, "driver": "nvidia"}
+                if nvml.nvmlDeviceGetUtilizationRates(handle, ctypes.byref(util)) == 0:
+                    record["util_percent"] = util.gpu
+                if nvml.nvmlDeviceGetMemoryInfo(handle, ctypes.byref(memory)) == 0:
+                    record.update(mem_total_bytes=memory.total, mem_used_bytes=memory.used)
+                # NVML_CLOCK_GRAPHICS, NVML_TEMPERATURE_GPU
+                if nvml.nvmlDeviceGetClockInfo(handle, 0, ctypes.byref(clock)) == 0:
+                    record["freq_mhz"] = clock.value
+                if nvml.nvmlDeviceGetTemperature(handle, 0, ctypes.byref(temp)) == 0:
+                    record["temp_c"] = temp.value
+                self._update(gpu_id, record)
+        
+        self._sampler(sample)
+        return True
+
+    def _start_smi(self) -> bool:
+        try:
+            # deliberately not run_command: this child outlives any tab
+            self.process = subprocess.Popen(
+                ["nvidia-smi", f"--query-gpu={GPU_QUERY}", "--format=csv,noheader,nounits",
+                 "-lms", str(int(self.interval * 1000))],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1,
+                start_new_session=True)
+        except OSError:
+            return False
+        
+        def number(value: str):
+            try:
+                return float(value)
+            except ValueError:
+                # "[N/A]", "[Not Supported]"
+                return None
+        
+        def reader():
+            process = self.process
+            for line in process.stdout:
+                fields = [field.strip() for field in line.split(",")]
+                if len(fields) != 7:
+                    continue
+                total, used = number(fields[3]), number(fields[4])
+                self._update(fields[0], {
+                    "name": fields[1], "driver": "nvidia", "util_percent": number(fields[2]),
+                    "mem_total_bytes": total * 1048576 if total is not None else None,
+                    "mem_used_bytes": used * 1048576 if used is not None else None,
+                    "freq_mhz": number(fields[5]), "temp_c": number(fields[6])
+                })
+                self.ready.set()
+            process.wait()
+            if self.stopped.is_set():
+                return
+            if not self.samples:
+                # no driver or no GPU behind the command, try what is left
+                self._next_source(self.sources.index("nvidia-smi") + 1)
+            else:
+                print(f"nvidia-smi exited with {process.returncode}, GPU telemetry stopped")
+                self.ready.set()
+        
+        threading.Thread(target=reader, name="gpu-telemetry", daemon=True).start()
+        return True
+
+    def _sysfs_cards(self) -> List[tuple]:
+        drm = self.host_path("/sys/class/drm")
+        cards = []
+        for name in sorted(os.listdir(drm)) if os.path.isdir(drm) else []:
+            if not re.fullmatch(r"card\d+", name):
+                continue
+            card = os.path.join(drm, name)
+            try:
+                with open(os.path.join(card, "device/vendor")) as f:
+                    vendor = f.read().strip()
+            except OSError:
+                continue
+            driver = os.path.basename(os.path.realpath(os.path.join(card, "device/driver")))
+            if driver == "driver":
+                driver = {"0x1002": "amdgpu", "0x8086": "i915"}.get(vendor, "unknown")
+            cards.append((name[len("card"):], card, f"{GPU_VENDORS.get(vendor, vendor)} ({driver})"))
+        return cards
+
+    def _start_sysfs(self) -> bool:
+        cards = self._sysfs_cards()
+        if not cards:
+            return False
+        
+        def value(path: str):
+            try:
+                with open(path) as f:
+                    return int(f.read().split()[0])
+            except (OSError, ValueError, IndexError):
+                return None
+        
+        def sample():
+            for gpu_id, card, name in cards:
+                device = os.path.join(card, "device")
+                record = {"name": name, "driver": name.split("(")[-1].rstrip(")"),
+                          "util_percent": value(os.path.join(device, "gpu_busy_percent")),
+                          "mem_total_bytes": value(os.path.join(device, "mem_info_vram_total")),
+                          "mem_used_bytes": value(os.path.join(device, "mem_info_vram_used"))}
+                # i915 exposes the current frequency directly
+                freq = value(os.path.join(card, "gt_cur_freq_mhz"))
+                if freq is None:
+                    try:
+                        with open(os.path.join(device, "pp_dpm_sclk")) as f:
+                            current = [line for line in f if line.rstrip().endswith("*")]
+                        freq = int(re.search(r"(\d+)\s*mhz", current[0], re.I).group(1)) if current else None
+                    except (OSError, AttributeError):
+                        pass
+                record["freq_mhz"] = freq
+                hwmon = os.path.join(device, "hwmon")
+                for entry in sorted(os.listdir(hwmon)) if os.path.isdir(hwmon) else []:
+                    temp = value(os.path.join(hwmon, entry, "temp1_input"))
+                    if temp is not None:
+                        record["temp_c"] = temp / 1000
+                        break
+                self._update(gpu_id, record)
+        
+        self._sampler(sample)
+        return True
+
+
+PROCESS_INDEX_COLUMNS = ["pid", "user", "name", "cgroup", "cmdline"]
+
+
+class ProcessIndex:
+    """search index over name, cmdline, user and cgroup of every process
+
+    entries are added and dropped as pids appear and exit, and a slice of the
+    known pids is re-read on every update to catch exec() and pid reuse;
+    searches run over one lowercased blob with a line per process, so a
+    substring query is a few str.find calls rather than a loop over rows
+    """
+
+    def __init__(self, host_path, reread: int = 16):
+        self.proc = host_path("/proc")
+        self.reread = reread
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.users = {}
+        self.cursor = 0
+        self.blob = ""
+        self.starts = []
+        self.pids = []
+        self.dirty = True
+        self.updates = 0
+
+    def _user(self, uid: int) -> str:
+        user = self.users.get(uid)
+        if user is None:
+            try:
+                user = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                user = str(uid)
+            self.users[uid] = user
+        return user
+
+    def _read(self, pid: int) -> Optional[tuple]:
+        base = os.path.join(self.proc, str(pid))
+        try:
+            with open(os.path.join(base, "comm"), "r") as f:
+                name = f.read().strip()
+            with open(os.path.join(base, "cmdline"), "rb") as f:
+                cmdline = f.read().rstrip(b"\0").replace(b"\0", b" ").decode(errors="replace")
+            uid = os.stat(base).st_uid
+        except OSError:
+            return None
+        try:
+            with open(os.path.join(base, "cgroup"), "r") as f:
+                # the unified hierarchy's line, or the first v1 controller's
+                paths = [line.rstrip("\n").split(":", 2)[2] for line in f if line.count(":") >= 2]
+            cgroup = next((path for path in paths if path != "/"), paths[0] if paths else "")
+        except OSError:
+            cgroup = ""
+        user = self._user(uid)
+        return (pid, user, name, cgroup, cmdline or f"[{name}]")
+
+    def update(self) -> Dict:
+        """pick up new and exited pids and the re-read slice; returns what changed"""
+        pids = {int(entry) for entry in os.listdir(self.proc) if entry.isdigit()}
+        with self.lock:
+            known = set(self.entries)
+        added = pids - known
+        removed = known - pids
+        # re-read a rotating slice of the rest: exec() changes cmdline, pids get reused
+        rest = sorted(known & pids)
+        if rest:
+            step = max(1, len(rest) // self.reread)
+            start = self.cursor % len(rest)
+            stale = rest[start:start + step]
+            self.cursor = start + step
+        else:
+            stale = []
+        fresh = {}
+        for pid in list(added) + stale:
+            entry = self._read(pid)
+            if entry is not None:
+                fresh[pid] = entry
+        with self.lock:
+            changed = bool(removed)
+            for pid in removed:
+                del self.entries[pid]
+            for pid, entry in fresh.items():
+                if self.entries.get(pid) != entry:
+                    self.entries[pid] = entry
+                    changed = True
+            for pid in stale:
+                if pid not in fresh and self.entries.pop(pid, None) is not None:
+                    changed = True
+            self.dirty = self.dirty or changed
+            self.updates += 1
+            return {"processes": len(self.entries), "added": len(added), "removed": len(removed),
+                    "changed": changed}
+
+    def _build(self):
+        # only after the process set changed, never per keystroke
+        pids = sorted(self.entries)
+        starts = []
+        offset = 1
+        lines = []
+        for pid in pids:
+            line = "\0".join(self.entries[pid][1:]).lower().replace("\n", " ")
+            starts.append(offset)
+            offset += len(line) + 1
+            lines.append(line)
+        # every line sits between two newlines
+        self.blob = "\n" + "\n".join(lines) + "\n"
+        self.starts = starts
+        self.pids = pids
+        self.dirty = False
+
+    @staticmethod
+    def _fuzzy(word: str) -> str:
+        # the characters in order, each gap stopping at the first occurrence of
+        # the next one, so a failed match only backs off gaps that cannot match
+        return "".join(f"[^\\n{re.escape(char)}]*{re.escape(char)}" for char in word)
+
+    def search(self, query: str, limit: int = 1000) -> List[List]:
+        """rows whose fields contain every word of the query; fuzzy matches after the exact ones"""
+        with self.lock:
+            if self.dirty:
+                self._build()
+            blob, starts, pids, entries = self.blob, self.starts, self.pids, self.entries
+            words = query.lower().split()
+            if not words:
+                return [list(entries[pid]) for pid in pids[:limit]]
+            
+            # substring: every hit of the rarest word, then the other words on that line
+            words.sort(key=blob.count)
+            lines = []
+            seen = set()
+            position = blob.find(words[0])
+            while position != -1 and len(lines) < limit:
+                line = bisect.bisect_right(starts, position) - 1
+                end = blob.find("\n", position)
+                if all(blob.find(word, starts[line], end) != -1 for word in words[1:]):
+                    lines.append(line)
+                    seen.add(line)
+                position = blob.find(words[0], end)
+            
+            # fuzzy: the characters of each word in order, anywhere on the line
+            if len(lines) < limit and all(char in blob for word in words for char in word):
+                # a line start followed by one lookahead per word, all in the regex engine
+                pattern = re.compile("\n" + "".join(f"(?={self._fuzzy(word)})" for word in words))
+                for match in pattern.finditer(blob):
+                    line = bisect.bisect_right(starts, match.start() + 1) - 1
+                    if line not in seen:
+                        lines.append(line)
+                        if len(lines) >= limit:
+                            break
+            return [list(entries[pids[line]]) for line in lines]
+
+
+TCP_STATES = {b"01": "ESTABLISHED", b"02": "SYN_SENT", b"03": "SYN_RECV", b"04": "FIN_WAIT1",
+              b"05": "FIN_WAIT2", b"06": "TIME_WAIT", b"07": "CLOSE", b"08": "CLOSE_WAIT",
+              b"09": "LAST_ACK", b"0A": "LISTEN", b"0B": "CLOSING", b"0C": "NEW_SYN_RECV"}
+CONNECTION_GROUPS = {"remote": "Remote Host", "port": "Port", "state": "State", "process": "Process"}
+CONNECTION_COLUMNS = ["proto", "local", "remote", "state", "pid", "process"]
+
+DEFAULT_CONNECTIONS_CONFIG = {
+    # cpu one refresh may spend, share of one cpu over time, seconds between /proc/*/fd walks
+    "budget_ms": 150,
+    "cpu_share": 0.25,
+    "owner_interval": 10.0
+}
+
+
+def decode_address(address: bytes) -> str:
+    """/proc/net/tcp hex address: 32-bit words in host (little endian) order"""
+    raw = bytes.fromhex(address.decode())
+    raw = b"".join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    return socket.inet_ntop(socket.AF_INET if len(raw) == 4 else socket.AF_INET6, raw)
+
+
+class TcpTable:
+    """one /proc/net/tcp{,6} read, columns sliced out on demand
+
+    lines are fixed width from the address to the state, so a column is a
+    map() of one slice over every line instead of splitting 100k lines;
+    only the slot number in front varies, which splits the lines into
+    segments with their own offset
+    """
+
+    def __init__(self, data: bytes):
+        lines = data.split(b"\n")[1:]
+        if lines and not lines[-1]:
+            lines.pop()
+        self.lines = lines
+        self.segments = []
+        self.starts = []
+        self.width = 8
+        if not lines:
+            return
+        first = lines[0].index(b":")
+        self.width = lines[0].index(b":", first + 1) - first - 2
+        start = 0
+        while start < len(lines):
+            # the slot is printed %4d, fields move right once it passes 9999, 99999, ...
+            digits = max(4, len(str(start)))
+            end = min(len(lines), 10 ** digits)
+            offset = digits + 2
+            if any(lines[k][offset - 2:offset] != b": " for k in (start, end - 1)):
+                # numbered some other way, cut the slot off every remaining line
+                lines[start:] = [line.split(b": ", 1)[1] for line in lines[start:]]
+                self.segments.append((start, len(lines), 0))
+                break
+            self.segments.append((start, end, offset))
+            start = end
+        self.starts = [segment[0] for segment in self.segments]
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def _span(self, name: str):
+        w = self.width
+        return {"key": (0, 2 * w + 11), "local": (0, w), "lport": (w + 1, w + 5),
+                "remote": (w + 6, 2 * w + 6), "rport": (2 * w + 7, 2 * w + 11),
+                "state": (2 * w + 12, 2 * w + 14)}[name]
+
+    def column(self, name: str) -> List[bytes]:
+        if name == "inode":
+            return [line.split(None, 10)[9 if offset else 8]
+                    for start, end, offset in self.segments for line in self.lines[start:end]]
+        first, last = self._span(name)
+        result = []
+        for start, end, offset in self.segments:
+            result += map(itemgetter(slice(offset + first, offset + last)), self.lines[start:end])
+        return result
+
+    def field(self, index: int, name: str) -> bytes:
+        offset = self.segments[bisect.bisect_right(self.starts, index) - 1][2]
+        first, last = self._span(name)
+        return self.lines[index][offset + first:offset + last]
+
+
+class ConnectionTracker:
+    """every TCP socket from /proc/net/tcp{,6}, aggregated under a cpu budget
+
+    a refresh only slices the columns the diff and the shown aggregation
+    need and counts raw hex fields, so only distinct keys get decoded;
+    socket owners come from a walk of /proc/*/fd that stops once the
+    refresh has used budget_ms of cpu and resumes on the next one, and
+    due() spaces refreshes so the tracker stays under cpu_share of a cpu
+    """
+
+    def __init__(self, host_path, budget_ms: float = 150, cpu_share: float = 0.25,
+                 owner_interval: float = 10.0):
+        self.proc = host_path("/proc")
+        self.budget = budget_ms / 1000
+        self.cpu_share = max(0.01, cpu_share)
+        self.owner_interval = owner_interval
+        self.lock = threading.Lock()
+        self.tables = {}
+        self.keys = None
+        self.refreshed_at = None
+        self.ready_at = 0.0
+        self.addresses = {}
+        self.owners = {}
+        self.owner_walk = None
+        self.owner_next = {}
+        self.owners_at = None
+
+    def due(self) -> bool:
+        """whether the cpu spent so far leaves room for another refresh"""
+        return time.monotonic() >= self.ready_at
+
+    def _address(self, address: bytes) -> str:
+        name = self.addresses.get(address)
+        if name is None:
+            if len(self.addresses) > 100000:
+                self.addresses.clear()
+            name = self.addresses[address] = decode_address(address)
+        return name
+
+    def _walk_owners(self):
+        # one pid per step so the walk can stop anywhere
+        for entry in os.listdir(self.proc):
+            if not entry.isdigit():
+                continue
+            fd_dir = os.path.join(self.proc, entry, "fd")
+            try:
+                with open(os.path.join(self.proc, entry, "comm"), "r") as f:
+                    owner = (int(entry), f.read().strip())
+                links = [os.readlink(os.path.join(fd_dir, fd)) for fd in os.listdir(fd_dir)]
+            except OSError:
+                yield
+                continue
+            for link in links:
+                if link.startswith("socket:["):
+                    inode = link[8:-1].encode()
+                    self.owner_next[inode] = self.owners[inode] = owner
+            yield
+
+    def _scan_owners(self, deadline: float):
+        if self.owner_walk is None:
+            if self.owners_at is not None and time.monotonic() - self.owners_at < self.owner_interval:
+                return
+            self.owner_walk = self._walk_owners()
+            self.owner_next = {}
+        for _ in self.owner_walk:
+            if time.thread_time() >= deadline:
+                return
+        # a complete walk also forgets sockets that are gone
+        self.owners, self.owner_next = self.owner_next, {}
+        self.owner_walk = None
+        self.owners_at = time.monotonic()
+
+    def _listening(self) -> set:
+        return {lport for table in self.tables.values()
+                for lport, state in zip(table.column("lport"), table.column("state")) if state == b"0A"}
+
+    def _group(self, table: TcpTable, group: str, listening: set) -> list:
+        if group == "process":
+            return list(map(self.owners.get, table.column("inode")))
+        if group == "port":
+            # a connection counts under the listening port it was accepted on, else its remote port
+            return [lport if lport in listening else rport
+                    for lport, rport in zip(table.column("lport"), table.column("rport"))]
+        return table.column(group)
+
+    def _label(self, group: str, key) -> str:
+        if group == "remote":
+            return self._address(key)
+        if group == "port":
+            return str(int(key, 16))
+        if group == "state":
+            return TCP_STATES.get(key, key.decode())
+        return f"{key[1]} ({key[0]})" if key else "unknown"
+
+    def refresh(self, group: str = "remote", top: int = 200) -> Dict:
+        """read, diff against the previous refresh and aggregate by one group"""
+        with self.lock:
+            started, cpu = time.monotonic(), time.thread_time()
+            tables = {}
+            for proto in ("tcp", "tcp6"):
+                try:
+                    with open(os.path.join(self.proc, "net", proto), "rb") as f:
+                        tables[proto] = TcpTable(f.read())
+                except OSError:
+                    pass
+            
+            # new and closed connections from the 4-tuples of two refreshes
+            keys = set()
+            for table in tables.values():
+                keys.update(table.column("key"))
+            new = closed = None
+            if self.keys is not None and started > self.refreshed_at:
+                elapsed = started - self.refreshed_at
+                new = round(len(keys - self.keys) / elapsed, 1)
+                closed = round(len(self.keys - keys) / elapsed, 1)
+            self.tables, self.keys, self.refreshed_at = tables, keys, started
+            
+            # owners get whatever is left of the budget
+            self._scan_owners(cpu + self.budget)
+            
+            listening = self._listening() if group == "port" else set()
+            counter = Counter()
+            for table in tables.values():
+                counter.update(self._group(table, group, listening))
+            
+            used = time.thread_time() - cpu
+            self.ready_at = started + used / self.cpu_share
+            return {"total": sum(map(len, tables.values())), "new_per_s": new, "closed_per_s": closed,
+                    "group": group,
+                    "rows": [(self._label(group, key), key, count) for key, count in counter.most_common(top)],
+                    "owners": len(self.owners), "owners_complete": self.owner_walk is None,
+                    "cpu_ms": round(used * 1000, 1)}
+
+    def rows(self, group: Optional[str] = None, key=None, limit: int = 100000) -> List[List]:
+        """decoded connections from the last refresh, all or those of one aggregate key"""
+        with self.lock:
+            listening = self._listening() if group == "port" else set()
+            result = []
+            for proto, table in self.tables.items():
+                if group:
+                    indexes = [i for i, value in enumerate(self._group(table, group, listening)) if value == key]
+                else:
+                    indexes = range(len(table))
+                inodes = table.column("inode") if self.owners else None
+                for i in indexes[:limit - len(result)]:
+                    owner = self.owners.get(inodes[i]) if inodes else None
+                    state = table.field(i, "state")
+                    result.append([proto,
+                                   f"{self._address(table.field(i, 'local'))}:{int(table.field(i, 'lport'), 16)}",
+                                   f"{self._address(table.field(i, 'remote'))}:{int(table.field(i, 'rport'), 16)}",
+                                   TCP_STATES.get(state, state.decode()),
+                                   owner[0] if owner else "", owner[1] if owner else ""])
+            return result
+
+
+PSI_RESOURCES = ("cpu", "memory", "io")
+
+DEFAULT_PSI_CONFIG = {
+    # also sample the top level cgroups of the cgroup2 hierarchy
+    "cgroups": True,
+    # kernel triggers, e.g. {"resource": "memory", "kind": "some", "stall_ms": 150, "window_ms": 2000}
+    "triggers": []
+}
+
+
+def parse_pressure(text: str) -> Dict[str, Dict[str, float]]:
+    """'some avg10=0.12 avg60=0.05 avg300=0.01 total=1234' lines by kind"""
+    values = {}
+    for line in text.splitlines():
+        kind, *fields = line.split()
+        values[kind] = {key: float(value) for key, _, value in (field.partition("=") for field in fields)}
+    return values
+
+
+class PressureMonitor:
+    """pressure stall information of the system and the top level cgroups
+
+    the pressure files stay open and are re-read with pread, stall percentages
+    come from the total= microsecond counters between two samples; triggers
+    are armed in the kernel and waited on with poll(), so a stall is reported
+    as soon as it crosses the threshold rather than at the next sample
+    """
+
+    def __init__(self, host_path, cgroups: bool = True, triggers: Optional[List[Dict]] = None,
+                 rescan: float = 30.0):
+        self.host_path = host_path
+        self.cgroups = cgroups
+        self.triggers = triggers or []
+        self.rescan = rescan
+        self.lock = threading.Lock()
+        self.fds = {}
+        self.scanned = None
+        self.last = {}
+        self.armed = {}
+        self.fired = 0
+        self.wake = None
+
+    def cgroup_root(self) -> Optional[str]:
+        # pure cgroup2, or the hybrid layout with cgroup2 mounted at unified/
+        for path in ("/sys/fs/cgroup", "/sys/fs/cgroup/unified"):
+            if os.path.exists(self.host_path(os.path.join(path, "cgroup.controllers"))):
+                return path
+        return None
+
+    def paths(self) -> Dict[tuple, str]:
+        """(source, resource) -> pressure file"""
+        paths = {("system", resource): f"/proc/pressure/{resource}" for resource in PSI_RESOURCES}
+        root = self.cgroup_root() if self.cgroups else None
+        if root is None:
+            return paths
+        try:
+            entries = sorted(os.listdir(self.host_path(root)))
+        except OSError:
+            entries = []
+        for entry in entries:
+            for resource in PSI_RESOURCES:
+                path = os.path.join(root, entry, f"{resource}.pressure")
+                if os.path.exists(self.host_path(path)):
+                    paths[(entry, resource)] = path
+        return paths
+
+    def _open(self):
+        # cgroups come and go, look for new ones every so often
+        now = time.monotonic()
+        if self.scanned is not None and now - self.scanned < self.rescan:
+            return
+        self.scanned = now
+        paths = self.paths()
+        for key in list(self.fds):
+            if key not in paths:
+                os.close(self.fds.pop(key))
+        for key, path in paths.items():
+            if key not in self.fds:
+                try:
+                    self.fds[key] = os.open(self.host_path(path), os.O_RDONLY)
+                except OSError:
+                    pass
+
+    def read(self) -> Dict:
+        """{source: {resource: {kind: {avg10, avg60, avg300, total}}}}"""
+        result = {}
+        with self.lock:
+            self._open()
+            for (source, resource), fd in list(self.fds.items()):
+                try:
+                    text = os.pread(fd, 4096, 0).decode()
+                except OSError:
+                    # the cgroup was removed
+                    os.close(self.fds.pop((source, resource)))
+                    continue
+                result.setdefault(source, {})[resource] = parse_pressure(text)
+        return result
+
+    def sample(self) -> Dict[str, float]:
+        """percent of wall time stalled since the previous sample, per psi.<source>.<resource>.<kind>"""
+        now = time.monotonic()
+        samples = {}
+        for source, resources in self.read().items():
+            for resource, kinds in resources.items():
+                for kind, values in kinds.items():
+                    series = f"psi.{source}.{resource}.{kind}"
+                    last = self.last.get(series)
+                    self.last[series] = (now, values["total"])
+                    if last is not None and now > last[0]:
+                        stalled = max(0.0, values["total"] - last[1])
+                        samples[series] = round(stalled / 1e4 / (now - last[0]), 3)
+        return samples
+
+    def arm(self, callback) -> int:
+        """register the configured triggers; callback(spec, values) runs on the poll thread"""
+        root = self.cgroup_root()
+        for spec in self.triggers:
+            resource = spec.get("resource")
+            kind = spec.get("kind", "some")
+            if resource not in PSI_RESOURCES or kind not in ("some", "full"):
+                print(f"Ignoring invalid PSI trigger: {spec}")
+                continue
+            path = f"/proc/pressure/{resource}"
+            if spec.get("cgroup"):
+                if root is None:
+                    print(f"Ignoring PSI trigger without a cgroup2 hierarchy: {spec}")
+                    continue
+                path = os.path.join(root, spec["cgroup"], f"{resource}.pressure")
+            stall_us = int(spec.get("stall_ms", 150) * 1000)
+            window_us = int(spec.get("window_ms", 2000) * 1000)
+            try:
+                fd = os.open(self.host_path(path), os.O_RDWR | os.O_NONBLOCK)
+            except OSError as e:
+                print(f"Could not open {path} for a PSI trigger: {e}")
+                continue
+            try:
+                os.write(fd, f"{kind} {stall_us} {window_us}".encode() + b"\0")
+            except OSError as e:
+                os.close(fd)
+                # without CAP_SYS_RESOURCE the window has to be a multiple of 2s
+                print(f"Could not arm PSI trigger {spec}: {e}")
+                continue
+            self.armed[fd] = spec
+        if self.armed:
+            self.wake = os.pipe()
+            threading.Thread(target=self._poll, args=(callback,), daemon=True).start()
+        return len(self.armed)
+
+    def _poll(self, callback):
+        poller = select.poll()
+        poller.register(self.wake[0], select.POLLIN)
+        for fd in self.armed:
+            poller.register(fd, select.POLLPRI)
+        while self.armed:
+            for fd, mask in poller.poll():
+                if fd == self.wake[0]:
+                    for armed in self.armed:
+                        os.close(armed)
+                    self.armed.clear()
+                    return
+                spec = self.armed.get(fd)
+                if spec is None:
+                    continue
+                if mask & select.POLLERR:
+                    # the monitored cgroup went away
+                    poller.unregister(fd)
+                    del self.armed[fd]
+                    continue
+                self.fired += 1
+                try:
+                    values = parse_pressure(os.pread(fd, 4096, 0).decode()).get(spec.get("kind", "some"), {})
+                    callback(spec, values)
+                except Exception as e:
+                    print(f"Error handling PSI trigger: {e}")
+
+    def stop(self):
+        if self.wake is not None:
+            os.write(self.wake[1], b"x")
+        with self.lock:
+            for fd in self.fds.values():
+                os.close(fd)
+            self.fds.clear()
+            self.scanned = None
+
 
 class LinuxSystemPanel:
-    def __init__(self, root):
+    def __init__(self, root=None, sysroot: str = "/", snapshot: Optional[Dict] = None):
         self.root = root
-        self.root.title("Secuonis Linux System Control Panel")
-        self.root.geometry("1200x750")
-        self.root.configure(bg="#000000")
+        
+        # system root the probes read from (a fake tree for benchmarks)
+        self.sysroot = sysroot
+        if sysroot != "/":
+            psutil.PROCFS_PATH = self.host_path("/proc")
         
         # Thread pool
         self.executor = ThreadPoolExecutor(max_workers=4)
         self.update_queue = queue.Queue()
         
+        # a probe called again within one refresh (get_network_info asks for the
+        # active interface three times) returns the first call's result
+        for name in dir(type(self)):
+            if name.startswith(("get_", "check_")) and callable(getattr(self, name)):
+                setattr(self, name, shared_probe(name, getattr(self, name)))
+        
+        # network/config probes re-run only after an inotify or rtnetlink event;
+        # netlink reports the live host, so it is left out for a fake sysroot
+        self.events = EventWatcher(self.host_path, netlink=sysroot == "/")
+        for name, topics in EVENT_PROBES.items():
+            setattr(self, name, self.events.cached(name, topics, getattr(self, name)))
+        self.events.start()
+        
+        # self instrumentation
+        self.instrumentation = PanelInstrumentation()
+        self.instrumentation.install_hooks()
+        self.instrumentation.instrument_probes(self)
+        
+        # kernel hardening baseline
+        rules = load_config("sysctl.json", {"rules": DEFAULT_SYSCTL_BASELINE})["rules"]
+        self.sysctl = SysctlAuditor(self.host_path("/proc/sys"), rules)
+        
+        # file integrity baseline
+        integrity = load_config("integrity.json", DEFAULT_INTEGRITY_CONFIG)
+        self.integrity = FileIntegrityMonitor(integrity.get("paths", DEFAULT_INTEGRITY_CONFIG["paths"]),
+                                              os.path.join(STATE_DIR, "integrity.db"), self.host_path,
+                                              exclude=integrity.get("exclude", DEFAULT_INTEGRITY_CONFIG["exclude"]))
+        self.integrity_job = None
+        
+        # parsed firewall ruleset
+        self.firewall = FirewallInspector()
+        
+        # block/usb/pci devices from sysfs
+        self.devices = DeviceInventory(self.host_path)
+        
+        # name/cmdline/user/cgroup search over every process
+        self.process_index = ProcessIndex(self.host_path)
+        
+        # every tcp socket, aggregated under a cpu budget
+        connections = load_config("connections.json", DEFAULT_CONNECTIONS_CONFIG)
+        self.connections = ConnectionTracker(self.host_path, budget_ms=connections.get("budget_ms", 150),
+                                             cpu_share=connections.get("cpu_share", 0.25),
+                                             owner_interval=connections.get("owner_interval", 10.0))
+        
+        # per-process memory, scanned under a cpu budget
+        memory = load_config("memory.json", DEFAULT_MEMORY_CONFIG)
+        self.memory = MemoryScanner(self.host_path, workers=memory.get("workers", 4),
+                                    cpu_budget=memory.get("cpu_budget", 0.25),
+                                    min_interval=memory.get("min_interval", 10.0))
+        
+        # GPU telemetry, started on first use
+        self.gpu = GpuTelemetry(self.host_path)
+        
+        # cpu/memory/io pressure stall information
+        psi = load_config("psi.json", DEFAULT_PSI_CONFIG)
+        self.pressure = PressureMonitor(self.host_path, cgroups=psi.get("cgroups", True),
+                                        triggers=psi.get("triggers", []))
+        
+        # failed logins and sudo use, parsed incrementally from a checkpoint;
+        # the journal is the live host's, so only used for the real root
+        self.auth = AuthLogAnalyzer(os.path.join(STATE_DIR, "authlog.json"), self.host_path,
+                                    journal=sysroot == "/")
+        
+        # pending package updates, cached against dpkg/apt state
+        self.updates = UpdateChecker(os.path.join(CACHE_DIR, "updates.json"), self.host_path)
+        
+        # offline replay of a captured snapshot
+        self.snapshot = None
+        if snapshot is not None:
+            self.apply_snapshot(snapshot)
+        
+        if root is None:
+            # headless: probes only, no window
+            return
+        
+        self.root.title("Secuonis Linux System Control Panel")
+        if self.snapshot is not None:
+            captured = datetime.datetime.fromtimestamp(self.snapshot["captured_at"]).strftime("%Y-%m-%d %H:%M:%S")
+            self.root.title(f"Secuonis Linux System Control Panel [snapshot: {self.snapshot['hostname']} @ {captured}]")
+        self.root.geometry("1200x850")
+        self.root.configure(bg="#000000")
+        
+        # every periodic refresh goes through one scheduler, results from
+        # worker threads come back through the dispatcher
+        self.scheduler = RefreshScheduler(self.root)
+        self.ui = UIDispatcher(self.root, self.update_queue)
+        self.token = CancelToken()
+        self.instrumentation.start_heartbeat(self.root)
+        self.diagnostics_window = None
+        self.fleet = None
+        
+        # metric history and alert rules
+        self.metrics = MetricHistory()
+        self.sampler = MetricSampler(self.host_path, pressure=self.pressure)
+        rules = load_config("rules.json", {"rules": DEFAULT_ALERT_RULES})["rules"]
+        self.alerts = AlertEngine(rules, log_path=os.path.join(STATE_DIR, "alerts.log"))
+        self.anomalies = None
+        self.anomaly_job = None
+        self.export_job = None
+        self.exporter = None
+        if np is not None:
+            self.anomalies = AnomalyDetector(load_config("anomaly.json", DEFAULT_ANOMALY_CONFIG),
+                                             log_path=os.path.join(STATE_DIR, "alerts.log"))
+        if self.snapshot is None:
+            self.pressure.arm(self.pressure_stalled)
+        
+        self.updates.refresh_async()
+        
         # Font settings
         self.title_font = font.Font(family="Ubuntu", size=12, weight="bold")
         self.bold_font = font.Font(family="Ubuntu", size=10, weight="bold")
@@ -79,7 +4312,14 @@ class LinuxSystemPanel:
             ("System Logs", 7),
             ("Power Info", 8),
             ("System Monitor", 9),
-            ("About", 10)
+            ("Snapshots", 10),
+            ("Fleet", 11),
+            ("Alerts", 12),
+            ("Integrity", 13),
+            ("Firewall", 14),
+            ("Pressure", 15),
+            ("Connections", 16),
+            ("About", 17)
         ]
 
         
@@ -99,7 +4339,8 @@ class LinuxSystemPanel:
         self.create_usage_graphs()
         
         # show system info first 
-        self.show_system_info()
+        with self.instrumentation.timer("tab:System Info"):
+            self.show_system_info()
         
         # updates
         self.start_periodic_updates()
@@ -109,6 +4350,7 @@ class LinuxSystemPanel:
         
         # window
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.root.bind("<F12>", lambda event: self.toggle_diagnostics())
 
     def create_usage_graphs(self):
         # CPU Graph
@@ -148,11 +4390,69 @@ class LinuxSystemPanel:
                                 bg="#121212",
                                 fg="#00ff00")
         self.ram_label.pack(anchor="w")
+        
+        # alert indicator
+        alert_frame = tk.Frame(self.bottom_bar, bg="#121212")
+        alert_frame.pack(side="left", fill="both", padx=10, pady=5)
+        
+        tk.Label(alert_frame,
+                text="Alerts:",
+                bg="#121212",
+                fg="#00ff00",
+                font=self.bold_font).pack(anchor="w")
+        
+        self.alert_label = tk.Label(alert_frame,
+                                  text="None",
+                                  bg="#121212",
+                                  fg="#00ff00",
+                                  cursor="hand2")
+        self.alert_label.pack(anchor="w", pady=2)
+        self.alert_label.bind("<Button-1>", lambda event: self.switch_tab(dict(self.menu_items)["Alerts"]))
+
+    def record_metrics(self):
+        """sample every series into history and feed the alert rules"""
+        ts = time.time()
+        for series, value in self.sampler.sample().items():
+            self.metrics.append(series, ts, value)
+            self.alerts.observe(series, ts, value)
+        
+        count = len(self.alerts.active)
+        if hasattr(self, 'alert_label') and self.alert_label.winfo_exists():
+            critical = any(rule.spec.get("severity") == "critical" for rule in self.alerts.active.values())
+            self.alert_label.config(text=f"{count} active" if count else "None",
+                                    fg="#ff0000" if critical else "#ffff00" if count else "#00ff00")
+
+    def pressure_stalled(self, spec: Dict, values: Dict):
+        """a kernel PSI trigger fired; runs on the poll thread"""
+        resource, kind = spec["resource"], spec.get("kind", "some")
+        source = spec.get("cgroup") or "system"
+        name = spec.get("name", f"{resource} {kind} stall > {spec.get('stall_ms', 150)}ms")
+        self.ui.post(None, self.alerts.notify, name, f"psi.{source}.{resource}.{kind}",
+                     values.get("avg10", 0.0), spec.get("severity", "warning"), "STALL")
+
+    def detect_anomalies(self):
+        """score the metric history off the UI thread"""
+        if self.anomaly_job is not None and not self.anomaly_job.done():
+            return
+        self.anomaly_job = self.executor.submit(self.anomalies.score, self.metrics)
+
+    def get_usage_summary(self) -> Dict:
+        """headline usage numbers shared by the graphs"""
+        mem = shared_psutil("virtual_memory")
+        net = shared_psutil("net_io_counters")
+        return {
+            # CPU usage (non-blocking, measured since the previous call)
+            "CPU": shared_psutil("cpu_percent"),
+            "RAM": mem.percent,
+            "Disk": psutil.disk_usage(self.host_path('/')).percent,
+            "Net Sent": net.bytes_sent,
+            "Net Recv": net.bytes_recv
+        }
 
     def update_usage_graphs(self):
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=0.5)
+            usage = self.get_usage_summary()
+            cpu_percent = usage["CPU"]
             if hasattr(self, 'cpu_canvas') and self.cpu_canvas.winfo_exists():
                 self.cpu_canvas.delete("all")
                 width = self.cpu_canvas.winfo_width()
@@ -161,15 +4461,12 @@ class LinuxSystemPanel:
                     self.cpu_label.config(text=f"{cpu_percent:.1f}%")
             
             # RAM usage
-            mem = psutil.virtual_memory()
             if hasattr(self, 'ram_canvas') and self.ram_canvas.winfo_exists():
                 self.ram_canvas.delete("all")
                 width = self.ram_canvas.winfo_width()
                 if width > 1:
-                    self.ram_canvas.create_rectangle(0, 0, (mem.percent/100)*width, 30, fill="#006400", outline="")
-                    self.ram_label.config(text=f"{mem.percent:.1f}%")
-            
-            self.root.after(1000, self.update_usage_graphs)
+                    self.ram_canvas.create_rectangle(0, 0, (usage["RAM"]/100)*width, 30, fill="#006400", outline="")
+                    self.ram_label.config(text=f"{usage['RAM']:.1f}%")
         except Exception as e:
             print(f"Error updating graphs: {e}")
 
@@ -183,11 +4480,6 @@ class LinuxSystemPanel:
                 bg="#000000",
                 fg="#00ff00").pack(anchor="w", pady=(0, 20))
         
-        info_frame = tk.Frame(content, bg="#000000")
-        info_frame.pack(fill="x")
-        
-        system_info = self.get_system_info()
-        
         # system infos
         categories = {
             "System": ["Hostname", "OS", "Kernel", "Uptime", "Last Boot", "System Time", "Timezone"],
@@ -195,31 +4487,13 @@ class LinuxSystemPanel:
             "Environment": ["Desktop Environment", "Display Manager", "Shell", "System Language"]
         }
         
-        row = 0
-        for category, items in categories.items():
-            # catagori items
-            tk.Label(info_frame, 
-                    text=f"\n{category}:", 
-                    bg="#000000", 
-                    fg="#00ff00",
-                    font=self.bold_font).grid(row=row, column=0, columnspan=2, sticky="w", pady=(10, 5))
-            row += 1
-            
-            # catagories 
-            for item in items:
-                if item in system_info:
-                    tk.Label(info_frame, 
-                            text=f"{item}:", 
-                            bg="#000000", 
-                            fg="#00ff00",
-                            font=self.bold_font, 
-                            width=20, 
-                            anchor="w").grid(row=row, column=0, sticky="w", pady=2)
-                    tk.Label(info_frame, 
-                            text=system_info[item], 
-                            bg="#000000",
-                            fg="#00ff00").grid(row=row, column=1, sticky="w", padx=10, pady=2)
-                    row += 1
+        def sections():
+            system_info = self.get_system_info()
+            return {category: {item: system_info[item] for item in items if item in system_info}
+                    for category, items in categories.items()}
+        
+        table = self.create_info_table(content)
+        self.refresh_info_table(table, sections, interval=5.0)
 
     def show_system_monitor(self):
         content = tk.Frame(self.main_area, bg="#000000")
@@ -266,10 +4540,12 @@ class LinuxSystemPanel:
         def update_graphs():
             try:
                 if not content.winfo_exists():
-                    return
+                    return False
+                
+                usage = self.get_usage_summary()
                     
                 # CPU usage
-                cpu_percent = psutil.cpu_percent(interval=0.5)
+                cpu_percent = usage["CPU"]
                 if hasattr(self, 'monitor_cpu_canvas') and self.monitor_cpu_canvas.winfo_exists():
                     self.monitor_cpu_canvas.delete("all")
                     width = self.monitor_cpu_canvas.winfo_width()
@@ -278,29 +4554,25 @@ class LinuxSystemPanel:
                         self.monitor_cpu_label.config(text=f"{cpu_percent:.1f}%")
                 
                 # RAM usage
-                mem = psutil.virtual_memory()
                 if hasattr(self, 'monitor_ram_canvas') and self.monitor_ram_canvas.winfo_exists():
                     self.monitor_ram_canvas.delete("all")
                     width = self.monitor_ram_canvas.winfo_width()
                     if width > 1:
-                        self.monitor_ram_canvas.create_rectangle(0, 0, (mem.percent/100)*width, 100, fill="#006400", outline="")
-                        self.monitor_ram_label.config(text=f"{mem.percent:.1f}%")
+                        self.monitor_ram_canvas.create_rectangle(0, 0, (usage["RAM"]/100)*width, 100, fill="#006400", outline="")
+                        self.monitor_ram_label.config(text=f"{usage['RAM']:.1f}%")
                 
                 # Disk usage
-                disk = psutil.disk_usage('/')
                 if hasattr(self, 'monitor_disk_canvas') and self.monitor_disk_canvas.winfo_exists():
                     self.monitor_disk_canvas.delete("all")
                     width = self.monitor_disk_canvas.winfo_width()
                     if width > 1:
-                        self.monitor_disk_canvas.create_rectangle(0, 0, (disk.percent/100)*width, 100, fill="#006400", outline="")
-                        self.monitor_disk_label.config(text=f"{disk.percent:.1f}%")
-                
-                # update after 1 sec
-                self.root.after(1000, update_graphs)
+                        self.monitor_disk_canvas.create_rectangle(0, 0, (usage["Disk"]/100)*width, 100, fill="#006400", outline="")
+                        self.monitor_disk_label.config(text=f"{usage['Disk']:.1f}%")
             except Exception as e:
                 print(f"Error updating graphs: {e}")
         
-        update_graphs()
+        self.scheduler.add("monitor_graphs", update_graphs, interval=1.0, budget_ms=10,
+                           priority=PRIORITY_NORMAL, group="tab")
 
     def handle_signal(self, signum, frame):
         """get the signals"""
@@ -317,6 +4589,13 @@ class LinuxSystemPanel:
     def cleanup(self):
         """Clean sources"""
         try:
+            if self.root is not None:
+                self.scheduler.stop()
+                self.ui.stop()
+                if self.fleet is not None:
+                    self.fleet.stop()
+            self.gpu.stop()
+            self.pressure.stop()
             self.executor.shutdown(wait=False)
             print("Thread pool shutdown completed")
         except Exception as e:
@@ -324,57 +4603,68 @@ class LinuxSystemPanel:
 
     def start_periodic_updates(self):
         """periodic updates"""
-        def update():
+        self.scheduler.add("usage_graphs", self.update_usage_graphs, interval=1.0, budget_ms=5,
+                           priority=PRIORITY_HIGH)
+        if self.snapshot is None:
+            self.scheduler.add("metrics", self.record_metrics, interval=1.0, budget_ms=10,
+                               priority=PRIORITY_HIGH)
+            if self.anomalies is not None:
+                self.scheduler.add("anomalies", self.detect_anomalies, interval=30.0, budget_ms=5,
+                                   priority=PRIORITY_LOW)
+
+    def submit(self, key, fn, done, *args, error=None, cancellable=True):
+        """run fn on the pool and hand its result to done() on the main loop
+
+        cancellable jobs belong to the current tab: they are skipped or have
+        their subprocesses killed when the tab is switched, and their results
+        are dropped before reaching done()
+        """
+        token = self.token if cancellable else None
+        
+        def job():
+            if token is not None:
+                if token.cancelled:
+                    token.skipped += 1
+                    raise Cancelled()
+                _job_context.token = token
             try:
-                # CPU usage
-                cpu_percent = psutil.cpu_percent(interval=0.5)
-                if hasattr(self, 'cpu_canvas') and self.cpu_canvas.winfo_exists():
-                    self.cpu_canvas.delete("all")
-                    width = self.cpu_canvas.winfo_width()
-                    if width > 1:
-                        self.cpu_canvas.create_rectangle(0, 0, (cpu_percent/100)*width, 30, fill="#006400", outline="")
-                        self.cpu_label.config(text=f"{cpu_percent:.1f}%")
-                
-                # RAM usage
-                mem = psutil.virtual_memory()
-                if hasattr(self, 'ram_canvas') and self.ram_canvas.winfo_exists():
-                    self.ram_canvas.delete("all")
-                    width = self.ram_canvas.winfo_width()
-                    if width > 1:
-                        self.ram_canvas.create_rectangle(0, 0, (mem.percent/100)*width, 30, fill="#006400", outline="")
-                        self.ram_label.config(text=f"{mem.percent:.1f}%")
-                
-                # update after 1sec
-                self.root.after(1000, update)
+                return fn(*args)
+            finally:
+                _job_context.token = None
+        
+        def deliver(callback, value):
+            if token is None or token.generation == self.token.generation:
+                callback(value)
+        
+        def finished(future):
+            if token is not None and token.cancelled:
+                return
+            try:
+                result = future.result()
             except Exception as e:
-                print(f"Error updating graphs: {e}")
+                if error is not None:
+                    self.ui.post(key, deliver, error, e)
+                else:
+                    print(f"Error in background job {key}: {e}")
+                return
+            self.ui.post(key, deliver, done, result)
         
-        update()
+        future = self.executor.submit(job)
+        if token is not None:
+            token.track(future)
+        future.add_done_callback(finished)
+        return future
 
-    def update_status(self):
-        """update status"""
-        try:
-            cpu_percent = psutil.cpu_percent()
-            mem = psutil.virtual_memory()
-            uptime = self.get_uptime()
-            
-            self.cpu_label.config(text=f"{cpu_percent}%")
-            self.ram_label.config(text=f"{mem.percent}%")
-            
-            self.cpu_canvas.delete("all")
-            self.cpu_canvas.create_rectangle(0, 0, cpu_percent*2, 30, fill="#006400", outline="")
-            
-            self.ram_canvas.delete("all")
-            self.ram_canvas.create_rectangle(0, 0, mem.percent*2, 30, fill="#006400", outline="")
-            
-            self.root.after(1000, self.update_status)
-        except Exception as e:
-            print(f"Error updating status: {e}")
+    def host_path(self, path: str) -> str:
+        """absolute path inside the inspected system root"""
+        if self.sysroot == "/":
+            return path
+        return os.path.join(self.sysroot, path.lstrip("/"))
 
     def get_uptime(self) -> str:
         """System work time"""
         try:
-            uptime = time.time() - psutil.boot_time()
+            uptime = time.time() - shared_psutil("boot_time")
             days = int(uptime // (24 * 3600))
             hours = int((uptime % (24 * 3600)) // 3600)
             minutes = int((uptime % 3600) // 60)
@@ -393,6 +4683,10 @@ class LinuxSystemPanel:
     def switch_tab(self, index: int):
         """change tabs"""
         try:
+            self.scheduler.remove_group("tab")
+            # stop the old tab's jobs and subprocesses, ignore whatever they still return
+            self.token.cancel()
+            self.token = CancelToken(self.token.generation + 1)
             for widget in self.main_area.winfo_children():
                 widget.destroy()
             
@@ -407,16 +4701,962 @@ class LinuxSystemPanel:
                 self.show_system_logs,
                 self.show_power_info,
                 self.show_system_monitor,
+                self.show_snapshots,
+                self.show_fleet,
+                self.show_alerts,
+                self.show_integrity,
+                self.show_firewall,
+                self.show_pressure,
+                self.show_connections,
                 self.show_about
             ]
             
             if index < len(tabs):
-                tabs[index]()
+                with self.instrumentation.timer(f"tab:{self.menu_items[index][0]}"):
+                    tabs[index]()
                 print(f"Switched to tab: {self.menu_items[index][0]}")
         except Exception as e:
             print(f"Error switching tab: {e}")
             messagebox.showerror("Error", f"Failed to switch tab: {str(e)}")
 
+    def toggle_diagnostics(self):
+        """diagnostics overlay (F12)"""
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.close_diagnostics()
+            return
+        
+        window = tk.Toplevel(self.root, bg="#000000")
+        window.title("Panel Diagnostics")
+        window.geometry("760x520")
+        window.protocol("WM_DELETE_WINDOW", self.close_diagnostics)
+        self.diagnostics_window = window
+        
+        summary = tk.Label(window, text="", bg="#000000", fg="#00ff00", justify="left", anchor="w")
+        summary.pack(fill="x", padx=10, pady=(10, 5))
+        
+        self.style.configure("Custom.Treeview", background="#000000", fieldbackground="#000000",
+                             foreground="#00ff00")
+        columns = ("count", "p50", "p99", "max")
+        tree = ttk.Treeview(window, columns=columns, style="Custom.Treeview")
+        tree.heading("#0", text="Probe / Tab")
+        tree.column("#0", width=320)
+        for column in columns:
+            tree.heading(column, text=column)
+            tree.column(column, width=90, anchor="e")
+        tree.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        ttk.Button(window, text="Export JSON", style="Custom.TButton",
+                   command=self.export_diagnostics).pack(anchor="e", padx=10, pady=(0, 10))
+        
+        def refresh():
+            if not window.winfo_exists():
+                return False
+            data = self.instrumentation.export(self.scheduler)
+            events = self.events.stats()
+            ui = self.ui.stats()
+            lag = data["loop_lag"]
+            rate = data["rates"][-1] if data["rates"] else {"forks_per_s": 0, "widgets_per_s": 0}
+            summary.config(text=(
+                f"Main loop lag: p50 {lag['p50_ms']:.1f}ms  p99 {lag['p99_ms']:.1f}ms  max {lag['max_ms']:.1f}ms\n"
+                f"Forks: {data['forks_total']} ({rate['forks_per_s']}/s)   "
+                f"Widgets: {data['widgets_total']} ({rate['widgets_per_s']}/s)\n"
+                f"Event cache: {events['hits']} hits, {events['misses']} misses, "
+                f"{sum(events['events'].values())} events\n"
+                f"UI updates: {ui['applied']} applied, {ui['coalesced']} coalesced, "
+                f"{ui['deferred']} drains over budget, {ui['pending']} pending\n"
+                f"Refresh sharing: {refresh_stats['refreshes']} refreshes, {refresh_stats['fetches']} fetches, "
+                f"{refresh_stats['hits']} repeated calls served"))
+            rows = dict(data["probes"])
+            for task in data["scheduler"]:
+                # scheduler only keeps an average cost per task
+                rows[f"task:{task['name']}"] = {"count": task["runs"], "p50_ms": task["avg_cost_ms"],
+                                                "p99_ms": "", "max_ms": ""}
+            for name, hist in sorted(rows.items()):
+                values = (hist["count"], hist["p50_ms"], hist["p99_ms"], hist["max_ms"])
+                if tree.exists(name):
+                    tree.item(name, values=values)
+                else:
+                    tree.insert("", "end", iid=name, text=name, values=values)
+        
+        refresh()
+        self.scheduler.add("diagnostics", refresh, interval=1.0, budget_ms=10,
+                           priority=PRIORITY_LOW, group="diagnostics")
+
+    def close_diagnostics(self):
+        self.scheduler.remove_group("diagnostics")
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.destroy()
+        self.diagnostics_window = None
+
+    def export_diagnostics(self):
+        """save instrumentation data as JSON"""
+        path = filedialog.asksaveasfilename(defaultextension=".json",
+                                            initialfile=f"securonis-diagnostics-{int(time.time())}.json",
+                                            filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            with open(path, "w") as f:
+                json.dump({**self.instrumentation.export(self.scheduler), "events": self.events.stats(),
+                           "ui": self.ui.stats(), "refresh": dict(refresh_stats)}, f, indent=2)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not export diagnostics: {e}")
+
+    def snapshot_probes(self) -> Dict[str, List[str]]:
+        """probes recorded by a snapshot, grouped by section"""
+        security = sorted(name for name in dir(type(self)) if name.startswith("check_"))
+        return {
+            "system": ["get_system_info", "get_usage_summary"],
+            "hardware": ["get_cpu_details", "get_gpu_details", "get_ram_details", "get_power_info"],
+            "network": ["get_network_info"],
+            "disks": ["get_disk_info"],
+            "processes": ["get_process_table"],
+            "sockets": ["get_socket_table", "get_connection_summary"],
+            "services": ["get_system_services"],
+            # recorded one by one so they run concurrently; get_security_info
+            # is rebuilt from them on replay
+            "security": security + ["get_public_ip", "get_proxy_status"],
+            "logs": ["get_log_status", "get_auth_summary"],
+            "kernel": ["get_sysctl_audit"],
+            "firewall": ["get_firewall_ruleset"],
+            "updates": ["get_update_details"],
+            "devices": ["get_device_inventory"],
+            "memory": ["get_process_memory"],
+            "pressure": ["get_pressure"]
+        }
+
+    def capture_snapshot(self) -> Dict:
+        """run every snapshot probe concurrently and collect the results"""
+        started = time.time()
+        calls = {name: getattr(self, name)
+                 for probes in self.snapshot_probes().values() for name in probes}
+        calls["get_process_table"] = lambda: self.get_process_table(sample=0.5)
+        
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            futures = {name: pool.submit(fn) for name, fn in calls.items()}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    errors[name] = str(e)
+        
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "hostname": socket.gethostname(),
+            "captured_at": started,
+            "duration_s": round(time.time() - started, 3),
+            "sections": self.snapshot_probes(),
+            "probes": results,
+            "errors": errors
+        }
+
+    def apply_snapshot(self, snapshot: Dict):
+        """serve every recorded probe from a snapshot instead of the live system"""
+        self.snapshot = snapshot
+        for name, result in snapshot["probes"].items():
+            setattr(self, name, lambda *args, _result=result, **kwargs: _result)
+        
+        table = snapshot["probes"].get("get_process_table")
+        if table:
+            columns = table["columns"]
+            processes = [dict(zip(columns, row)) for row in table["rows"]]
+            processes.sort(key=lambda x: x['cpu_percent'] or 0.0, reverse=True)
+            self.get_top_processes = lambda limit=5: processes[:limit]
+
+    def show_snapshots(self):
+        content = tk.Frame(self.main_area, bg="#000000")
+        content.pack(fill="both", expand=True, padx=25, pady=25)
+        
+        tk.Label(content, 
+                text="SYSTEM SNAPSHOTS", 
+                font=self.title_font,
+                bg="#000000",
+                fg="#00ff00").pack(anchor="w", pady=(0, 20))
+        
+        buttons = tk.Frame(content, bg="#000000")
+        buttons.pack(fill="x", pady=5)
+        
+        status_label = tk.Label(content, text="", bg="#000000", fg="#00ff00", anchor="w", justify="left")
+        status_label.pack(fill="x", pady=5)
+        
+        self.style.configure("Custom.Treeview", background="#000000", fieldbackground="#000000",
+                             foreground="#00ff00")
+        columns = ("change", "probe", "key", "field", "old", "new")
+        tree = ttk.Treeview(content, columns=columns, show="headings", style="Custom.Treeview")
+        for column, width in zip(columns, (70, 160, 220, 120, 200, 200)):
+            tree.heading(column, text=column.title())
+            tree.column(column, width=width, anchor="w")
+        scrollbar = ttk.Scrollbar(content, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        tree.pack(fill="both", expand=True, pady=5)
+        
+        def wait_for(job, done, cancellable=True):
+            """run a job on the pool, then done(result) on the main loop"""
+            def finished(result):
+                if content.winfo_exists():
+                    done(result)
+            
+            def failed(e):
+                if content.winfo_exists():
+                    status_label.config(text=f"Error: {e}", fg="#ff0000")
+            
+            self.submit(None, job, finished, error=failed, cancellable=cancellable)
+        
+        def capture():
+            path = filedialog.asksaveasfilename(
+                defaultextension=".json.gz",
+                initialfile=f"{socket.gethostname()}-{datetime.datetime.now():%Y%m%d-%H%M%S}.snapshot.json.gz",
+                filetypes=[("Snapshot", "*.json.gz")])
+            if not path:
+                return
+            status_label.config(text="Capturing snapshot...", fg="#ffff00")
+            
+            def job():
+                snapshot = self.capture_snapshot()
+                save_snapshot(snapshot, path)
+                return snapshot
+            
+            wait_for(job, lambda snapshot: status_label.config(
+                text=f"Saved {path} ({len(snapshot['probes'])} probes in {snapshot['duration_s']}s, "
+                     f"{os.path.getsize(path) / 1024:.0f} KB)", fg="#00ff00"), cancellable=False)
+        
+        def export():
+            path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                initialfile=f"{socket.gethostname()}-probes-{datetime.datetime.now():%Y%m%d-%H%M%S}.csv",
+                filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")])
+            if not path:
+                return
+            status_label.config(text="Exporting probe results...", fg="#ffff00")
+            
+            def job():
+                snapshot = self.snapshot or self.capture_snapshot()
+                return ExportJob(path, PROBE_EXPORT_COLUMNS, probe_rows(snapshot)).run()
+            
+            wait_for(job, lambda result: status_label.config(
+                text=f"Wrote {result['rows']} rows to {path} in {result['duration_s']}s", fg="#00ff00"),
+                cancellable=False)
+        
+        def replay():
+            path = filedialog.askopenfilename(filetypes=[("Snapshot", "*.json.gz")])
+            if not path:
+                return
+            try:
+                snapshot = load_snapshot(path)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not open snapshot: {e}")
+                return
+            LinuxSystemPanel(tk.Toplevel(self.root), snapshot=snapshot)
+        
+        def diff():
+            old_path = filedialog.askopenfilename(title="Older snapshot", filetypes=[("Snapshot", "*.json.gz")])
+            if not old_path:
+                return
+            new_path = filedialog.askopenfilename(title="Newer snapshot", filetypes=[("Snapshot", "*.json.gz")])
+            if not new_path:
+                return
+            status_label.config(text="Comparing snapshots...", fg="#ffff00")
+            
+            def show(changes):
+                tree.delete(*tree.get_children())
+                shown = changes[:5000]
+                for change in shown:
+                    tree.insert("", "end", values=(change["change"], change["probe"], change["key"],
+                                                   change["field"], str(change["old"])[:200],
+                                                   str(change["new"])[:200]))
+                note = f" (showing first {len(shown)})" if len(shown) < len(changes) else ""
+                status_label.config(text=f"{len(changes)} differences{note}", fg="#00ff00")
+            
+            wait_for(lambda: diff_snapshots(load_snapshot(old_path), load_snapshot(new_path)), show)
+        
+        ttk.Button(buttons, text="Capture Snapshot", style="Custom.TButton", command=capture).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Open Snapshot", style="Custom.TButton", command=replay).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Diff Snapshots", style="Custom.TButton", command=diff).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Export Results", style="Custom.TButton", command=export).pack(side="left", padx=5)
+
+    def show_fleet(self):
+        content = tk.Frame(self.main_area, bg="#000000")
+        content.pack(fill="both", expand=True, padx=25, pady=25)
+        
+        tk.Label(content, 
+                text="FLEET", 
+                font=self.title_font,
+                bg="#000000",
+                fg="#00ff00").pack(anchor="w", pady=(0, 20))
+        
+        config = load_config("fleet.json", {"targets": [], "token": None})
+        if self.fleet is None:
+            self.fleet = FleetMonitor(token=config["token"])
+            for target in config["targets"]:
+                self.fleet.add_target(target)
+        
+        controls = tk.Frame(content, bg="#000000")
+        controls.pack(fill="x", pady=5)
+        tk.Label(controls, text="Agent (host:port):", bg="#000000", fg="#00ff00").pack(side="left")
+        target_entry = tk.Entry(controls, bg="#121212", fg="#00ff00", insertbackground="#00ff00", width=30)
+        target_entry.pack(side="left", padx=10)
+        
+        summary = tk.Label(content, text="", bg="#000000", fg="#00ff00", anchor="w")
+        summary.pack(fill="x", pady=5)
+        
+        self.style.configure("Custom.Treeview", background="#000000", fieldbackground="#000000",
+                             foreground="#00ff00")
+        columns = ("status", "hostname", "cpu", "mem", "disk", "load1", "rx", "tx",
+                   "firewall", "vpn", "updates", "last_seen")
+        numeric = {"cpu", "mem", "disk", "load1", "rx", "tx", "last_seen"}
+        tree = ttk.Treeview(content, columns=columns, style="Custom.Treeview")
+        tree.heading("#0", text="agent", command=lambda: sort_by("#0"))
+        tree.column("#0", width=150)
+        for column in columns:
+            tree.heading(column, text=column, command=lambda c=column: sort_by(c))
+            tree.column(column, width=70 if column in numeric else 110,
+                        anchor="e" if column in numeric else "w")
+        tree.tag_configure("down", foreground="#ff0000")
+        scrollbar = ttk.Scrollbar(content, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        tree.pack(fill="both", expand=True, pady=5)
+        
+        sort_state = {"column": "#0", "reverse": False}
+        rows: Dict[str, Dict] = {}
+        
+        def sort_key(target):
+            column = sort_state["column"]
+            value = target if column == "#0" else rows[target].get(column)
+            if column in numeric:
+                return (0, float(value)) if isinstance(value, (int, float)) else (1, 0.0)
+            return (0, str(value or ""))
+        
+        def resort():
+            for position, target in enumerate(sorted(rows, key=sort_key, reverse=sort_state["reverse"])):
+                tree.move(target, "", position)
+        
+        def sort_by(column):
+            if sort_state["column"] == column:
+                sort_state["reverse"] = not sort_state["reverse"]
+            else:
+                sort_state.update(column=column, reverse=False)
+            resort()
+        
+        def refresh():
+            if not content.winfo_exists():
+                return False
+            changed = self.fleet.take_dirty()
+            for target, record in changed.items():
+                if record is None:
+                    rows.pop(target, None)
+                    if tree.exists(target):
+                        tree.delete(target)
+                    continue
+                metrics = record["metrics"]
+                row = {column: metrics.get(column, "") for column in columns}
+                row["status"] = record["status"]
+                row["last_seen"] = (round(time.time() - record["last_seen"])
+                                    if record["last_seen"] else "")
+                rows[target] = row
+                values = [row[column] for column in columns]
+                tags = () if record["status"] == "up" else ("down",)
+                if tree.exists(target):
+                    tree.item(target, values=values, tags=tags)
+                else:
+                    tree.insert("", "end", iid=target, text=target, values=values, tags=tags)
+            if changed:
+                resort()
+            up = sum(1 for row in rows.values() if row["status"] == "up")
+            summary.config(text=f"{len(rows)} agents, {up} up")
+        
+        def add():
+            target = target_entry.get().strip()
+            if not target:
+                return
+            if ":" not in target:
+                target = f"{target}:{FLEET_PORT}"
+            if target not in config["targets"]:
+                config["targets"].append(target)
+                save_config("fleet.json", config)
+            self.fleet.add_target(target)
+            target_entry.delete(0, "end")
+        
+        def remove():
+            for target in tree.selection():
+                if target in config["targets"]:
+                    config["targets"].remove(target)
+                self.fleet.remove_target(target)
+            save_config("fleet.json", config)
+        
+        ttk.Button(controls, text="Add", style="Custom.TButton", command=add).pack(side="left", padx=5)
+        ttk.Button(controls, text="Remove Selected", style="Custom.TButton", command=remove).pack(side="left", padx=5)
+        target_entry.bind("<Return>", lambda event: add())
+        
+        # the monitor keeps running in the background; show everything it knows
+        with self.fleet.lock:
+            self.fleet.dirty.update(self.fleet.hosts)
+        refresh()
+        self.scheduler.add("fleet_grid", refresh, interval=1.0, budget_ms=30,
+                           priority=PRIORITY_NORMAL, group="tab")
+
+    def show_alerts(self):
+        content = tk.Frame(self.main_area, bg="#000000")
+        content.pack(fill="both", expand=True, padx=25, pady=25)
+        
+        tk.Label(content, 
+                text="ALERTS", 
+                font=self.title_font,
+                bg="#000000",
+                fg="#00ff00").pack(anchor="w", pady=(0, 20))
+        
+        bound = sum(len(rules) for rules in self.alerts.rules_by_series.values())
+        tk.Label(content,
+                text=f"{len(self.alerts.specs)} rules, {bound} bound to series "
+                     f"(edit {os.path.join(CONFIG_DIR, 'rules.json')}, log in {self.alerts.log_path})",
+                bg="#000000",
+                fg="#00ff00").pack(anchor="w")
+        
+        self.create_export_controls(content)
+        
+        self.style.configure("Custom.Treeview", background="#000000", fieldbackground="#000000",
+                             foreground="#00ff00")
+        
+        tk.Label(content,
+                text="Active:",
+                bg="#000000",
+                fg="#00ff00",
+                font=self.bold_font).pack(anchor="w", pady=(10, 5))
+        active_columns = ("severity", "series", "value", "since")
+        active_tree = ttk.Treeview(content, columns=active_columns, style="Custom.Treeview", height=8)
+        active_tree.heading("#0", text="rule")
+        for column in active_columns:
+            active_tree.heading(column, text=column)
+        active_tree.tag_configure("critical", foreground="#ff0000")
+        active_tree.tag_configure("warning", foreground="#ffff00")
+        active_tree.pack(fill="x")
+        
+        event_columns = ("state", "rule", "series", "value")
+        event_tree = ttk.Treeview(content, columns=event_columns, style="Custom.Treeview")
+        event_tree.heading("#0", text="time")
+        for column in event_columns:
+            event_tree.heading(column, text=column)
+        event_tree.tag_configure("FIRING", foreground="#ff0000")
+        event_tree.tag_configure("ANOMALY", foreground="#ffff00")
+        event_tree.tag_configure("STALL", foreground="#ff0000")
+        
+        tk.Label(content,
+                text="Anomalies:",
+                bg="#000000",
+                fg="#00ff00",
+                font=self.bold_font).pack(anchor="w", pady=(10, 5))
+        if self.anomalies is None:
+            tk.Label(content,
+                    text="Anomaly detection needs numpy (pip install numpy)",
+                    bg="#000000",
+                    fg="#ffff00").pack(anchor="w")
+        anomaly_columns = ("model", "score", "value", "time")
+        anomaly_tree = ttk.Treeview(content, columns=anomaly_columns, style="Custom.Treeview", height=6)
+        anomaly_tree.heading("#0", text="series")
+        for column in anomaly_columns:
+            anomaly_tree.heading(column, text=column)
+        anomaly_tree.pack(fill="x")
+        
+        tk.Label(content,
+                text="Recent events:",
+                bg="#000000",
+                fg="#00ff00",
+                font=self.bold_font).pack(anchor="w", pady=(10, 5))
+        event_tree.pack(fill="both", expand=True)
+        
+        shown = {"events": max(0, self.alerts.event_count - len(self.alerts.events)),
+                 "anomalies": 0 if self.anomalies is None else
+                 max(0, self.anomalies.event_count - len(self.anomalies.events))}
+        
+        def refresh():
+            if not content.winfo_exists():
+                return False
+            current = {f"{name}|{series}": rule for (name, series), rule in self.alerts.active.items()}
+            for iid in active_tree.get_children():
+                if iid not in current:
+                    active_tree.delete(iid)
+            for iid, rule in current.items():
+                severity = rule.spec.get("severity", "warning")
+                values = (severity, rule.series, round(rule.value, 2),
+                          datetime.datetime.fromtimestamp(rule.since).strftime("%H:%M:%S"))
+                if active_tree.exists(iid):
+                    active_tree.item(iid, values=values)
+                else:
+                    active_tree.insert("", "end", iid=iid, text=rule.name, values=values, tags=(severity,))
+            
+            # events only ever get appended; add the new ones on top
+            new_count = min(self.alerts.event_count - shown["events"], len(self.alerts.events))
+            new = list(self.alerts.events)[len(self.alerts.events) - new_count:]
+            for event in new:
+                event_tree.insert("", 0, text=datetime.datetime.fromtimestamp(event["time"]).strftime("%H:%M:%S"),
+                                  values=(event["state"], event["rule"], event["series"], event["value"]),
+                                  tags=(event["state"],))
+            shown["events"] = self.alerts.event_count
+            
+            if self.anomalies is not None:
+                anomaly_tree.delete(*anomaly_tree.get_children())
+                for series, findings in sorted(self.anomalies.current.items()):
+                    for model, finding in findings.items():
+                        anomaly_tree.insert("", "end", text=series, values=(
+                            model, finding["score"], finding["value"],
+                            datetime.datetime.fromtimestamp(finding["time"]).strftime("%H:%M:%S")))
+                new_count = min(self.anomalies.event_count - shown["anomalies"], len(self.anomalies.events))
+                new = list(self.anomalies.events)[len(self.anomalies.events) - new_count:]
+                for event in new:
+                    event_tree.insert("", 0, text=datetime.datetime.fromtimestamp(event["time"]).strftime("%H:%M:%S"),
+                                      values=("ANOMALY", event["model"], event["series"], event["value"]),
+                                      tags=("ANOMALY",))
+                shown["anomalies"] = self.anomalies.event_count
+            children = event_tree.get_children()
+            if len(children) > 500:
+                event_tree.delete(*children[500:])
+        
+        refresh()
+        self.scheduler.add("alerts_view", refresh, interval=1.0, budget_ms=10,
+                           priority=PRIORITY_NORMAL, group="tab")
+
+    def create_export_controls(self, parent):
+        """export a time range of metric history to CSV/JSONL"""
+        frame = tk.Frame(parent, bg="#000000")
+        frame.pack(fill="x", pady=(10, 0))
+        tk.Label(frame, text="Export series:", bg="#000000", fg="#00ff00").pack(side="left")
+        pattern_var = tk.StringVar(value="*")
+        tk.Entry(frame, textvariable=pattern_var, width=20, bg="#121212", fg="#00ff00",
+                 insertbackground="#00ff00").pack(side="left", padx=5)
+        ranges = {"Last 15 minutes": 900, "Last hour": 3600, "Last 6 hours": 21600, "Everything": None}
+        range_var = tk.StringVar(value="Last hour")
+        ttk.Combobox(frame, textvariable=range_var, values=list(ranges), state="readonly",
+                     width=16).pack(side="left", padx=5)
+        status_label = tk.Label(frame, text="", bg="#000000", fg="#00ff00", anchor="w")
+        
+        def watch():
+            if not frame.winfo_exists():
+                return False
+            job = self.export_job
+            if job is None:
+                return False
+            if not job.done():
+                written, total = self.exporter.progress
+                percent = f" ({100 * written / total:.0f}%)" if total else ""
+                status_label.config(text=f"Exporting: {written} rows{percent}", fg="#ffff00")
+                return True
+            try:
+                result = job.result()
+                if result["cancelled"]:
+                    status_label.config(text=f"Export cancelled after {result['rows']} rows", fg="#ffff00")
+                else:
+                    status_label.config(text=f"Wrote {result['rows']} rows to {result['path']} "
+                                             f"({result['bytes'] / 1024:.0f} KB in {result['duration_s']}s)",
+                                        fg="#00ff00")
+            except Exception as e:
+                status_label.config(text=f"Export failed: {e}", fg="#ff0000")
+            self.export_job = None
+            return False
+        
+        def export():
+            if self.export_job is not None:
+                return
+            names = [name for name in self.metrics.names() if fnmatch.fnmatch(name, pattern_var.get() or "*")]
+            if not names:
+                status_label.config(text="No series match", fg="#ffff00")
+                return
+            path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                initialfile=f"{socket.gethostname()}-metrics-{datetime.datetime.now():%Y%m%d-%H%M%S}.csv",
+                filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")])
+            if not path:
+                return
+            end = time.time()
+            span = ranges.get(range_var.get())
+            start = end - span if span else 0.0
+            self.exporter = ExportJob(path, METRIC_EXPORT_COLUMNS, self.metrics.iter_range(names, start, end),
+                                      total=self.metrics.count(names, start, end))
+            self.export_job = self.executor.submit(self.exporter.run)
+            self.scheduler.add("export_job", watch, interval=0.25, budget_ms=5,
+                               priority=PRIORITY_NORMAL, group="tab")
+        
+        def cancel():
+            if self.export_job is not None:
+                self.exporter.cancel()
+        
+        ttk.Button(frame, text="Export...", style="Custom.TButton", command=export).pack(side="left", padx=5)
+        ttk.Button(frame, text="Cancel", style="Custom.TButton", command=cancel).pack(side="left", padx=5)
+        status_label.pack(side="left", fill="x", padx=10)
+        
+        if self.export_job is not None:
+            # an export started before switching away is still running
+            self.scheduler.add("export_job", watch, interval=0.25, budget_ms=5,
+                               priority=PRIORITY_NORMAL, group="tab")
+
+    def show_integrity(self):
+        content = tk.Frame(self.main_area, bg="#000000")
+        content.pack(fill="both", expand=True, padx=25, pady=25)
+        
+        tk.Label(content, 
+                text="FILE INTEGRITY", 
+                font=self.title_font,
+                bg="#000000",
+                fg="#00ff00").pack(anchor="w", pady=(0, 20))
+        
+        tk.Label(content,
+                text=f"Watching {', '.join(self.integrity.paths)} "
+                     f"(edit {os.path.join(CONFIG_DIR, 'integrity.json')}, baseline in {self.integrity.db_path})",
+                bg="#000000",
+                fg="#00ff00").pack(anchor="w")
+        
+        buttons = tk.Frame(content, bg="#000000")
+        buttons.pack(fill="x", pady=5)
+        
+        status_label = tk.Label(content, text="", bg="#000000", fg="#00ff00", anchor="w", justify="left")
+        status_label.pack(fill="x", pady=5)
+        
+        self.style.configure("Custom.Treeview", background="#000000", fieldbackground="#000000",
+                             foreground="#00ff00")
+        columns = ("change", "path")
+        tree = ttk.Treeview(content, columns=columns, show="headings", style="Custom.Treeview")
+        tree.heading("change", text="Change")
+        tree.column("change", width=100, anchor="w")
+        tree.heading("path", text="Path")
+        tree.column("path", width=700, anchor="w")
+        tree.tag_configure("modified", foreground="#ff0000")
+        tree.tag_configure("removed", foreground="#ff0000")
+        tree.tag_configure("added", foreground="#ffff00")
+        tree.tag_configure("metadata", foreground="#ffff00")
+        scrollbar = ttk.Scrollbar(content, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        tree.pack(fill="both", expand=True, pady=5)
+        
+        def show_report(report):
+            tree.delete(*tree.get_children())
+            if report is None:
+                status_label.config(text="No baseline yet", fg="#ffff00")
+                return
+            changes = integrity_changes(report)
+            for change, path in changes[:5000]:
+                tree.insert("", "end", values=(change, path), tags=(change,))
+            finished = datetime.datetime.fromtimestamp(report["finished"]).strftime("%Y-%m-%d %H:%M:%S")
+            text = (f"Last {report['kind']} {finished}: {report['files']} files, {report['hashed']} hashed, "
+                    f"{report['unreadable']} unreadable in {report['duration_s']}s")
+            if report["kind"] == "verify":
+                text += f", {len(changes)} changes" + (" (accepted)" if report.get("accepted") else "")
+            status_label.config(text=text, fg="#ff0000" if changes else "#00ff00")
+        
+        def watch():
+            """progress of the running job, then its report"""
+            if not content.winfo_exists():
+                return False
+            job = self.integrity_job
+            if job is None:
+                return False
+            if not job.done():
+                done, total = self.integrity.progress
+                status_label.config(text=f"Running {self.integrity.running or 'job'}: {done}/{total} files hashed",
+                                    fg="#ffff00")
+                return True
+            try:
+                show_report(job.result())
+            except Exception as e:
+                status_label.config(text=f"Error: {e}", fg="#ff0000")
+            self.integrity_job = None
+            return False
+        
+        def start(method):
+            if self.integrity_job is not None:
+                return
+            self.integrity_job = self.executor.submit(method)
+            self.scheduler.add("integrity_job", watch, interval=0.5, budget_ms=10,
+                               priority=PRIORITY_NORMAL, group="tab")
+        
+        def accept():
+            if self.integrity_job is None:
+                show_report(self.integrity.accept() or self.integrity.last_report)
+        
+        ttk.Button(buttons, text="Create Baseline", style="Custom.TButton",
+                   command=lambda: start(self.integrity.baseline)).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Verify", style="Custom.TButton",
+                   command=lambda: start(self.integrity.verify)).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Accept Changes", style="Custom.TButton", command=accept).pack(side="left", padx=5)
+        
+        if self.integrity_job is not None:
+            # a job started before switching away is still running
+            self.scheduler.add("integrity_job", watch, interval=0.5, budget_ms=10,
+                               priority=PRIORITY_NORMAL, group="tab")
+        else:
+            show_report(self.integrity.last_report)
+
+    def show_firewall(self):
+        content = tk.Frame(self.main_area, bg="#000000")
+        content.pack(fill="both", expand=True, padx=25, pady=25)
+        
+        tk.Label(content, 
+                text="FIREWALL RULES", 
+                font=self.title_font,
+                bg="#000000",
+                fg="#00ff00").pack(anchor="w", pady=(0, 20))
+        
+        status_label = tk.Label(content, text="Loading ruleset...", bg="#000000", fg="#ffff00", anchor="w")
+        status_label.pack(fill="x", pady=5)
+        
+        self.style.configure("Custom.Treeview", background="#000000", fieldbackground="#000000",
+                             foreground="#00ff00")
+        chains = VirtualList(content, FIREWALL_CHAIN_COLUMNS, widths=(120, 200, 100, 120, 140), height=120)
+        chains.pack(fill="x", pady=5)
+        chains.pack_propagate(False)
+        
+        filter_frame = tk.Frame(content, bg="#000000")
+        filter_frame.pack(fill="x", pady=5)
+        tk.Label(filter_frame, text="Filter:", bg="#000000", fg="#00ff00").pack(side="left")
+        filter_var = tk.StringVar()
+        tk.Entry(filter_frame, textvariable=filter_var, bg="#121212", fg="#00ff00",
+                 insertbackground="#00ff00").pack(side="left", fill="x", expand=True, padx=5)
+        
+        targets = {"ACCEPT": "accept", "accept": "accept", "DROP": "drop", "drop": "drop",
+                   "REJECT": "drop", "reject": "drop"}
+        rules = VirtualList(content, FIREWALL_COLUMNS,
+                            widths=(80, 110, 50, 100, 70, 130, 130, 300, 80, 100),
+                            tag=lambda row: targets.get(row[3], ""))
+        rules.tree.tag_configure("accept", foreground="#00ff00")
+        rules.tree.tag_configure("drop", foreground="#ff0000")
+        rules.pack(fill="both", expand=True, pady=5)
+        
+        state = {"job": None, "ruleset": None, "digest": None, "text": [], "pending": None}
+        
+        def show():
+            state["pending"] = None
+            ruleset = state["ruleset"]
+            if ruleset is None or not content.winfo_exists():
+                return
+            # shallow copies: the lists get sorted, counters are patched into the rows in place
+            chains.set_rows(list(ruleset["chains"]["rows"]))
+            needle = filter_var.get().strip().lower()
+            rows = ruleset["rows"]
+            if needle:
+                if state["digest"] != ruleset["digest"]:
+                    # lowercase text of every rule, rebuilt only when the rules change
+                    state["text"] = [" ".join(str(value) for value in row[:8]).lower() for row in rows]
+                    state["digest"] = ruleset["digest"]
+                rows = [row for row, text in zip(rows, state["text"]) if needle in text]
+            rules.set_rows(list(rows))
+            status_label.config(text=f"{ruleset['backend']}: {len(ruleset['chains']['rows'])} chains, "
+                                     f"{len(ruleset['rows'])} rules ({len(rows)} shown), "
+                                     f"parsed in {ruleset['parse_ms']} ms, "
+                                     f"{self.firewall.parses} parses / {self.firewall.counter_updates} counter updates",
+                                fg="#00ff00")
+        
+        def loaded(ruleset):
+            state["job"] = None
+            if content.winfo_exists():
+                state["ruleset"] = ruleset
+                show()
+        
+        def failed(e):
+            state["job"] = None
+            if content.winfo_exists():
+                status_label.config(text=f"Could not read the firewall ruleset: {e}", fg="#ff0000")
+        
+        def refresh():
+            if not content.winfo_exists():
+                return False
+            # reload every few seconds for fresh counters
+            if state["job"] is None:
+                state["job"] = self.submit("firewall_view", self.get_firewall_ruleset, loaded, error=failed)
+            return True
+        
+        def typed(*args):
+            # filter once typing pauses, not on every keystroke
+            if state["pending"] is not None:
+                content.after_cancel(state["pending"])
+            state["pending"] = content.after(150, show)
+        
+        filter_var.trace_add("write", typed)
+        refresh()
+        self.scheduler.add("firewall_view", refresh, interval=5.0, budget_ms=20,
+                           priority=PRIORITY_NORMAL, group="tab", delay=5.0)
+
+    def show_pressure(self):
+        content = tk.Frame(self.main_area, bg="#000000")
+        content.pack(fill="both", expand=True, padx=25, pady=25)
+        
+        tk.Label(content, 
+                text="PRESSURE STALL INFORMATION", 
+                font=self.title_font,
+                bg="#000000",
+                fg="#00ff00").pack(anchor="w", pady=(0, 20))
+        
+        tk.Label(content,
+                text=f"{len(self.pressure.armed)} kernel triggers armed, {self.pressure.fired} fired "
+                     f"(edit {os.path.join(CONFIG_DIR, 'psi.json')})",
+                bg="#000000",
+                fg="#00ff00").pack(anchor="w")
+        
+        graphs = tk.Frame(content, bg="#000000")
+        graphs.pack(fill="x", pady=10)
+        canvases = {}
+        for column, resource in enumerate(PSI_RESOURCES):
+            graphs.grid_columnconfigure(column, weight=1)
+            tk.Label(graphs,
+                    text=f"{resource.upper()} stalled % (5 min)",
+                    bg="#000000",
+                    fg="#00ff00",
+                    font=self.bold_font).grid(row=0, column=column, sticky="w", padx=5)
+            canvases[resource] = tk.Canvas(graphs, height=80, bg="#121212", highlightthickness=0)
+            canvases[resource].grid(row=1, column=column, sticky="we", padx=5)
+        
+        def draw():
+            if not graphs.winfo_exists():
+                return False
+            now = time.time()
+            for resource, canvas in canvases.items():
+                width = canvas.winfo_width()
+                canvas.delete("all")
+                lines = {}
+                for kind in ("some", "full"):
+                    lines[kind] = [(ts, value) for ts, _, value in
+                                   self.metrics.iter_series(f"psi.system.{resource}.{kind}", now - 300, now)]
+                # small stalls matter, scale to the largest value seen but at least 10%
+                top = max([10.0] + [value for points in lines.values() for _, value in points])
+                for kind, color in (("some", "#ffff00"), ("full", "#ff0000")):
+                    points = []
+                    for ts, value in lines[kind]:
+                        points += [width - (now - ts) / 300 * width, 80 - value / top * 78]
+                    if len(points) >= 4:
+                        canvas.create_line(*points, fill=color)
+                canvas.create_text(4, 4, anchor="nw", fill="#00ff00", text=f"{top:.0f}%")
+                if not lines["some"]:
+                    canvas.create_text(10, 40, anchor="w", fill="#00ff00", text="No samples")
+            return True
+        
+        tk.Label(content,
+                text="avg10 / avg60 / avg300, and stalled time since the last refresh:",
+                bg="#000000",
+                fg="#00ff00").pack(anchor="w", pady=(10, 5))
+        table = self.create_info_table(content, status=pressure_tag)
+        previous = {}
+        
+        def sections():
+            now = time.monotonic()
+            result = {}
+            for source, resources in sorted(self.get_pressure().items(), key=lambda item: item[0] != "system"):
+                section = {}
+                for resource, kinds in resources.items():
+                    for kind, values in kinds.items():
+                        key = f"{source}.{resource}.{kind}"
+                        last = previous.get(key)
+                        previous[key] = (now, values["total"])
+                        row = f"{values['avg10']:.2f}% / {values['avg60']:.2f}% / {values['avg300']:.2f}%"
+                        if last is not None:
+                            row += f", +{max(0.0, values['total'] - last[1]) / 1000:.0f} ms"
+                        section[f"{resource} {kind}"] = row
+                result["System" if source == "system" else f"cgroup {source}"] = section
+            if not result:
+                result = {"System": {"Pressure": "Not available (kernel without CONFIG_PSI or booted with psi=0)"}}
+            return result
+        
+        draw()
+        self.scheduler.add("pressure_graphs", draw, interval=1.0, budget_ms=10,
+                           priority=PRIORITY_LOW, group="tab")
+        self.refresh_info_table(table, sections, interval=2.0)
+
+    def show_connections(self):
+        content = tk.Frame(self.main_area, bg="#000000")
+        content.pack(fill="both", expand=True, padx=25, pady=25)
+        
+        tk.Label(content, 
+                text="TCP CONNECTIONS", 
+                font=self.title_font,
+                bg="#000000",
+                fg="#00ff00").pack(anchor="w", pady=(0, 20))
+        
+        frame = tk.Frame(content, bg="#000000")
+        frame.pack(fill="x", pady=5)
+        tk.Label(frame, text="Group by:", bg="#000000", fg="#00ff00", font=self.bold_font).pack(side="left")
+        labels = {label: group for group, label in CONNECTION_GROUPS.items()}
+        group_var = tk.StringVar(value=CONNECTION_GROUPS["remote"])
+        selector = ttk.Combobox(frame, textvariable=group_var, values=list(labels), state="readonly", width=14)
+        selector.pack(side="left", padx=5)
+        status_label = tk.Label(frame, text="Reading sockets...", bg="#000000", fg="#ffff00", anchor="w")
+        status_label.pack(side="left", fill="x", expand=True, padx=10)
+        
+        self.style.configure("Custom.Treeview", background="#000000", fieldbackground="#000000",
+                             foreground="#00ff00")
+        aggregates = VirtualList(content, ["group", "connections"], widths=(360, 120), height=220)
+        aggregates.pack(fill="x", pady=5)
+        aggregates.pack_propagate(False)
+        drill_label = tk.Label(content, text="Select a row to list its connections", bg="#000000",
+                               fg="#00ff00", anchor="w")
+        drill_label.pack(fill="x", pady=(10, 0))
+        connections = VirtualList(content, CONNECTION_COLUMNS, widths=(60, 260, 260, 120, 80, 160))
+        connections.pack(fill="both", expand=True, pady=5)
+        
+        state = {"job": None, "drill": None, "keys": {}, "selected": None}
+        
+        def refreshed(result):
+            state["job"] = None
+            if not frame.winfo_exists():
+                return
+            state["keys"] = {label: key for label, key, _ in result["rows"]}
+            aggregates.set_rows([[label, count] for label, _, count in result["rows"]])
+            rates = ""
+            if result["new_per_s"] is not None:
+                rates = f", {result['new_per_s']}/s new, {result['closed_per_s']}/s closed"
+            owners = "" if result["owners_complete"] else ", mapping owners..."
+            status_label.config(text=f"{result['total']} sockets{rates}{owners} "
+                                     f"({result['cpu_ms']} ms cpu)", fg="#00ff00")
+            if state["selected"] is not None:
+                drill(state["selected"])
+        
+        def failed(e):
+            state["job"] = None
+            print(f"Error reading connections: {e}")
+            if frame.winfo_exists():
+                status_label.config(text="Error reading /proc/net/tcp", fg="#ff0000")
+        
+        def drilled(rows):
+            state["drill"] = None
+            if frame.winfo_exists():
+                connections.set_rows(rows)
+                drill_label.config(text=f"{state['selected']}: {len(rows)} connections"
+                                        + (" (first 5000)" if len(rows) >= 5000 else ""))
+        
+        def drill(label):
+            state["selected"] = label
+            group, key = labels[group_var.get()], state["keys"].get(label)
+            if state["drill"] is None and label in state["keys"]:
+                state["drill"] = self.submit("connections_drill", self.connections.rows, drilled,
+                                             group, key, 5000, error=failed)
+        
+        def selected(event):
+            selection = aggregates.tree.selection()
+            if selection:
+                row = aggregates.top + aggregates.tree.index(selection[0])
+                if row < len(aggregates.rows):
+                    drill(aggregates.rows[row][0])
+        
+        def tick():
+            if not frame.winfo_exists():
+                return False
+            # the tracker paces itself to its cpu share, large tables refresh less often
+            if state["job"] is None and self.connections.due():
+                state["job"] = self.submit("connections", self.connections.refresh, refreshed,
+                                           labels[group_var.get()], error=failed)
+            return True
+        
+        def regroup(event):
+            state["selected"] = None
+            connections.set_rows([])
+            drill_label.config(text="Select a row to list its connections")
+            self.connections.ready_at = 0.0
+            tick()
+        
+        aggregates.tree.bind("<<TreeviewSelect>>", selected)
+        selector.bind("<<ComboboxSelected>>", regroup)
+        tick()
+        self.scheduler.add("connections", tick, interval=1.0, budget_ms=5,
+                           priority=PRIORITY_NORMAL, group="tab", delay=1.0)
+
     def show_about(self):
         """Show About tab"""
         content = tk.Frame(self.main_area, bg="#000000")
@@ -455,20 +5695,20 @@ class LinuxSystemPanel:
                 justify="left").pack(anchor="w")
 
     def get_system_info(self):
-        mem = psutil.virtual_memory()
-        swap = psutil.swap_memory()
+        mem = shared_psutil("virtual_memory")
+        swap = shared_psutil("swap_memory")
         return { 
             "Hostname": socket.gethostname(),
             "OS": self.get_os_info(),
             "Kernel": platform.version(),
-            "Uptime": str(datetime.timedelta(seconds=int(time.time() - psutil.boot_time())))[:-7],
-            "CPU": f"{psutil.cpu_percent()}% ({psutil.cpu_count()} cores @ {psutil.cpu_freq().current:.0f}MHz)",
+            "Uptime": str(datetime.timedelta(seconds=int(time.time() - shared_psutil("boot_time"))))[:-7],
+            "CPU": f"{shared_psutil('cpu_percent')}% ({shared_psutil('cpu_count')} cores @ {shared_psutil('cpu_freq').current:.0f}MHz)",
             "RAM": f"{mem.used/1024/1024:.1f}MB / {mem.total/1024/1024:.1f}MB ({mem.percent}%)",
             "Swap": f"{swap.used/1024/1024:.1f}MB / {swap.total/1024/1024:.1f}MB",
             "Temperature": self.get_cpu_temp(),
             "Load Avg": self.get_load_avg(),
             "Battery": self.get_battery_info(),
-            "Last Boot": datetime.datetime.fromtimestamp(psutil.boot_time()).strftime("%Y-%m-%d %H:%M:%S"),
+            "Last Boot": datetime.datetime.fromtimestamp(shared_psutil("boot_time")).strftime("%Y-%m-%d %H:%M:%S"),
             "System Time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "Timezone": self.get_timezone(),
             "Desktop Environment": self.get_desktop_environment(),
@@ -479,7 +5719,7 @@ class LinuxSystemPanel:
 
     def get_os_info(self):
         try:
-            with open('/etc/os-release', 'r') as f:
+            with open(self.host_path('/etc/os-release'), 'r') as f:
                 lines = f.readlines()
                 os_info = {}
                 for line in lines:
@@ -492,7 +5732,7 @@ class LinuxSystemPanel:
 
     def get_timezone(self):
         try:
-            return subprocess.check_output(['timedatectl', 'show', '--property=Timezone']).decode().strip().split('=')[1]
+            return run_command(['timedatectl', 'show', '--property=Timezone']).decode().strip().split('=')[1]
         except:
             return "N/A"
 
@@ -504,7 +5744,7 @@ class LinuxSystemPanel:
 
     def get_display_manager(self):
         try:
-            return subprocess.check_output(['systemctl', 'list-units', '--type=service', '--state=running', 'display-manager.service']).decode()
+            return run_command(['systemctl', 'list-units', '--type=service', '--state=running', 'display-manager.service']).decode()
         except:
             return "N/A"
 
@@ -516,21 +5756,21 @@ class LinuxSystemPanel:
 
     def get_cpu_temp(self):
         try:
-            temps = psutil.sensors_temperatures()
+            temps = shared_psutil("sensors_temperatures")
             if 'coretemp' in temps:
                 return f"{temps['coretemp'][0].current}°C"
             elif 'k10temp' in temps:
                 return f"{temps['k10temp'][0].current}°C"
             elif 'acpitz' in temps:
                 return f"{temps['acpitz'][0].current}°C"
-            with open("/sys/class/thermal/thermal_zone0/temp", "r") as f:
+            with open(self.host_path("/sys/class/thermal/thermal_zone0/temp"), "r") as f:
                 return f"{int(f.read()) / 1000}°C"
         except:
             return "N/A"
 
     def get_load_avg(self):
         try:
-            with open("/proc/loadavg", "r") as f:
+            with open(self.host_path("/proc/loadavg"), "r") as f:
                 load = f.read().split()[:3]
             return ", ".join(load)
         except:
@@ -538,13 +5778,51 @@ class LinuxSystemPanel:
 
     def get_battery_info(self):
         try:
-            bat = psutil.sensors_battery()
+            bat = shared_psutil("sensors_battery")
             if bat:
                 return f"{bat.percent}% ({'Charging' if bat.power_plugged else 'Discharging'})"
             return "No Battery"
         except:
             return "N/A"
 
+    def create_info_table(self, parent, status=None) -> InfoTable:
+        self.style.configure("Custom.Treeview", background="#000000", fieldbackground="#000000",
+                             foreground="#00ff00")
+        table = InfoTable(parent, status=status, section_font=self.bold_font)
+        table.pack(fill="both", expand=True)
+        return table
+
+    def refresh_info_table(self, table: InfoTable, sections, interval: Optional[float] = None):
+        """fill table from sections() on the pool, again every interval seconds"""
+        name = f"info_table_{id(table)}"
+        state = {"job": None}
+        
+        def apply(result):
+            state["job"] = None
+            if table.winfo_exists():
+                table.load(result)
+        
+        def failed(e):
+            state["job"] = None
+            print(f"Error refreshing info table: {e}")
+        
+        def collect():
+            # every probe behind the table shares one refresh
+            with refresh_scope():
+                return sections()
+        
+        def tick():
+            if not table.winfo_exists():
+                return False
+            # a slow probe run is never stacked up behind itself
+            if state["job"] is None:
+                state["job"] = self.submit(name, collect, apply, error=failed)
+            return interval is not None
+        
+        if tick() and interval is not None:
+            self.scheduler.add(name, tick, interval=interval, budget_ms=5,
+                               priority=PRIORITY_LOW, group="tab", delay=interval)
+
     def show_hardware_info(self):
         content = tk.Frame(self.main_area, bg="#000000")
         content.pack(fill="both", expand=True, padx=25, pady=25)
@@ -555,84 +5833,55 @@ class LinuxSystemPanel:
                 bg="#000000",
                 fg="#00ff00").pack(anchor="w", pady=(0, 20))
         
-        # CPU Details
-        cpu_frame = tk.Frame(content, bg="#000000")
-        cpu_frame.pack(fill="x", pady=10)
-        
-        tk.Label(cpu_frame,
-                text="CPU Details:",
-                bg="#000000",
-                fg="#00ff00",
-                font=self.bold_font).pack(anchor="w")
-        
-        cpu_info = self.get_cpu_details()
-        for key, value in cpu_info.items():
-            frame = tk.Frame(cpu_frame, bg="#000000")
-            frame.pack(fill="x", pady=2)
-            tk.Label(frame,
-                    text=f"{key}:",
-                    bg="#000000",
-                    fg="#00ff00",
-                    width=20,
-                    anchor="w").pack(side="left")
-            tk.Label(frame,
-                    text=value,
-                    bg="#000000",
-                    fg="#00ff00").pack(side="left", padx=10)
-        
-        # GPU Details
-        gpu_frame = tk.Frame(content, bg="#000000")
-        gpu_frame.pack(fill="x", pady=10)
+        def sections():
+            return {
+                "CPU Details": self.get_cpu_details(),
+                "GPU Details": self.get_gpu_details(),
+                "RAM Details": self.get_ram_details(),
+                "Top Memory (PSS)": self.get_memory_top()
+            }
         
-        tk.Label(gpu_frame,
-                text="GPU Details:",
+        table = self.create_info_table(content)
+        self.refresh_info_table(table, sections, interval=2.0)
+        self.create_gpu_graph(content)
+
+    def create_gpu_graph(self, parent):
+        """utilisation history of every GPU from the telemetry buffer"""
+        frame = tk.Frame(parent, bg="#000000")
+        frame.pack(fill="x", pady=10)
+        tk.Label(frame,
+                text="GPU Utilization (2 min):",
                 bg="#000000",
                 fg="#00ff00",
                 font=self.bold_font).pack(anchor="w")
+        canvas = tk.Canvas(frame, height=100, bg="#121212", highlightthickness=0)
+        canvas.pack(fill="x", pady=5)
+        colors = ("#00ff00", "#ffff00", "#ff0000", "#006400")
         
-        gpu_info = self.get_gpu_details()
-        for key, value in gpu_info.items():
-            frame = tk.Frame(gpu_frame, bg="#000000")
-            frame.pack(fill="x", pady=2)
-            tk.Label(frame,
-                    text=f"{key}:",
-                    bg="#000000",
-                    fg="#00ff00",
-                    width=20,
-                    anchor="w").pack(side="left")
-            tk.Label(frame,
-                    text=value,
-                    bg="#000000",
-                    fg="#00ff00").pack(side="left", padx=10)
-        
-        # RAM details
-        ram_frame = tk.Frame(content, bg="#000000")
-        ram_frame.pack(fill="x", pady=10)
-        
-        tk.Label(ram_frame,
-                text="RAM Details:",
-                bg="#000000",
-                fg="#00ff00",
-                font=self.bold_font).pack(anchor="w")
+        def draw():
+            if not canvas.winfo_exists():
+                return False
+            width = canvas.winfo_width()
+            now = time.time()
+            canvas.delete("all")
+            series = [name for name in self.gpu.history.names() if name.endswith(".util_percent")]
+            for color, name in zip(colors * 4, series):
+                points = []
+                for ts, _, value in self.gpu.history.iter_series(name, now - 120, now):
+                    points += [width - (now - ts) / 120 * width, 100 - value]
+                if len(points) >= 4:
+                    canvas.create_line(*points, fill=color)
+            if not series:
+                canvas.create_text(10, 50, anchor="w", fill="#00ff00",
+                                   text="No GPU telemetry" if self.gpu.ready.is_set() else "Waiting for samples...")
+            return True
         
-        ram_info = self.get_ram_details()
-        for key, value in ram_info.items():
-            frame = tk.Frame(ram_frame, bg="#000000")
-            frame.pack(fill="x", pady=2)
-            tk.Label(frame,
-                    text=f"{key}:",
-                    bg="#000000",
-                    fg="#00ff00",
-                    width=20,
-                    anchor="w").pack(side="left")
-            tk.Label(frame,
-                    text=value,
-                    bg="#000000",
-                    fg="#00ff00").pack(side="left", padx=10)
+        self.scheduler.add("gpu_graph", draw, interval=1.0, budget_ms=10,
+                           priority=PRIORITY_LOW, group="tab")
 
     def get_cpu_details(self):
         try:
-            with open('/proc/cpuinfo', 'r') as f:
+            with open(self.host_path('/proc/cpuinfo'), 'r') as f:
                 cpu_info = {}
                 for line in f:
                     if ':' in line:
@@ -642,23 +5891,23 @@ class LinuxSystemPanel:
                 return {
                     "Model": cpu_info.get('model name', 'N/A'),
                     "Vendor": cpu_info.get('vendor_id', 'N/A'),
-                    "Cores": f"{psutil.cpu_count()} ({psutil.cpu_count(logical=False)} physical)",
-                    "Thread Count": str(psutil.cpu_count(logical=True)),
+                    "Cores": f"{shared_psutil('cpu_count')} ({shared_psutil('cpu_count', False)} physical)",
+                    "Thread Count": str(shared_psutil("cpu_count")),
                     "Cache Sizes": self.get_cpu_cache_sizes(),
-                    "Max Speed": f"{psutil.cpu_freq().max:.0f}MHz",
-                    "Current Speed": f"{psutil.cpu_freq().current:.0f}MHz",
-                    "Min Speed": f"{psutil.cpu_freq().min:.0f}MHz"
+                    "Max Speed": f"{shared_psutil('cpu_freq').max:.0f}MHz",
+                    "Current Speed": f"{shared_psutil('cpu_freq').current:.0f}MHz",
+                    "Min Speed": f"{shared_psutil('cpu_freq').min:.0f}MHz"
                 }
         except:
             return {"Error": "Could not fetch CPU details"}
 
     def get_cpu_cache_sizes(self):
         try:
-            with open('/sys/devices/system/cpu/cpu0/cache/index0/size', 'r') as f:
+            with open(self.host_path('/sys/devices/system/cpu/cpu0/cache/index0/size'), 'r') as f:
                 l1 = f.read().strip()
-            with open('/sys/devices/system/cpu/cpu0/cache/index1/size', 'r') as f:
+            with open(self.host_path('/sys/devices/system/cpu/cpu0/cache/index1/size'), 'r') as f:
                 l2 = f.read().strip()
-            with open('/sys/devices/system/cpu/cpu0/cache/index2/size', 'r') as f:
+            with open(self.host_path('/sys/devices/system/cpu/cpu0/cache/index2/size'), 'r') as f:
                 l3 = f.read().strip()
             return f"L1: {l1}, L2: {l2}, L3: {l3}"
         except:
@@ -666,53 +5915,125 @@ class LinuxSystemPanel:
 
     def get_gpu_details(self):
         try:
-            # NVIDIA GPU
-            nvidia = subprocess.check_output(['nvidia-smi', '--query-gpu=gpu_name,memory.total,memory.used,memory.free', '--format=csv,noheader']).decode()
-            if nvidia:
-                name, total, used, free = nvidia.strip().split(',')
-                return {
-                    "GPU": name,
-                    "Total Memory": f"{total.strip()}",
-                    "Used Memory": f"{used.strip()}",
-                    "Free Memory": f"{free.strip()}"
-                }
-            
-            # Intel/AMD GPU
-            with open('/sys/kernel/debug/dri/0/i915_frequency_info', 'r') as f:
-                gpu_info = f.read()
-                return {
-                    "GPU": "Intel/AMD Integrated Graphics",
-                    "Frequency Info": gpu_info
-                }
-        except:
+            gpus = self.gpu.read()
+            if not gpus:
+                return {"GPU": "N/A"}
+            details = {}
+            for gpu_id, gpu in sorted(gpus.items()):
+                prefix = f"GPU {gpu_id} " if len(gpus) > 1 else ""
+                details[prefix.strip() or "GPU"] = gpu["name"]
+                details[f"{prefix}Source"] = self.gpu.source
+                if gpu.get("util_percent") is not None:
+                    details[f"{prefix}Utilization"] = f"{gpu['util_percent']:.0f}%"
+                total, used = gpu.get("mem_total_bytes"), gpu.get("mem_used_bytes")
+                if total is not None and used is not None:
+                    details[f"{prefix}Total Memory"] = f"{total / 1048576:.0f} MiB"
+                    details[f"{prefix}Used Memory"] = f"{used / 1048576:.0f} MiB"
+                    details[f"{prefix}Free Memory"] = f"{(total - used) / 1048576:.0f} MiB"
+                if gpu.get("freq_mhz") is not None:
+                    details[f"{prefix}Clock"] = f"{gpu['freq_mhz']:.0f} MHz"
+                if gpu.get("temp_c") is not None:
+                    details[f"{prefix}Temperature"] = f"{gpu['temp_c']:.0f}°C"
+            return details
+        except Exception:
             return {"GPU": "N/A"}
 
     def get_ram_details(self):
         try:
-            mem = psutil.virtual_memory()
-            swap = psutil.swap_memory()
-            
-            # RAM hızını kontrol et
-            ram_speed = "N/A"
-            try:
-                with open('/sys/devices/system/memory/memory0/device/speed', 'r') as f:
-                    ram_speed = f"{f.read().strip()} MHz"
-            except:
-                pass
-            
+            with open(self.host_path('/proc/meminfo'), 'r') as f:
+                info = parse_kb_fields(f.read())
+            gb = lambda value: f"{value / 1024 ** 3:.2f} GB"
+            total, free = info["MemTotal"], info.get("MemFree", 0)
+            cached = info.get("Cached", 0) + info.get("SReclaimable", 0)
+            used = total - free - info.get("Buffers", 0) - cached
+            swap_total = info.get("SwapTotal", 0)
+            swap_used = swap_total - info.get("SwapFree", 0)
+            hugepages = info.get("HugePages_Total", 0)
             return {
-                "Total RAM": f"{mem.total/1024/1024/1024:.1f} GB",
-                "Available RAM": f"{mem.available/1024/1024/1024:.1f} GB",
-                "Used RAM": f"{mem.used/1024/1024/1024:.1f} GB",
-                "RAM Usage": f"{mem.percent}%",
-                "RAM Speed": ram_speed,
-                "Total Swap": f"{swap.total/1024/1024/1024:.1f} GB",
-                "Used Swap": f"{swap.used/1024/1024/1024:.1f} GB",
-                "Swap Usage": f"{swap.percent}%"
+                "Total RAM": gb(total),
+                "Available RAM": gb(info.get("MemAvailable", free)),
+                "Used RAM": gb(used),
+                "RAM Usage": f"{100 * used / total:.1f}%",
+                "RAM Speed": self.get_ram_speed(),
+                "Free": gb(free),
+                "Buffers": gb(info.get("Buffers", 0)),
+                "Page Cache": gb(info.get("Cached", 0)),
+                "Shared (shmem)": gb(info.get("Shmem", 0)),
+                "Anonymous": gb(info.get("AnonPages", 0)),
+                "Slab": f"{gb(info.get('Slab', 0))} ({gb(info.get('SReclaimable', 0))} reclaimable)",
+                "Kernel Stacks": gb(info.get("KernelStack", 0)),
+                "Page Tables": gb(info.get("PageTables", 0)),
+                "Dirty / Writeback": f"{gb(info.get('Dirty', 0))} / {gb(info.get('Writeback', 0))}",
+                "Committed": f"{gb(info.get('Committed_AS', 0))} of {gb(info.get('CommitLimit', 0))}",
+                "Huge Pages": (f"{hugepages - info.get('HugePages_Free', 0)}/{hugepages} used "
+                               f"x {info.get('Hugepagesize', 0) // 1024 ** 2} MB") if hugepages else "None",
+                "Total Swap": gb(swap_total),
+                "Used Swap": gb(swap_used),
+                "Swap Cached": gb(info.get("SwapCached", 0)),
+                "Swap Usage": f"{100 * swap_used / swap_total:.1f}%" if swap_total else "0%"
             }
         except:
             return {"Error": "Could not fetch RAM details"}
 
+    def get_ram_speed(self):
+        """configured speed of the memory devices from SMBIOS type 17 (root only)"""
+        speeds = set()
+        entries = self.host_path('/sys/firmware/dmi/entries')
+        try:
+            names = [name for name in os.listdir(entries) if name.startswith('17-')]
+        except OSError:
+            return "N/A"
+        for name in names:
+            try:
+                with open(os.path.join(entries, name, 'raw'), 'rb') as f:
+                    raw = f.read()
+            except OSError:
+                return "N/A (requires root)"
+            length = raw[1] if len(raw) > 1 else 0
+            # configured speed (SMBIOS 2.7+), else maximum speed; 0 means an empty slot
+            # and 0xFFFF that the value is in the field's 32-bit extension (SMBIOS 3.3)
+            speed = 0
+            for field, extended in ((0x20, 0x58), (0x15, 0x54)):
+                if length >= field + 2:
+                    speed = int.from_bytes(raw[field:field + 2], 'little')
+                if speed == 0xFFFF:
+                    speed = int.from_bytes(raw[extended:extended + 4], 'little') if length >= extended + 4 else 0
+                if speed:
+                    break
+            if speed:
+                speeds.add(speed)
+        return ", ".join(f"{speed} MT/s" for speed in sorted(speeds)) if speeds else "N/A"
+
+    def get_memory_top(self, limit: int = 10) -> Dict:
+        mib = lambda value: f"{value / 1048576:.1f} MiB"
+        # the window shows the first scan once it is done instead of waiting on it
+        table = self.get_process_memory(wait=self.root is None)
+        if table is None:
+            return {"Status": "Scanning..."}
+        top = {f"{row[1]} ({row[0]})": f"PSS {mib(row[2])}  USS {mib(row[3])}  swap {mib(row[4])}"
+               for row in table["rows"][:limit]}
+        if table.get("denied"):
+            top["Not readable"] = f"{table['denied']} processes (requires root)"
+        return top
+
+    def get_process_memory(self, wait: bool = True) -> Optional[Dict]:
+        """per-process pss/uss/swap in bytes, largest pss first"""
+        return self.memory.load(wait)
+
+    def get_pressure(self) -> Dict:
+        """PSI averages and stall counters of the system and top level cgroups"""
+        return self.pressure.read()
+
+    def get_connection_summary(self) -> Dict:
+        """tcp socket count, churn and count per state"""
+        result = self.connections.refresh("state")
+        summary = {"Total": result["total"]}
+        if result["new_per_s"] is not None:
+            summary["New/s"] = result["new_per_s"]
+            summary["Closed/s"] = result["closed_per_s"]
+        summary.update({label: count for label, _, count in result["rows"]})
+        return summary
+
     def show_services(self):
         content = tk.Frame(self.main_area, bg="#000000")
         content.pack(fill="both", expand=True, padx=25, pady=25)
@@ -745,7 +6066,7 @@ class LinuxSystemPanel:
 
     def get_system_services(self):
         try:
-            output = subprocess.check_output(['systemctl', 'list-units', '--type=service', '--state=running']).decode()
+            output = run_command(['systemctl', 'list-units', '--type=service', '--state=running']).decode()
             services = []
             for line in output.split('\n'):
                 if 'running' in line:
@@ -766,99 +6087,81 @@ class LinuxSystemPanel:
                 bg="#000000",
                 fg="#00ff00").pack(anchor="w", pady=(0, 20))
         
-        loading_label = tk.Label(content, 
-                               text="Loading security information...", 
-                               bg="#000000",
-                               fg="#00ff00")
-        loading_label.pack(pady=20)
+        table = self.create_info_table(content, status=status_tag)
+        self.refresh_info_table(table, self.privacy_sections, interval=30.0)
+
+    def privacy_sections(self) -> Dict:
+        """rows of the privacy tab: the security checks, pending security updates, sysctl deviations"""
+        result = {"": self.get_security_info()}
         
-        # update sec info
-        def update_security_info():
-            try:
-                if not content.winfo_exists():
-                    return
-                    
-                security_info = {
-                    # sec
-                    "Firewall Status": self.check_firewall(),
-                    "VPN Status": self.check_vpn(),
-                    "Tor Status": self.check_tor(),
-                    "DNS Status": self.check_dns(),
-                    "Public IP": self.get_public_ip(),
-                    "System Updates": self.check_updates(),
-                    "Antivirus": self.check_antivirus(),
-                    
-                    # System Sec  
-                    "SELinux": self.check_selinux(),
-                    "AppArmor": self.check_apparmor(),
-                    "System Encryption": self.check_encryption(),
-                    "Secure Boot": self.check_secure_boot(),
-                    
-                    # Network Security
-                    "SSH Status": self.check_ssh_status(),
-                    "Open Ports": self.check_open_ports(),
-                    "Network Encryption": self.check_network_encryption(),
-                    "DNS-over-TLS": self.check_dns_over_tls(),
-                    
-                    # Proxy status
-                    "Proxy Status": self.get_proxy_status()
-                }
-                
-                if loading_label.winfo_exists():
-                    loading_label.destroy()
-                
-                # sec info
-                for i, (key, value) in enumerate(security_info.items()):
-                    if not content.winfo_exists():
-                        return
-                        
-                    frame = tk.Frame(content, bg="#000000")
-                    frame.pack(fill="x", pady=5)
-                    
-                    tk.Label(frame, 
-                            text=f"{key}:", 
-                            bg="#000000", 
-                            fg="#00ff00",
-                            font=self.bold_font, 
-                            width=20, 
-                            anchor="w").pack(side="left")
-                    
-                    color = "#00ff00" if value in ["Active", "Enabled", "Up to Date", "Protected", "Secure"] else "#ff0000" if value in ["Inactive", "Disabled", "Not Found", "Unprotected", "Insecure"] else "#ffff00"
-                    tk.Label(frame, 
-                            text=value, 
-                            bg="#000000",
-                            fg=color).pack(side="left", padx=10)
-            except Exception as e:
-                print(f"Error in update_security_info: {e}")
-                if loading_label.winfo_exists():
-                    loading_label.destroy()
-                if content.winfo_exists():
-                    tk.Label(content,
-                            text="Error loading security information",
-                            bg="#000000",
-                            fg="#ff0000").pack(pady=20)
+        # security updates straight from the update cache
+        updates = self.get_update_details()
+        columns = updates["columns"]
+        security = [dict(zip(columns, row)) for row in updates["rows"] if row[-1]]
+        if security:
+            result["Security Updates"] = {update["name"]: f"{update['current']} -> {update['candidate']}"
+                                          for update in security}
         
-        # Asencron
-        threading.Thread(target=update_security_info, daemon=True).start()
+        # sysctls that differ from the hardening baseline
+        deviations = self.get_sysctl_audit()["deviations"]
+        if deviations:
+            result["Kernel Hardening Deviations"] = {
+                key: f"{deviation['value']} (expected {deviation['expected']})"
+                for key, deviation in sorted(deviations.items())}
+        return result
+
+    def get_security_info(self) -> Dict:
+        """every row of the privacy & security tab"""
+        return {
+            # sec
+            "Firewall Status": self.check_firewall(),
+            "VPN Status": self.check_vpn(),
+            "Tor Status": self.check_tor(),
+            "DNS Status": self.check_dns(),
+            "Public IP": self.get_public_ip(),
+            "System Updates": self.check_updates(),
+            "Antivirus": self.check_antivirus(),
+
+            # System Sec  
+            "SELinux": self.check_selinux(),
+            "AppArmor": self.check_apparmor(),
+            "System Encryption": self.check_encryption(),
+            "USB Protection": self.check_usb_protection(),
+            "Secure Boot": self.check_secure_boot(),
+            "Kernel Hardening": self.check_kernel_hardening(),
+            "File Integrity": self.check_file_integrity(),
+
+            # Network Security
+            "SSH Status": self.check_ssh_status(),
+            "Open Ports": self.check_open_ports(),
+            "Network Encryption": self.check_network_encryption(),
+            "DNS-over-TLS": self.check_dns_over_tls(),
+
+            # Proxy status
+            "Proxy Status": self.get_proxy_status()
+        }
+
+    def get_firewall_ruleset(self) -> Dict:
+        """chains and rules with counters, parsed from iptables-save or nft"""
+        return self.firewall.load()
 
     def check_firewall(self):
         try:
-            # UFW check
-            ufw_status = subprocess.check_output(['ufw', 'status'], stderr=subprocess.PIPE, timeout=1).decode()
-            if "Status: active" in ufw_status:
-                return "Active"
-            
-            iptables_status = subprocess.check_output(['iptables', '-L'], stderr=subprocess.PIPE, timeout=1).decode()
-            if "Chain INPUT" in iptables_status:
-                return "Active (iptables)"
-            
-            return "Inactive"
-        except:
+            ruleset = self.get_firewall_ruleset()
+        except PermissionError:
+            return "Unknown (root required)"
+        except Exception:
             return "Not Found"
+        chains = ruleset["chains"]["rows"]
+        if any(chain[1].startswith("ufw-") for chain in chains):
+            return "Active"
+        if ruleset["rows"] or any(str(chain[2]).upper() in ("DROP", "REJECT") for chain in chains):
+            return f"Active ({ruleset['backend']})"
+        return "Inactive"
 
     def check_vpn(self):
         try:
-            interfaces = psutil.net_if_stats()
+            interfaces = shared_psutil("net_if_stats")
             vpn_interfaces = ['tune0', 'tun0', 'tun1', 'wg0', 'ppp0', 'ppp1', 'ppp2']
             
             for interface in vpn_interfaces:
@@ -871,7 +6174,7 @@ class LinuxSystemPanel:
 
     def check_tor(self):
         try:
-            tor_status = subprocess.check_output(['systemctl', 'is-active', 'tor'], stderr=subprocess.PIPE, timeout=1).decode()
+            tor_status = run_command(['systemctl', 'is-active', 'tor'], stderr=subprocess.PIPE, timeout=1).decode()
             if "active" in tor_status:
                 return "Active"
             return "Inactive"
@@ -880,7 +6183,7 @@ class LinuxSystemPanel:
 
     def check_dns(self):
         try:
-            with open('/etc/resolv.conf', 'r') as f:
+            with open(self.host_path('/etc/resolv.conf'), 'r') as f:
                 dns_content = f.read()
             
             dns_providers = {
@@ -916,67 +6219,29 @@ class LinuxSystemPanel:
                 bg="#000000",
                 fg="#00ff00").pack(anchor="w", pady=(0, 20))
         
-        loading_label = tk.Label(content, 
-                               text="Loading network information...", 
-                               bg="#000000",
-                               fg="#00ff00")
-        loading_label.pack(pady=20)
+        # catagories for netw inf
+        categories = {
+            "Basic Information": ["IP Address", "MAC Address", "Hostname", "Domain"],
+            "Network Interfaces": ["Interfaces", "Active Interface", "Interface Speed", "MTU Size"],
+            "Traffic Statistics": ["Download", "Upload", "Packets", "Errors", "Drops"],
+            "Network Services": ["DNS Servers", "Default Gateway", "DHCP Status", "Proxy Status"],
+            "Network Security": ["Firewall Rules", "Open Ports", "Network Encryption", "VPN Status"]
+        }
         
-        # get net info
-        def update_network_info():
-            # get netw info
+        def sections():
             net_info = self.get_network_info()
-            
-            loading_label.destroy()
-            
-            # catagories for netw inf
-            categories = {
-                "Basic Information": ["IP Address", "MAC Address", "Hostname", "Domain"],
-                "Network Interfaces": ["Interfaces", "Active Interface", "Interface Speed", "MTU Size"],
-                "Traffic Statistics": ["Download", "Upload", "Packets", "Errors", "Drops"],
-                "Network Services": ["DNS Servers", "Default Gateway", "DHCP Status", "Proxy Status"],
-                "Network Security": ["Firewall Rules", "Open Ports", "Network Encryption", "VPN Status"]
-            }
-            
-            row = 0
-            for category, items in categories.items():
-              
-                tk.Label(content, 
-                        text=f"\n{category}:", 
-                        bg="#000000", 
-                        fg="#00ff00",
-                        font=self.bold_font).pack(anchor="w", pady=(10, 5))
-                
-               
-                for item in items:
-                    if item in net_info:
-                        frame = tk.Frame(content, bg="#000000")
-                        frame.pack(fill="x", pady=2)
-                        
-                        tk.Label(frame, 
-                                text=f"{item}:", 
-                                bg="#000000", 
-                                fg="#00ff00",
-                                font=self.bold_font, 
-                                width=20, 
-                                anchor="w").pack(side="left")
-                        
-                        tk.Label(frame, 
-                                text=net_info[item], 
-                                bg="#000000",
-                                fg="#00ff00").pack(side="left", padx=10)
-            
+            return {category: {item: net_info[item] for item in items if item in net_info}
+                    for category, items in categories.items()}
         
-            self.create_network_graph(content)
-        
-      
-        threading.Thread(target=update_network_info, daemon=True).start()
+        table = self.create_info_table(content)
+        self.refresh_info_table(table, sections, interval=5.0)
+        self.create_network_graph(content)
 
     def get_network_info(self):
         try:
-            net = psutil.net_io_counters()
-            addrs = psutil.net_if_addrs()
-            stats = psutil.net_if_stats()
+            net = shared_psutil("net_io_counters")
+            addrs = shared_psutil("net_if_addrs")
+            stats = shared_psutil("net_if_stats")
             
            
             info = {
@@ -1023,7 +6288,7 @@ class LinuxSystemPanel:
 
     def get_active_interface(self):
         try:
-            for interface, stats in psutil.net_if_stats().items():
+            for interface, stats in shared_psutil("net_if_stats").items():
                 if stats.isup:
                     return interface
             return "N/A"
@@ -1034,7 +6299,7 @@ class LinuxSystemPanel:
         try:
             active_interface = self.get_active_interface()
             if active_interface != "N/A":
-                with open(f'/sys/class/net/{active_interface}/speed', 'r') as f:
+                with open(self.host_path(f'/sys/class/net/{active_interface}/speed'), 'r') as f:
                     return f"{f.read().strip()} Mbps"
             return "N/A"
         except:
@@ -1044,7 +6309,7 @@ class LinuxSystemPanel:
         try:
             active_interface = self.get_active_interface()
             if active_interface != "N/A":
-                with open(f'/sys/class/net/{active_interface}/mtu', 'r') as f:
+                with open(self.host_path(f'/sys/class/net/{active_interface}/mtu'), 'r') as f:
                     return f"{f.read().strip()} bytes"
             return "N/A"
         except:
@@ -1052,7 +6317,7 @@ class LinuxSystemPanel:
 
     def get_dns_servers(self):
         try:
-            with open('/etc/resolv.conf', 'r') as f:
+            with open(self.host_path('/etc/resolv.conf'), 'r') as f:
                 dns_servers = []
                 for line in f:
                     if line.startswith('nameserver'):
@@ -1063,17 +6328,20 @@ class LinuxSystemPanel:
 
     def get_default_gateway(self):
         try:
-            with open('/proc/net/route', 'r') as f:
+            with open(self.host_path('/proc/net/route'), 'r') as f:
+                next(f)
                 for line in f:
-                    if line.split()[0] == 'default':
-                        return line.split()[2]
+                    fields = line.split()
+                    # destination 0.0.0.0, little endian hex
+                    if len(fields) > 2 and fields[1] == '00000000':
+                        return socket.inet_ntoa(struct.pack('<L', int(fields[2], 16)))
             return "N/A"
         except:
             return "N/A"
 
     def get_dhcp_status(self):
         try:
-            dhcp_status = subprocess.check_output(['systemctl', 'is-active', 'dhcpcd'], stderr=subprocess.PIPE, timeout=1).decode()
+            dhcp_status = run_command(['systemctl', 'is-active', 'dhcpcd'], stderr=subprocess.PIPE, timeout=1).decode()
             return "Active" if "active" in dhcp_status else "Inactive"
         except:
             return "N/A"
@@ -1089,14 +6357,13 @@ class LinuxSystemPanel:
 
     def get_firewall_rules(self):
         try:
-            rules = subprocess.check_output(['iptables', '-L', '--line-numbers'], stderr=subprocess.PIPE, timeout=1).decode()
-            return f"{len(rules.splitlines())} rules"
-        except:
+            return f"{len(self.get_firewall_ruleset()['rows'])} rules"
+        except Exception:
             return "N/A"
 
     def get_open_ports(self):
         try:
-            netstat = subprocess.check_output(['netstat', '-tuln'], stderr=subprocess.PIPE, timeout=1).decode()
+            netstat = run_command(['netstat', '-tuln'], stderr=subprocess.PIPE, timeout=1).decode()
             ports = re.findall(r':(\d+)', netstat)
             return f"{len(ports)} ports open"
         except:
@@ -1104,14 +6371,14 @@ class LinuxSystemPanel:
 
     def get_network_encryption_status(self):
         try:
-            ssl_status = subprocess.check_output(['openssl', 'version'], stderr=subprocess.PIPE, timeout=1).decode()
+            ssl_status = run_command(['openssl', 'version'], stderr=subprocess.PIPE, timeout=1).decode()
             return "Enabled" if ssl_status else "Disabled"
         except:
             return "N/A"
 
     def get_vpn_status(self):
         try:
-            interfaces = psutil.net_if_stats()
+            interfaces = shared_psutil("net_if_stats")
             vpn_interfaces = ['tun0', 'tun1', 'wg0', 'ppp0']
             for interface in vpn_interfaces:
                 if interface in interfaces and interfaces[interface].isup:
@@ -1133,16 +6400,17 @@ class LinuxSystemPanel:
         canvas = tk.Canvas(frame, height=100, bg="#121212", highlightthickness=0)
         canvas.pack(fill="x", pady=5)
         
-        net = psutil.net_io_counters()
-        total_bytes = net.bytes_sent + net.bytes_recv
+        usage = self.get_usage_summary()
+        sent, recv = usage["Net Sent"], usage["Net Recv"]
+        total_bytes = max(sent + recv, 1)
         
         canvas.create_rectangle(0, 0, 200, 100, fill="#121212", outline="")
-        canvas.create_rectangle(0, 0, (net.bytes_sent/total_bytes)*200, 100, fill="#006400", outline="")
+        canvas.create_rectangle(0, 0, (sent/total_bytes)*200, 100, fill="#006400", outline="")
         canvas.create_rectangle(0, 50, 200, 100, fill="#121212", outline="")
-        canvas.create_rectangle(0, 50, (net.bytes_recv/total_bytes)*200, 100, fill="#006400", outline="")
+        canvas.create_rectangle(0, 50, (recv/total_bytes)*200, 100, fill="#006400", outline="")
         
         tk.Label(frame,
-                text=f"↑ {net.bytes_sent/1024/1024:.1f}MB  ↓ {net.bytes_recv/1024/1024:.1f}MB",
+                text=f"↑ {sent/1024/1024:.1f}MB  ↓ {recv/1024/1024:.1f}MB",
                 bg="#000000",
                 fg="#00ff00").pack(anchor="w")
 
@@ -1156,42 +6424,35 @@ class LinuxSystemPanel:
                 bg="#000000",
                 fg="#00ff00").pack(anchor="w", pady=(0, 20))
         
-        # Log dosyalarını kontrol et
-        log_files = {
-            "System Log": "/var/log/syslog",
-            "Authentication Log": "/var/log/auth.log",
-            "Kernel Log": "/var/log/kern.log",
-            "Boot Log": "/var/log/boot.log",
-            "Application Log": "/var/log/applications.log"
-        }
-        
-        for log_name, log_path in log_files.items():
-            frame = tk.Frame(content, bg="#000000")
-            frame.pack(fill="x", pady=5)
-            
-            tk.Label(frame,
-                    text=f"{log_name}:",
-                    bg="#000000",
-                    fg="#00ff00",
-                    font=self.bold_font,
-                    width=20,
-                    anchor="w").pack(side="left")
-            
+        table = self.create_info_table(content)
+        self.refresh_info_table(table, lambda: {"Log Files": self.get_log_status(), **self.get_auth_summary()},
+                                interval=5.0)
+
+    def get_log_status(self) -> Dict:
+        log_status = {}
+        for log_name, log_path in LOG_FILES.items():
             try:
+                log_path = self.host_path(log_path)
                 if os.path.exists(log_path):
-                    # Son 5 satırı göster
-                    with open(log_path, 'r') as f:
-                        lines = f.readlines()[-5:]
-                        status = "Last 5 lines available"
+                    # only the end of the file, logs can be large
+                    with open(log_path, 'rb') as f:
+                        size = f.seek(0, os.SEEK_END)
+                        f.seek(max(0, size - 4096))
+                        lines = f.read().decode(errors="replace").splitlines()
+                    status = f"{size / 1024:.0f} KiB, last: {lines[-1][:160]}" if lines else "Empty"
                 else:
                     status = "File not found"
             except:
                 status = "Access denied"
-            
-            tk.Label(frame,
-                    text=status,
-                    bg="#000000",
-                    fg="#00ff00").pack(side="left", padx=10)
+            log_status[log_name] = status
+        return log_status
+
+    def get_auth_summary(self) -> Dict:
+        """failed/successful logins and sudo use from auth.log or the journal"""
+        try:
+            return self.auth.summary()
+        except Exception as e:
+            return {"Authentication": {"Error": f"Could not read the auth log: {e}"}}
 
     def show_power_info(self):
         content = tk.Frame(self.main_area, bg="#000000")
@@ -1203,29 +6464,12 @@ class LinuxSystemPanel:
                 bg="#000000",
                 fg="#00ff00").pack(anchor="w", pady=(0, 20))
         
-        # power info
-        power_info = self.get_power_info()
-        
-        for key, value in power_info.items():
-            frame = tk.Frame(content, bg="#000000")
-            frame.pack(fill="x", pady=5)
-            
-            tk.Label(frame,
-                    text=f"{key}:",
-                    bg="#000000",
-                    fg="#00ff00",
-                    font=self.bold_font,
-                    width=20,
-                    anchor="w").pack(side="left")
-            
-            tk.Label(frame,
-                    text=value,
-                    bg="#000000",
-                    fg="#00ff00").pack(side="left", padx=10)
+        table = self.create_info_table(content)
+        self.refresh_info_table(table, lambda: {"": self.get_power_info()}, interval=5.0)
 
     def get_power_info(self):
         try:
-            battery = psutil.sensors_battery()
+            battery = shared_psutil("sensors_battery")
             power_info = {}
             
             if battery:
@@ -1234,14 +6478,14 @@ class LinuxSystemPanel:
                 power_info["Time Left"] = f"{battery.secsleft/60:.1f} minutes" if battery.secsleft != -2 else "Calculating..."
             
             # CPU frekans info
-            cpu_freq = psutil.cpu_freq()
+            cpu_freq = shared_psutil("cpu_freq")
             power_info["CPU Frequency"] = f"{cpu_freq.current:.0f}MHz"
             power_info["CPU Min Frequency"] = f"{cpu_freq.min:.0f}MHz"
             power_info["CPU Max Frequency"] = f"{cpu_freq.max:.0f}MHz"
             
             # Power status
             try:
-                with open('/sys/class/power_supply/BAT0/power_now', 'r') as f:
+                with open(self.host_path('/sys/class/power_supply/BAT0/power_now'), 'r') as f:
                     power_now = int(f.read()) / 1000000  # Convert to watts
                     power_info["Current Power Usage"] = f"{power_now:.1f}W"
             except:
@@ -1251,35 +6495,52 @@ class LinuxSystemPanel:
         except:
             return {"Error": "Could not fetch power information"}
 
+    def get_sysctl_audit(self) -> Dict:
+        """deviations of /proc/sys from the hardening baseline"""
+        return self.sysctl.audit()
+
     def check_kernel_hardening(self):
         try:
-            # Kernel hardening check
-            with open('/proc/sys/kernel/randomize_va_space', 'r') as f:
-                aslr = f.read().strip()
-            with open('/proc/sys/fs/protected_hardlinks', 'r') as f:
-                hardlinks = f.read().strip()
-            with open('/proc/sys/fs/protected_symlinks', 'r') as f:
-                symlinks = f.read().strip()
-            
-            if aslr == "2" and hardlinks == "1" and symlinks == "1":
+            audit = self.get_sysctl_audit()
+            if not audit["checked"]:
+                return "Not Found"
+            if not audit["deviations"]:
                 return "Enabled"
-            return "Partially Enabled"
-        except:
+            return f"Partially Enabled ({len(audit['deviations'])} deviations)"
+        except Exception as e:
+            print(f"Error auditing sysctls: {e}")
+            return "Not Found"
+
+    def check_file_integrity(self):
+        """outcome of the last integrity verify, without running one"""
+        report = self.integrity.last_report
+        if report is None:
             return "Not Found"
+        changes = len(integrity_changes(report))
+        if report["kind"] == "baseline" or not changes:
+            return "Protected"
+        return f"Modified ({changes} files)"
+
+    def get_device_inventory(self) -> Dict:
+        """block topology, mounts, usb and pci devices read from sysfs"""
+        return self.devices.load()
 
     def check_usb_protection(self):
         try:
-            # USB sec settings
-            usb_status = subprocess.check_output(['lsusb'], stderr=subprocess.PIPE, timeout=1).decode()
-            if "USB" in usb_status:
-                return "Active"
-            return "Inactive"
-        except:
+            # new devices stay unauthorized until allowed (usbguard, authorized_default)
+            buses = self.get_device_inventory()["usb_authorized_default"]
+            if not buses:
+                return "Not Found"
+            if all(value in ("0", "2") for value in buses.values()):
+                return "Protected"
+            return "Unprotected"
+        except Exception as e:
+            print(f"Error reading usb devices: {e}")
             return "Not Found"
 
     def check_ssh_status(self):
         try:
-            ssh_status = subprocess.check_output(['systemctl', 'is-active', 'ssh'], stderr=subprocess.PIPE, timeout=1).decode()
+            ssh_status = run_command(['systemctl', 'is-active', 'ssh'], stderr=subprocess.PIPE, timeout=1).decode()
             if "active" in ssh_status:
                 return "Active"
             return "Inactive"
@@ -1289,7 +6550,7 @@ class LinuxSystemPanel:
     def check_open_ports(self):
         try:
             # check for open ports
-            netstat = subprocess.check_output(['netstat', '-tuln'], stderr=subprocess.PIPE, timeout=1).decode()
+            netstat = run_command(['netstat', '-tuln'], stderr=subprocess.PIPE, timeout=1).decode()
             ports = re.findall(r':(\d+)', netstat)
             if ports:
                 return f"{len(ports)} ports open"
@@ -1300,7 +6561,7 @@ class LinuxSystemPanel:
     def check_network_encryption(self):
         try:
             # SSL/TLS checking
-            ssl_status = subprocess.check_output(['openssl', 'version'], stderr=subprocess.PIPE, timeout=1).decode()
+            ssl_status = run_command(['openssl', 'version'], stderr=subprocess.PIPE, timeout=1).decode()
             if ssl_status:
                 return "Enabled"
             return "Not Found"
@@ -1310,27 +6571,41 @@ class LinuxSystemPanel:
     def check_dns_over_tls(self):
         try:
             # DNS-over-TLS cechking
-            with open('/etc/systemd/resolved.conf', 'r') as f:
+            with open(self.host_path('/etc/systemd/resolved.conf'), 'r') as f:
                 if 'DNSOverTLS=yes' in f.read():
                     return "Enabled"
             return "Disabled"
         except:
             return "Not Found"
 
+    def get_update_details(self) -> Dict:
+        """per package pending updates from the cache, never waits for apt"""
+        self.updates.refresh_async()
+        result = self.updates.result or {}
+        columns = ["name", "arch", "current", "candidate", "suites", "security"]
+        return {
+            "checked_at": result.get("checked_at"),
+            "checking": self.updates.checking,
+            "error": result.get("error"),
+            "columns": columns,
+            "rows": [[package[column] for column in columns] for package in result.get("packages", [])]
+        }
+
     def check_updates(self):
-        try:
-            # APT check
-            apt_status = subprocess.check_output(['apt', 'list', '--upgradable'], stderr=subprocess.PIPE, timeout=1).decode()
-            if "Listing..." in apt_status and "upgradable" in apt_status:
-                return "Updates Available"
-            return "Up to Date"
-        except:
+        details = self.get_update_details()
+        if details["checked_at"] is None:
+            return "Checking..." if details["checking"] else "Unknown"
+        if details["error"]:
             return "Unknown"
+        if not details["rows"]:
+            return "Up to Date"
+        security = sum(1 for row in details["rows"] if row[-1])
+        return f"Updates Available ({len(details['rows'])}, {security} security)"
 
     def check_antivirus(self):
         try:
             # ClamAV kontrolü
-            clamav_status = subprocess.check_output(['systemctl', 'is-active', 'clamav-daemon'], stderr=subprocess.PIPE, timeout=1).decode()
+            clamav_status = run_command(['systemctl', 'is-active', 'clamav-daemon'], stderr=subprocess.PIPE, timeout=1).decode()
             if "active" in clamav_status:
                 return "Active (ClamAV)"
             return "Not Found"
@@ -1339,14 +6614,14 @@ class LinuxSystemPanel:
 
     def check_selinux(self):
         try:
-            selinux_status = subprocess.check_output(['getenforce'], stderr=subprocess.PIPE, timeout=1).decode().strip()
+            selinux_status = run_command(['getenforce'], stderr=subprocess.PIPE, timeout=1).decode().strip()
             return selinux_status
         except:
             return "Not Found"
 
     def check_apparmor(self):
         try:
-            apparmor_status = subprocess.check_output(['aa-status'], stderr=subprocess.PIPE, timeout=1).decode()
+            apparmor_status = run_command(['aa-status'], stderr=subprocess.PIPE, timeout=1).decode()
             if "apparmor module is loaded" in apparmor_status:
                 return "Active"
             return "Inactive"
@@ -1355,17 +6630,22 @@ class LinuxSystemPanel:
 
     def check_encryption(self):
         try:
-            # LUKS kontrolü
-            luks_status = subprocess.check_output(['lsblk', '-f'], stderr=subprocess.PIPE, timeout=1).decode()
-            if "crypto_LUKS" in luks_status:
+            inventory = self.get_device_inventory()
+            encrypted = [row[0] for row in inventory["mounts"]["rows"] if row[4]]
+            if "/" in encrypted:
                 return "Enabled"
+            if encrypted:
+                return f"Partially Enabled ({', '.join(encrypted)})"
+            if any(row[4] == "crypto_LUKS" or row[11] for row in inventory["block"]["rows"]):
+                return "Partially Enabled (not mounted)"
             return "Not Found"
-        except:
+        except Exception as e:
+            print(f"Error reading block devices: {e}")
             return "Not Found"
 
     def check_secure_boot(self):
         try:
-            secure_boot = subprocess.check_output(['mokutil', '--sb-state'], stderr=subprocess.PIPE, timeout=1).decode()
+            secure_boot = run_command(['mokutil', '--sb-state'], stderr=subprocess.PIPE, timeout=1).decode()
             if "SecureBoot enabled" in secure_boot:
                 return "Enabled"
             return "Disabled"
@@ -1406,6 +6686,51 @@ class LinuxSystemPanel:
                     text=f"{disk['Used']} of {disk['Size']} (Free: {disk['Free']})", 
                     bg="#000000",
                     fg="#00ff00").pack(side="left", padx=10)
+        
+        # block device topology: disks, partitions and the mappers stacked on them
+        inventory = self.get_device_inventory()
+        block = inventory["block"]["rows"]
+        if not block:
+            return
+        tk.Label(content,
+                text="Block devices:",
+                bg="#000000",
+                fg="#00ff00",
+                font=self.bold_font).pack(anchor="w", pady=(20, 5))
+        self.style.configure("Custom.Treeview", background="#000000", fieldbackground="#000000",
+                             foreground="#00ff00")
+        columns = ("type", "size", "fstype", "mountpoint", "encrypted")
+        tree = ttk.Treeview(content, columns=columns, style="Custom.Treeview")
+        tree.heading("#0", text="device")
+        for column in columns:
+            tree.heading(column, text=column)
+        tree.tag_configure("encrypted", foreground="#00ff00")
+        tree.tag_configure("plain", foreground="#ffff00")
+        tree.pack(fill="both", expand=True)
+        
+        mounted = {}
+        for mount in inventory["mounts"]["rows"]:
+            mounted.setdefault(mount[2], []).append(mount[0])
+        children = {}
+        for row in block:
+            if row[2]:
+                children.setdefault(row[2], []).append(row)
+            for slave in row[9]:
+                children.setdefault(slave, []).append(row)
+        
+        def add(parent, row, depth=0):
+            label = f"{row[0]} ({row[5]})" if row[5] else row[0]
+            iid = tree.insert(parent, "end", text=label, open=True,
+                              values=(row[1], f"{row[3] / 1024 ** 3:.1f} GB", row[4],
+                                      ", ".join(mounted.get(row[0], [])), "yes" if row[11] else ""),
+                              tags=("encrypted" if row[11] else "plain",) if row[0] in mounted else ())
+            if depth < 16:
+                for child in children.get(row[0], []):
+                    add(iid, child, depth + 1)
+        
+        for row in block:
+            if not row[2] and not row[9] and row[3]:
+                add("", row)
 
     def get_disk_info(self):
         try:
@@ -1436,18 +6761,68 @@ class LinuxSystemPanel:
 
     def get_mac_address(self):
         try:
-            mac = psutil.net_if_addrs()[list(psutil.net_if_addrs().keys())[0]][0].address
+            mac = shared_psutil("net_if_addrs")[list(shared_psutil("net_if_addrs").keys())[0]][0].address
             return mac if mac.count(':') == 5 else "N/A"
         except:
             return "N/A"
 
     def get_interface_status(self):
         try:
-            stats = psutil.net_if_stats()
+            stats = shared_psutil("net_if_stats")
             return "\n".join([f"{k}: {'Up' if v.isup else 'Down'}" for k, v in stats.items()])
         except:
             return "N/A"
 
+    def get_process_table(self, sample: float = 0.0) -> Dict:
+        """every process as one row; sample > 0 measures cpu over that many seconds"""
+        columns = ["pid", "ppid", "name", "username", "status", "cpu_percent", "memory_percent",
+                   "rss", "create_time", "cmdline"]
+        if sample > 0:
+            for proc in psutil.process_iter(['cpu_percent']):
+                pass
+            time.sleep(sample)
+        rows = []
+        for proc in psutil.process_iter(['pid', 'ppid', 'name', 'username', 'status', 'cpu_percent',
+                                         'memory_percent', 'memory_info', 'create_time', 'cmdline']):
+            info = proc.info
+            rows.append([
+                info['pid'], info['ppid'], info['name'], info['username'], info['status'],
+                info['cpu_percent'], round(info['memory_percent'] or 0.0, 3),
+                info['memory_info'].rss if info['memory_info'] else None,
+                info['create_time'], " ".join(info['cmdline'] or [])
+            ])
+        return {"columns": columns, "rows": rows}
+
+    def get_socket_table(self) -> Dict:
+        """inet sockets as rows"""
+        columns = ["proto", "local", "remote", "status", "pid"]
+        rows = []
+        try:
+            connections = psutil.net_connections(kind="inet")
+        except (psutil.AccessDenied, OSError):
+            connections = []
+        for conn in connections:
+            proto = "tcp" if conn.type == socket.SOCK_STREAM else "udp"
+            if conn.family == socket.AF_INET6:
+                proto += "6"
+            local = f"{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else ""
+            remote = f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else ""
+            rows.append([proto, local, remote, conn.status, conn.pid])
+        return {"columns": columns, "rows": rows}
+
+    def get_top_processes(self, limit: int = 5) -> List[Dict]:
+        """processes ranked by cpu usage"""
+        processes = []
+        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status']):
+            try:
+                processes.append(proc.info)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        
+        # ranking cpu usage
+        processes.sort(key=lambda x: x['cpu_percent'] or 0.0, reverse=True)
+        return processes[:limit]
+
     def show_processes(self):
         content = tk.Frame(self.main_area, bg="#000000")
         content.pack(fill="both", expand=True, padx=25, pady=25)
@@ -1506,7 +6881,7 @@ class LinuxSystemPanel:
         def update_processes():
             try:
                 if not content.winfo_exists():
-                    return
+                    return False
                     
                 # procces cleaning 
                 for widget in processes_frame.winfo_children():
@@ -1514,16 +6889,7 @@ class LinuxSystemPanel:
                         widget.destroy()
                 
                 # top 5 cpu 
-                processes = []
-                for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status']):
-                    try:
-                        processes.append(proc.info)
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
-                
-                # ranking cpu usage
-                processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-                top_processes = processes[:5]
+                top_processes = self.get_top_processes(5)
                 
                 # show procces
                 for proc in top_processes:
@@ -1561,15 +6927,300 @@ class LinuxSystemPanel:
                             bg="#000000",
                             fg="#00ff00",
                             width=10).pack(side="left", padx=10)
-                
-                # update after 1 sec
-                self.root.after(1000, update_processes)
             except Exception as e:
                 print(f"Error updating processes: {e}")
         
-        update_processes()
+        # walking every process is expensive, refresh less often than the graphs
+        self.scheduler.add("processes", update_processes, interval=2.0, budget_ms=50,
+                           priority=PRIORITY_LOW, group="tab")
+        
+        self.create_process_search(content)
+
+    def create_process_search(self, parent):
+        """filter-as-you-type over name, cmdline, user and cgroup of every process"""
+        frame = tk.Frame(parent, bg="#000000")
+        frame.pack(fill="x", pady=(20, 5))
+        tk.Label(frame, text="Search:", bg="#000000", fg="#00ff00", font=self.bold_font).pack(side="left")
+        query_var = tk.StringVar()
+        entry = tk.Entry(frame, textvariable=query_var, bg="#121212", fg="#00ff00", insertbackground="#00ff00")
+        entry.pack(side="left", fill="x", expand=True, padx=5)
+        count_label = tk.Label(frame, text="Indexing...", bg="#000000", fg="#ffff00")
+        count_label.pack(side="left")
+        
+        self.style.configure("Custom.Treeview", background="#000000", fieldbackground="#000000",
+                             foreground="#00ff00")
+        results = VirtualList(parent, PROCESS_INDEX_COLUMNS, widths=(70, 100, 140, 240, 520))
+        results.pack(fill="both", expand=True, pady=5)
+        state = {"job": None}
+        
+        def search(*args):
+            started = time.perf_counter()
+            rows = self.process_index.search(query_var.get())
+            results.set_rows(rows)
+            count_label.config(text=f"{len(rows)} of {len(self.process_index.entries)} processes "
+                                    f"({(time.perf_counter() - started) * 1000:.1f} ms)", fg="#00ff00")
+        
+        def indexed(result):
+            state["job"] = None
+            if frame.winfo_exists() and result["changed"]:
+                search()
+        
+        def failed(e):
+            state["job"] = None
+            print(f"Error indexing processes: {e}")
+        
+        def reindex():
+            if not frame.winfo_exists():
+                return False
+            if state["job"] is None:
+                state["job"] = self.submit("process_index", self.process_index.update, indexed, error=failed)
+            return True
+        
+        query_var.trace_add("write", search)
+        entry.focus_set()
+        if self.process_index.entries:
+            # indexed on an earlier visit, show that while the update runs
+            search()
+        reindex()
+        self.scheduler.add("process_index", reindex, interval=2.0, budget_ms=5,
+                           priority=PRIORITY_LOW, group="tab", delay=2.0)
+
+
+class TerminalUI:
+    """curses frontend over the headless panel's probes, for ssh sessions
+
+    probes run on the panel's thread pool; every frame is compared with the
+    one on screen line by line and only changed lines are rewritten, so
+    curses sends just the cells that differ
+    """
+
+    def __init__(self, panel: LinuxSystemPanel, interval: float = 2.0):
+        self.panel = panel
+        self.interval = interval
+        self.tabs = [
+            ("System", lambda: self.section_lines({"": panel.get_system_info()})),
+            ("Network", lambda: self.section_lines({"": panel.get_network_info()})),
+            ("Disks", lambda: self.table_lines(["Mount", "Type", "Size", "Used", "Free"], panel.get_disk_info())),
+            ("Processes", lambda: self.table_lines(["pid", "name", "cpu_percent", "memory_percent", "status"],
+                                                   panel.get_top_processes(limit=100))),
+            ("Services", lambda: self.table_lines(["name", "status"], panel.get_system_services())),
+            ("Privacy", lambda: self.section_lines(panel.privacy_sections(), status=status_tag)),
+        ]
+        # ranking walks every process, which is not worth doing every couple of seconds
+        self.periods = {"Processes": 5.0}
+        self.index = 0
+        self.scroll = 0
+        self.body = [[("Loading...", "warn")]]
+        self.updated = None
+        self.job = None
+        self.due = 0.0
+        self.screen_lines = []
+        self.writes = 0
+
+    @staticmethod
+    def section_lines(sections: Dict, status=None) -> List[List[tuple]]:
+        lines = []
+        for title, rows in sections.items():
+            if title:
+                lines.append([("", "plain")])
+                lines.append([(title, "section")])
+            width = max((len(str(key)) for key in rows), default=0) + 2
+            for key, value in rows.items():
+                tag = status(value) if status else "plain"
+                for i, part in enumerate(str(value).splitlines() or [""]):
+                    label = f"{key}:".ljust(width) if i == 0 else " " * width
+                    lines.append([(label, "plain"), (part, tag)])
+        return lines
+
+    @staticmethod
+    def table_lines(columns: List[str], rows: List[Dict]) -> List[List[tuple]]:
+        cells = [[str(row.get(column, "")) if not isinstance(row.get(column), float)
+                  else f"{row[column]:.1f}" for column in columns] for row in rows]
+        widths = [max([len(column)] + [len(row[i]) for row in cells]) + 2 for i, column in enumerate(columns)]
+        lines = [[("".join(column.ljust(width) for column, width in zip(columns, widths)), "section")]]
+        lines += [[("".join(cell.ljust(width) for cell, width in zip(row, widths)), "plain")] for row in cells]
+        return lines
+
+    def run(self):
+        curses.wrapper(self._main)
+
+    def _main(self, screen):
+        curses.curs_set(0)
+        curses.start_color()
+        curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
+        curses.init_pair(2, curses.COLOR_YELLOW, curses.COLOR_BLACK)
+        curses.init_pair(3, curses.COLOR_RED, curses.COLOR_BLACK)
+        self.attrs = {
+            "plain": curses.color_pair(1),
+            "good": curses.color_pair(1),
+            "warn": curses.color_pair(2),
+            "bad": curses.color_pair(3),
+            "section": curses.color_pair(1) | curses.A_BOLD,
+            "selected": curses.color_pair(1) | curses.A_REVERSE,
+        }
+        screen.bkgd(" ", curses.color_pair(1))
+        # wake up for keys, and at least every 200 ms to collect results
+        screen.timeout(200)
+        keys = {ord(str(i + 1)): i for i in range(len(self.tabs))}
+        while True:
+            key = screen.getch()
+            height, width = screen.getmaxyx()
+            page = max(1, height - 3)
+            if key in (ord("q"), 27):
+                return
+            if key == curses.KEY_RESIZE:
+                # forget what is on screen, the next frame rewrites every line
+                screen.clear()
+                self.screen_lines = []
+            elif key in (curses.KEY_RIGHT, ord("\t"), ord("l")):
+                self.switch((self.index + 1) % len(self.tabs))
+            elif key in (curses.KEY_LEFT, curses.KEY_BTAB, ord("h")):
+                self.switch((self.index - 1) % len(self.tabs))
+            elif key in keys:
+                self.switch(keys[key])
+            elif key in (curses.KEY_DOWN, ord("j")):
+                self.scroll += 1
+            elif key in (curses.KEY_UP, ord("k")):
+                self.scroll -= 1
+            elif key == curses.KEY_NPAGE:
+                self.scroll += page
+            elif key == curses.KEY_PPAGE:
+                self.scroll -= page
+            elif key == ord("r"):
+                self.due = 0.0
+            self.poll()
+            self.scroll = max(0, min(self.scroll, len(self.body) - page))
+            self.draw(screen, height, width, page)
+
+    def switch(self, index: int):
+        if index != self.index:
+            self.index = index
+            self.scroll = 0
+            self.body = [[("Loading...", "warn")]]
+            self.updated = None
+            self.due = 0.0
+
+    def poll(self):
+        """collect a finished refresh, start the next one when due"""
+        if self.job is not None and self.job[1].done():
+            index, future = self.job
+            self.job = None
+            if index == self.index:
+                try:
+                    self.body = future.result()
+                except Exception as e:
+                    self.body = [[(f"Error: {e}", "bad")]]
+                self.updated = time.time()
+        if self.job is None and time.monotonic() >= self.due:
+            self.due = time.monotonic() + max(self.interval, self.periods.get(self.tabs[self.index][0], 0.0))
+            self.job = (self.index, self.panel.executor.submit(self.tabs[self.index][1]))
+
+    def draw(self, screen, height: int, width: int, page: int):
+        header = []
+        for i, (name, _) in enumerate(self.tabs):
+            header.append((f" {i + 1}:{name} ", "selected" if i == self.index else "plain"))
+        updated = datetime.datetime.fromtimestamp(self.updated).strftime("%H:%M:%S") if self.updated else "-"
+        footer = [(f"q quit  arrows/1-{len(self.tabs)} tabs  up/down scroll  r refresh"
+                   f"  |  updated {updated}  lines {self.scroll + 1}-"
+                   f"{min(len(self.body), self.scroll + page)}/{len(self.body)}", "plain")]
+        frame = [header, [("─" * width, "plain")]] + self.body[self.scroll:self.scroll + page]
+        frame += [[]] * (height - 1 - len(frame)) + [footer]
+        if len(self.screen_lines) != len(frame):
+            self.screen_lines = [None] * len(frame)
+        for row, line in enumerate(frame):
+            if self.screen_lines[row] == line:
+                continue
+            self.screen_lines[row] = line
+            self.writes += 1
+            screen.move(row, 0)
+            screen.clrtoeol()
+            col = 0
+            for text, tag in line:
+                # the bottom right cell can't be written without scrolling
+                room = width - col - (1 if row == height - 1 else 0)
+                if room <= 0:
+                    break
+                try:
+                    screen.addstr(row, col, text[:room], self.attrs.get(tag, self.attrs["plain"]))
+                except curses.error:
+                    pass
+                col += len(text[:room])
+        screen.noutrefresh()
+        curses.doupdate()
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Securonis Linux System Control Panel")
+    parser.add_argument("--capture", metavar="FILE", help="write a snapshot of this system and exit")
+    parser.add_argument("--replay", metavar="FILE", help="show a snapshot instead of the live system")
+    parser.add_argument("--diff", nargs=2, metavar=("OLD", "NEW"), help="compare two snapshots and exit")
+    parser.add_argument("--agent", action="store_true", help="run as a headless fleet agent")
+    parser.add_argument("--listen", default=f"127.0.0.1:{FLEET_PORT}", help="agent listen address (host:port)")
+    parser.add_argument("--interval", type=float, default=None,
+                        help="agent sample (default 1) / terminal UI refresh (default 2) interval in seconds")
+    parser.add_argument("--token", help="shared secret fleet panels must present")
+    parser.add_argument("--integrity", choices=["baseline", "verify"], help="run a file integrity job and exit")
+    parser.add_argument("--export", metavar="FILE",
+                        help="write probe results (of --replay, or this system) as .csv or .jsonl and exit")
+    parser.add_argument("--tui", action="store_true", help="terminal interface, no display needed (e.g. over ssh)")
+    args = parser.parse_args()
+    
+    if args.tui:
+        panel = LinuxSystemPanel(snapshot=load_snapshot(args.replay) if args.replay else None)
+        try:
+            TerminalUI(panel, interval=2.0 if args.interval is None else args.interval).run()
+        except KeyboardInterrupt:
+            pass
+        panel.cleanup()
+        sys.exit(0)
+    
+    if args.agent:
+        host, _, port = args.listen.rpartition(":")
+        agent = FleetAgent(LinuxSystemPanel(), host=host or "0.0.0.0", port=int(port),
+                           interval=1.0 if args.interval is None else args.interval, token=args.token)
+        try:
+            agent.run()
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+    
+    if args.capture:
+        panel = LinuxSystemPanel()
+        snapshot = panel.capture_snapshot()
+        save_snapshot(snapshot, args.capture)
+        print(f"Captured {len(snapshot['probes'])} probes in {snapshot['duration_s']}s to {args.capture}")
+        for name, error in snapshot["errors"].items():
+            print(f"  {name} failed: {error}")
+        panel.cleanup()
+        sys.exit(0)
+    
+    if args.integrity:
+        panel = LinuxSystemPanel()
+        try:
+            report = getattr(panel.integrity, args.integrity)()
+        except ValueError as e:
+            print(e)
+            sys.exit(2)
+        for change, path in integrity_changes(report):
+            print(f"{change:<9} {path}")
+        print(f"{report['files']} files, {report['hashed']} hashed, {report['unreadable']} unreadable "
+              f"in {report['duration_s']}s")
+        panel.cleanup()
+        sys.exit(1 if integrity_changes(report) else 0)
+    
+    if args.export:
+        panel = LinuxSystemPanel()
+        snapshot = load_snapshot(args.replay) if args.replay else panel.capture_snapshot()
+        result = ExportJob(args.export, PROBE_EXPORT_COLUMNS, probe_rows(snapshot)).run()
+        print(f"Wrote {result['rows']} rows to {args.export} in {result['duration_s']}s")
+        panel.cleanup()
+        sys.exit(0)
+    
+    if args.diff:
+        for change in diff_snapshots(load_snapshot(args.diff[0]), load_snapshot(args.diff[1])):
+            print(format_change(change))
+        sys.exit(0)
+    
     root = tk.Tk()
-    app = LinuxSystemPanel(root)
+    app = LinuxSystemPanel(root, snapshot=load_snapshot(args.replay) if args.replay else None)
     root.mainloop() 